@@ -19,10 +19,25 @@ from utils.paths import get_database_path
 DB_PATH = get_database_path()
 
 
+# Applied to every connection. WAL lets the dashboard/status readers run
+# while a scan or recheck is writing, and with synchronous=NORMAL a commit
+# no longer waits on an fsync.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",  # 64 MB
+    "PRAGMA mmap_size=268435456",  # 256 MB
+)
+
+
 def get_connection() -> sqlite3.Connection:
-    """Get database connection with row factory"""
+    """Get database connection with row factory (WAL mode, tuned pragmas)"""
     conn = sqlite3.connect(DB_PATH)
     conn.row_factory = sqlite3.Row
+    for pragma in _CONNECTION_PRAGMAS:
+        conn.execute(pragma)
     return conn
 
 
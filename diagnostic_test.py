@@ -128,7 +128,7 @@ async def test_4_ai_matcher():
     print("TEST 4: AI Item Matcher (holistic synthesis)")
     print("="*60)
     
-    from utils.ai_matcher import AIItemMatcher
+    from utils.ai_matcher import AIItemMatcher, close_matcher_client
     
     matcher = AIItemMatcher(match_threshold=0.5)
     
@@ -176,6 +176,7 @@ async def test_4_ai_matcher():
             print(f"      eBay synthesis: {result.ebay_synthesis[:60]}...")
         
         await matcher.close()
+        await close_matcher_client()
         print(f"\n   Result: {passed}/{len(test_cases)} correct")
         return passed == len(test_cases)
         
@@ -184,8 +185,41 @@ async def test_4_ai_matcher():
         import traceback
         traceback.print_exc()
         await matcher.close()
+        await close_matcher_client()
         return False
 
+async def test_5_prefilter():
+    """Test 5: Title pre-filter keeps typo'd / differently split titles (no API calls)"""
+    print("\n" + "="*60)
+    print("TEST 5: AI Matcher title pre-filter")
+    print("="*60)
+    
+    from utils.ai_matcher import AIItemMatcher
+    
+    matcher = AIItemMatcher(match_threshold=0.5)
+    
+    test_cases = [
+        # (fb_title, ebay_title, should_reject)
+        ("PS5", "PlayStation 5 Console", False),
+        ("iphone12 128gb", "Apple iPhone 12 128 GB", False),
+        ("Nintedo Swich", "Nintendo Switch OLED", False),
+        ("Shimano XT brakes", "Rolex Submariner watch", True),
+    ]
+    
+    passed = 0
+    for fb_title, ebay_title, should_reject in test_cases:
+        result = matcher._prefilter(fb_title, ebay_title)
+        rejected = result is not None and not result.is_match
+        if rejected == should_reject:
+            print(f"   ✅ '{fb_title}' vs '{ebay_title}': {'rejected' if rejected else 'kept'}")
+            passed += 1
+        else:
+            print(f"   ❌ '{fb_title}' vs '{ebay_title}': {'rejected' if rejected else 'kept'}")
+    
+    await matcher.close()
+    print(f"\n   Result: {passed}/{len(test_cases)} correct")
+    return passed == len(test_cases)
+
 async def main():
     print("🔍 SCRAPEDFACE DIAGNOSTIC TEST")
     print("=" * 60)
@@ -212,6 +246,9 @@ async def main():
         print("\n⏭️ Skipping AI Matcher (Gemini not working)")
         results["AI Matcher"] = None
     
+    # Test 5: Pre-filter (offline)
+    results["Pre-filter"] = await test_5_prefilter()
+    
     # Summary
     print("\n" + "=" * 60)
     print("📊 SUMMARY")
@@ -64,6 +64,7 @@ from services.discord_notifier import send_discord_alert, send_scan_summary, sen
 from search_terms import get_all_search_variations, clarify_search_terms
 from reports import ScanReport, ScanItem, ReportGenerator, save_scan_to_db
 import database as db
+from utils.log import stop_logging
 
 
 class ArbitrageScanner:
@@ -222,6 +223,26 @@ class ArbitrageScanner:
             if use_ai:
                 print("🤖 AI matching enabled - will verify eBay results with vision model")
             
+            # Alert each opportunity the moment its analysis finishes
+            async def alert_opportunity(listing):
+                # Create unique ID for deduplication
+                listing_id = f"{listing.title[:30]}_{listing.price}"
+                
+                if listing_id in self.seen_listings:
+                    print(f"  ⏭️ Skipping (already alerted): {listing.title[:40]}...")
+                    return
+                
+                success = await send_discord_alert(
+                    self.config.discord_webhook_url,
+                    listing,
+                    self.config.category
+                )
+                
+                if success:
+                    self.seen_listings.add(listing_id)
+                    results["alerts_sent"] += 1
+                    await asyncio.sleep(1)  # Rate limit Discord
+            
             # Adaptive batch analysis: start small, extend if no matches
             initial_batch = getattr(self.config, 'initial_batch_size', 10)
             batch_extend = 25
@@ -248,9 +269,9 @@ class ArbitrageScanner:
                     shipping_estimate=self.config.shipping_estimate,
                     min_profit_dollars=self.config.min_profit_dollars,
                     min_profit_percent=self.config.min_profit_percent,
-                    max_concurrent=1,  # Sequential for browser scraping
                     use_ai_matching=use_ai,
-                    ai_min_confidence=ai_conf
+                    ai_min_confidence=ai_conf,
+                    on_opportunity=alert_opportunity if self.config.discord_webhook_url else None
                 )
                 
                 analyzed.extend(batch_analyzed)
@@ -276,30 +297,8 @@ class ArbitrageScanner:
             # Print report
             print_analysis_report(analyzed)
             
-            # Step 4: Send Discord alerts for new opportunities
+            # Step 4: Discord alerts went out during analysis - send scan summary
             if opportunities and self.config.discord_webhook_url:
-                print("\n🔔 Sending Discord alerts...")
-                
-                for listing in opportunities:
-                    # Create unique ID for deduplication
-                    listing_id = f"{listing.title[:30]}_{listing.price}"
-                    
-                    if listing_id in self.seen_listings:
-                        print(f"  ⏭️ Skipping (already alerted): {listing.title[:40]}...")
-                        continue
-                    
-                    # Send alert
-                    success = await send_discord_alert(
-                        self.config.discord_webhook_url,
-                        listing,
-                        self.config.category
-                    )
-                    
-                    if success:
-                        self.seen_listings.add(listing_id)
-                        results["alerts_sent"] += 1
-                        await asyncio.sleep(1)  # Rate limit Discord
-                
                 # Send scan summary
                 best_deal = opportunities[0] if opportunities else None
                 await send_scan_summary(
@@ -518,6 +517,7 @@ if __name__ == "__main__":
         loop.run_until_complete(main())
     finally:
         loop.close()
+        stop_logging()  # Drain queued log records into the tee first
         # Restore stdout and close log
         sys.stdout = sys.__stdout__
         sys.stderr = sys.__stderr__
@@ -14,13 +14,16 @@ logging.getLogger("mcp").setLevel(logging.ERROR)
 logging.getLogger("websockets").setLevel(logging.ERROR)
 
 import asyncio
+import copy
 import json
 import os
 import re
 import sys
+from contextlib import AsyncExitStack
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from statistics import fmean, median
 from typing import Optional
 from urllib.parse import quote_plus
 
@@ -33,6 +36,27 @@ from utils.stealth_helpers import (
     _random_mouse_move, simulate_human_browsing, get_random_typing_delay_ms,
     type_like_human
 )
+from utils.rate_limit import get_host_limiter, retry_after_seconds
+
+
+# Text on eBay's "unusual traffic" interstitial instead of results
+_BLOCK_MARKERS = ("Pardon Our Interruption", "splashui/challenge")
+# Consecutive blocked searches - each one doubles the pause on ebay.com
+_block_streak = 0
+
+
+def _back_off_after_block() -> float:
+    """Hold every eBay search (all browsers) for a doubling pause; returns it"""
+    global _block_streak
+    pause = retry_after_seconds({}, _block_streak, base=30.0, cap=600.0)
+    _block_streak += 1
+    get_host_limiter("ebay.com").pause(pause)
+    return pause
+
+
+def _reset_block_backoff():
+    global _block_streak
+    _block_streak = 0
 
 
 @dataclass
@@ -75,7 +99,8 @@ class EbayScraper:
         self,
         stealth_browser_path: str = None,
         user_data_dir: str = None,
-        headless: bool = True
+        headless: bool = True,
+        max_browsers: int = 1
     ):
         # Auto-detect paths if not provided
         if stealth_browser_path is None:
@@ -91,6 +116,93 @@ class EbayScraper:
         self.session = None
         self.instance_id = None
         self._browser_ready = False
+        # Set while a persistent session is open (see start()/close())
+        self._exit_stack: Optional[AsyncExitStack] = None
+        # One-shot mode: one browser per scraper - searches take turns
+        self._lock = asyncio.Lock()
+        # Persistent mode: up to max_browsers browsers on the shared session,
+        # each search checks one out (self is always the first)
+        self.max_browsers = max_browsers
+        self._workers: list["EbayScraper"] = []
+        self._idle_workers: Optional[asyncio.Queue] = None
+    
+    def _server_params(self) -> StdioServerParameters:
+        """MCP server parameters for the stealth browser"""
+        # Use the stealth browser's virtualenv Python
+        stealth_venv_python = self.stealth_browser_path.replace("/src/server.py", "/venv/bin/python")
+        
+        env = os.environ.copy()
+        env["PYTHONWARNINGS"] = "ignore::DeprecationWarning"
+        
+        return StdioServerParameters(
+            command=stealth_venv_python,
+            args=["-W", "ignore", self.stealth_browser_path],
+            env=env
+        )
+    
+    async def start(self) -> bool:
+        """
+        Open a persistent MCP session + browser that is reused by every
+        search until close() is called. Without start(), each search
+        spawns and tears down its own server and browser.
+        """
+        if self._exit_stack is not None:
+            return True
+        
+        stack = AsyncExitStack()
+        try:
+            read, write = await stack.enter_async_context(stdio_client(self._server_params()))
+            session = await stack.enter_async_context(ClientSession(read, write))
+            await session.initialize()
+        except Exception as e:
+            print(f"❌ Could not start browser session: {e}")
+            await stack.aclose()
+            return False
+        
+        self._exit_stack = stack
+        self.session = session
+        self._workers = [self]
+        self._idle_workers = asyncio.Queue()
+        self._idle_workers.put_nowait(self)
+        
+        print("🌐 Spawning persistent browser with stealth settings...")
+        if await self._spawn_browser():
+            print(f"✅ Browser ready: {self.instance_id[:8]}...")
+        return True
+    
+    async def close(self):
+        """Close the persistent browser session (no-op if not started)"""
+        if self._exit_stack is None:
+            return
+        for worker in self._workers:
+            await worker._close_browser()
+        self._workers = []
+        self._idle_workers = None
+        try:
+            await self._exit_stack.aclose()
+        except Exception:
+            pass
+        self._exit_stack = None
+        self.session = None
+    
+    async def _checkout_worker(self) -> "EbayScraper":
+        """Idle browser from the pool, opening another if under max_browsers"""
+        if self._idle_workers.empty() and len(self._workers) < self.max_browsers:
+            # Same MCP session, own browser instance and profile
+            worker = copy.copy(self)
+            worker.instance_id = None
+            worker._browser_ready = False
+            worker.user_data_dir = f"{self.user_data_dir}-{len(self._workers)}"
+            self._workers.append(worker)
+            return worker
+        return await self._idle_workers.get()
+    
+    async def __aenter__(self) -> "EbayScraper":
+        await self.start()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
     
     def build_sold_url(
         self,
@@ -781,7 +893,8 @@ class EbayScraper:
             if attempt < max_retries:
                 print(f"   🔄 Retry {attempt + 1}/{max_retries} after delay...")
                 await asyncio.sleep(8)  # Wait before retry
-                # Use fresh profile for retry
+                # Use fresh profile for retry (persistent sessions respawn
+                # the failed browser themselves, see _search_sold_items_impl)
                 import time
                 self.user_data_dir = f"/tmp/ebay-retry-{int(time.time())}"
         
@@ -796,132 +909,172 @@ class EbayScraper:
         limit: int = 50
     ) -> Optional[EbayPriceResult]:
         """Internal implementation of search_sold_items."""
-        # Use the stealth browser's virtualenv Python
-        stealth_venv_python = self.stealth_browser_path.replace("/src/server.py", "/venv/bin/python")
+        if self._exit_stack is not None:
+            # Persistent session: reuse an open browser from the pool
+            worker = await self._checkout_worker()
+            result = None
+            try:
+                if await worker._spawn_browser():
+                    result = await worker._search_in_session(
+                        query, condition, min_price, max_price, limit, close_browser=False
+                    )
+            except Exception as e:
+                print(f"❌ eBay scraper error: {e}")
+                import traceback
+                traceback.print_exc()
+            finally:
+                if result is None:
+                    # Respawn this browser on a fresh profile before its next search
+                    import time
+                    await worker._close_browser()
+                    worker.user_data_dir = f"/tmp/ebay-retry-{int(time.time())}-{len(self._workers)}"
+                if self._idle_workers is not None:
+                    self._idle_workers.put_nowait(worker)
+            return result
         
-        env = os.environ.copy()
-        env["PYTHONWARNINGS"] = "ignore::DeprecationWarning"
+        async with self._lock:
+            try:
+                async with stdio_client(self._server_params()) as (read, write):
+                    async with ClientSession(read, write) as session:
+                        await session.initialize()
+                        self.session = session
+                        
+                        # Spawn browser with stealth settings
+                        print("🌐 Spawning browser with stealth settings...")
+                        if not await self._spawn_browser():
+                            return None
+                        
+                        print(f"✅ Browser ready: {self.instance_id[:8]}...")
+                        
+                        return await self._search_in_session(
+                            query, condition, min_price, max_price, limit, close_browser=True
+                        )
+                        
+            except Exception as e:
+                print(f"❌ eBay scraper error: {e}")
+                import traceback
+                traceback.print_exc()
+                return None
+            finally:
+                self.session = None
+                self._browser_ready = False
+                self.instance_id = None
+    
+    async def _search_in_session(
+        self,
+        query: str,
+        condition: str,
+        min_price: Optional[float],
+        max_price: Optional[float],
+        limit: int,
+        close_browser: bool = True
+    ) -> Optional[EbayPriceResult]:
+        """Run one sold-items search in the already spawned browser."""
+        # Build URL
+        url = self.build_sold_url(query, condition, min_price, max_price)
         
-        server_params = StdioServerParameters(
-            command=stealth_venv_python,
-            args=["-W", "ignore", self.stealth_browser_path],
-            env=env
-        )
+        # Pace searches across concurrent lookups
+        await get_host_limiter("ebay.com").acquire()
         
+        # Visit eBay homepage first — look around like a human
+        print(f"🔍 Searching eBay: {query}")
         try:
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    self.session = session
-                    
-                    # Spawn browser with stealth settings
-                    print("🌐 Spawning browser with stealth settings...")
-                    if not await self._spawn_browser():
-                        return None
-                    
-                    print(f"✅ Browser ready: {self.instance_id[:8]}...")
-                    
-                    # Build URL
-                    url = self.build_sold_url(query, condition, min_price, max_price)
-                    
-                    # Visit eBay homepage first — look around like a human
-                    print(f"🔍 Searching eBay: {query}")
-                    try:
-                        await self._navigate("https://www.ebay.com", timeout=15)
-                        await page_load_delay()
-                        await _random_mouse_move(session, self.instance_id)
-                    except:
-                        pass
-                    
-                    # Type the search query into eBay's search box
-                    print(f"   🔍 Typing search query...")
-                    searched = await self._human_search_ebay(query, condition)
-                    
-                    if not searched:
-                        # Fall back to direct URL if search box fails
-                        print(f"   ⚠️ Search box failed, using direct URL...")
-                        if not await self._navigate(url, timeout=25):
-                            return None
-                    
-                    # Browse results like a human
-                    await page_load_delay()
-                    await _random_mouse_move(session, self.instance_id)
-                    await self._scroll_results()
-                    await simulate_human_browsing(session, self.instance_id)
-                    
-                    # Get page content (do this before browser connection becomes unstable)
-                    print("   📄 Extracting page content...")
-                    items = []
-                    
-                    try:
-                        html = await self._get_page_content()
-                        content_len = len(html) if html else 0
-                        print(f"   📊 Got content: {content_len} chars")
-                        
-                        # Verify we have search results, not homepage
-                        if html and 'Sold' in html and content_len > 10000:
-                            items = self._parse_listings_from_html(html)
-                            print(f"   📊 Parser returned: {len(items)} items")
-                            if items:
-                                print(f"   ✅ Text parser found {len(items)} items")
-                        elif html and 'Sold' not in html:
-                            print("   ⚠️ Page doesn't contain sold listings (wrong page?)")
-                        elif content_len < 10000:
-                            print("   ⚠️ Content too short, page may not have loaded")
-                    except Exception as e:
-                        import traceback
-                        print(f"   ⚠️ Content extraction failed: {e}")
-                        traceback.print_exc()
-                    
-                    # If text parsing didn't work, try JS extraction
-                    if not items:
-                        print("   📜 Trying JS extraction...")
-                        try:
-                            # Light scroll to trigger lazy load
-                            await self._scroll_down(300)
-                            await asyncio.sleep(1)
-                            items = await self._extract_via_js()
-                        except Exception as e:
-                            print(f"   ⚠️ JS extraction failed: {e}")
-                    
-                    # Close browser
-                    await self._close_browser()
-                    
-                    if not items:
-                        print(f"❌ No sold items found for: {query}")
-                        return None
-                    
-                    # Limit results
-                    items = items[:limit]
-                    
-                    # Calculate stats
-                    prices = [item.total_price for item in items]
-                    prices.sort()
-                    median_idx = len(prices) // 2
-                    
-                    result = EbayPriceResult(
-                        query=query,
-                        avg_sold_price=sum(prices) / len(prices),
-                        median_sold_price=prices[median_idx],
-                        min_price=min(prices),
-                        max_price=max(prices),
-                        num_sold=len(prices),
-                        recent_sales=items[:10],
-                        lookup_time=datetime.now().isoformat()
-                    )
-                    
-                    print(f"✅ Found {len(items)} sold items")
-                    print(f"   Avg: ${result.avg_sold_price:.2f}")
-                    print(f"   Median: ${result.median_sold_price:.2f}")
-                    print(f"   Range: ${result.min_price:.2f} - ${result.max_price:.2f}")
-                    
-                    return result
-                    
+            await self._navigate("https://www.ebay.com", timeout=15)
+            await page_load_delay()
+            await _random_mouse_move(self.session, self.instance_id)
+        except:
+            pass
+        
+        # Type the search query into eBay's search box
+        print(f"   🔍 Typing search query...")
+        searched = await self._human_search_ebay(query, condition)
+        
+        if not searched:
+            # Fall back to direct URL if search box fails
+            print(f"   ⚠️ Search box failed, using direct URL...")
+            if not await self._navigate(url, timeout=25):
+                return None
+        
+        # Browse results like a human
+        await page_load_delay()
+        await _random_mouse_move(self.session, self.instance_id)
+        await self._scroll_results()
+        await simulate_human_browsing(self.session, self.instance_id)
+        
+        # Get page content (do this before browser connection becomes unstable)
+        print("   📄 Extracting page content...")
+        items = []
+        
+        try:
+            html = await self._get_page_content()
+            content_len = len(html) if html else 0
+            print(f"   📊 Got content: {content_len} chars")
+            
+            if html and any(marker in html for marker in _BLOCK_MARKERS):
+                pause = _back_off_after_block()
+                print(f"   🛑 eBay is rate limiting - pausing searches {pause:.0f}s")
+                html = ""
+                content_len = 0
+            
+            # Verify we have search results, not homepage
+            if html and 'Sold' in html and content_len > 10000:
+                items = self._parse_listings_from_html(html)
+                print(f"   📊 Parser returned: {len(items)} items")
+                if items:
+                    print(f"   ✅ Text parser found {len(items)} items")
+            elif html and 'Sold' not in html:
+                print("   ⚠️ Page doesn't contain sold listings (wrong page?)")
+            elif content_len < 10000:
+                print("   ⚠️ Content too short, page may not have loaded")
         except Exception as e:
-            print(f"❌ eBay scraper error: {e}")
             import traceback
+            print(f"   ⚠️ Content extraction failed: {e}")
             traceback.print_exc()
+        
+        # If text parsing didn't work, try JS extraction
+        if not items:
+            print("   📜 Trying JS extraction...")
+            try:
+                # Light scroll to trigger lazy load
+                await self._scroll_down(300)
+                await asyncio.sleep(1)
+                items = await self._extract_via_js()
+            except Exception as e:
+                print(f"   ⚠️ JS extraction failed: {e}")
+        
+        # Close browser (persistent sessions keep it for the next search)
+        if close_browser:
+            await self._close_browser()
+        
+        if not items:
+            print(f"❌ No sold items found for: {query}")
             return None
+        
+        _reset_block_backoff()
+        
+        # Limit results
+        items = items[:limit]
+        
+        # Calculate stats (one sorted copy gives median, min and max)
+        prices = sorted(item.total_price for item in items)
+        
+        result = EbayPriceResult(
+            query=query,
+            avg_sold_price=fmean(prices),
+            median_sold_price=median(prices),
+            min_price=prices[0],
+            max_price=prices[-1],
+            num_sold=len(prices),
+            recent_sales=items[:10],
+            lookup_time=datetime.now().isoformat()
+        )
+        
+        print(f"✅ Found {len(items)} sold items")
+        print(f"   Avg: ${result.avg_sold_price:.2f}")
+        print(f"   Median: ${result.median_sold_price:.2f}")
+        print(f"   Range: ${result.min_price:.2f} - ${result.max_price:.2f}")
+        
+        return result
 
 
 async def get_ebay_price(
@@ -5,6 +5,7 @@ Includes disambiguation check for overloaded terms.
 """
 import json
 import re
+from itertools import islice
 from pathlib import Path
 from typing import Optional
 import asyncio
@@ -46,6 +47,11 @@ DEFAULT_EXPANSIONS = {
     "sports cards": ["baseball cards", "football cards", "basketball cards", "topps", "panini"],
 }
 
+# Lowercased built-in expansions, built once so dedup checks skip .lower()
+_DEFAULT_EXPANSIONS_LOWER = {
+    k: [v.lower() for v in vs] for k, vs in DEFAULT_EXPANSIONS.items()
+}
+
 
 def load_custom_terms() -> dict:
     """Load user-defined custom term expansions"""
@@ -72,62 +78,70 @@ def get_all_expansions() -> dict:
     # Custom terms override/extend defaults
     for term, variations in custom.items():
         if term in expansions:
-            # Extend existing, avoiding duplicates
-            existing = set(v.lower() for v in expansions[term])
+            # Extend existing, avoiding duplicates (copy so defaults stay untouched)
+            existing = set(_DEFAULT_EXPANSIONS_LOWER.get(term, ()))
+            extended = list(expansions[term])
             for v in variations:
-                if v.lower() not in existing:
-                    expansions[term].append(v)
-                    existing.add(v.lower())
+                v_lower = v.lower()
+                if v_lower not in existing:
+                    extended.append(v)
+                    existing.add(v_lower)
+            expansions[term] = extended
         else:
             expansions[term] = variations
     
     return expansions
 
 
-def generate_typos(word: str, max_typos: int = 3) -> list[str]:
-    """
-    Algorithmically generate common typo patterns for a word.
-    """
-    if len(word) < 4:
-        return []
-    
-    typos = []
-    
+# Common keyboard adjacency mistakes
+_KEYBOARD_ADJACENT = {
+    'a': 'sq', 's': 'awd', 'd': 'sfe', 'f': 'dgr', 'g': 'fht',
+    'q': 'wa', 'w': 'qeas', 'e': 'wrd', 'r': 'etf', 't': 'ryg',
+    'i': 'uok', 'o': 'ipl', 'l': 'okp', 'n': 'bm', 'm': 'n',
+}
+
+
+def _typo_gen(word: str):
+    """Lazily yield typo candidates for a word, most common patterns first"""
     # Adjacent letter swaps (teh -> the)
     for i in range(len(word) - 1):
         typo = word[:i] + word[i+1] + word[i] + word[i+2:]
         if typo != word:
-            typos.append(typo)
+            yield typo
     
-    # Double letter (silve -> silver... wait that's adding)
     # Missing letter (silvr -> silver)
     for i in range(1, len(word) - 1):
         typo = word[:i] + word[i+1:]  # Skip a letter
         if len(typo) > 2:
-            typos.append(typo)
-    
-    # Common keyboard adjacency mistakes
-    keyboard_adjacent = {
-        'a': 'sq', 's': 'awd', 'd': 'sfe', 'f': 'dgr', 'g': 'fht',
-        'q': 'wa', 'w': 'qeas', 'e': 'wrd', 'r': 'etf', 't': 'ryg',
-        'i': 'uok', 'o': 'ipl', 'l': 'okp', 'n': 'bm', 'm': 'n',
-    }
-    for i, char in enumerate(word.lower()):
-        if char in keyboard_adjacent:
-            for adj in keyboard_adjacent[char][:1]:  # Just one adjacent
-                typo = word[:i] + adj + word[i+1:]
-                if typo != word:
-                    typos.append(typo)
+            yield typo
     
-    # Dedupe and limit
-    seen = set()
-    unique = []
-    for t in typos:
-        if t.lower() not in seen and t.lower() != word.lower():
-            seen.add(t.lower())
-            unique.append(t)
+    # Keyboard adjacency (just the first adjacent key)
+    for i, char in enumerate(word.lower()):
+        if char in _KEYBOARD_ADJACENT:
+            typo = word[:i] + _KEYBOARD_ADJACENT[char][0] + word[i+1:]
+            if typo != word:
+                yield typo
+
+
+def _dedupe(candidates, word: str):
+    """Yield case-insensitively unique candidates, skipping the word itself"""
+    seen = {word.lower()}
+    for t in candidates:
+        t_lower = t.lower()
+        if t_lower not in seen:
+            seen.add(t_lower)
+            yield t
+
+
+def generate_typos(word: str, max_typos: int = 3) -> list[str]:
+    """
+    Algorithmically generate common typo patterns for a word.
+    Stops generating as soon as max_typos unique variants are found.
+    """
+    if len(word) < 4:
+        return []
     
-    return unique[:max_typos]
+    return list(islice(_dedupe(_typo_gen(word), word), max_typos))
 
 
 def expand_search_term(term: str, include_typos: bool = True) -> list[str]:
@@ -137,14 +151,21 @@ def expand_search_term(term: str, include_typos: bool = True) -> list[str]:
     """
     term_lower = term.lower().strip()
     variations = [term]  # Always include original
+    seen = {term.lower()}
     
     # Get expansions (built-in + custom)
     expansions = get_all_expansions()
     
     # Check for matching expansions
     if term_lower in expansions:
-        for v in expansions[term_lower]:
-            if v.lower() not in [x.lower() for x in variations]:
+        variants = expansions[term_lower]
+        if variants is DEFAULT_EXPANSIONS.get(term_lower):
+            term_lower_variants = _DEFAULT_EXPANSIONS_LOWER[term_lower]
+        else:
+            term_lower_variants = [v.lower() for v in variants]
+        for v, v_lower in zip(variants, term_lower_variants):
+            if v_lower not in seen:
+                seen.add(v_lower)
                 variations.append(v)
     
     # Add typos if enabled
@@ -155,7 +176,9 @@ def expand_search_term(term: str, include_typos: bool = True) -> list[str]:
                 typos = generate_typos(word)
                 for typo in typos:
                     typo_term = term.replace(word, typo)
-                    if typo_term.lower() not in [x.lower() for x in variations]:
+                    typo_lower = typo_term.lower()
+                    if typo_lower not in seen:
+                        seen.add(typo_lower)
                         variations.append(typo_term)
     
     return variations
@@ -188,8 +211,9 @@ def get_all_search_variations(terms: list[str], expand: bool = True, include_typ
     for term in terms:
         expansions = expand_search_term(term, include_typos=include_typos)
         for exp in expansions:
-            if exp.lower() not in seen:
-                seen.add(exp.lower())
+            key = exp.lower()
+            if key not in seen:
+                seen.add(key)
                 all_variations.append(exp)
     
     return all_variations
@@ -327,40 +351,11 @@ ALWAYS_AMBIGUOUS = {
 }
 
 
-async def evaluate_search_term(
-    term: str,
-    ollama_url: str = "http://localhost:11434",
-    model: str = "qwen2.5"
-) -> dict:
-    """
-    Evaluate a search term for eBay search quality.
-    
-    The LLM thinks about what eBay would return for this term and determines
-    if the results would be muddied/mixed across unrelated product categories.
-    
-    Returns dict with:
-        - needs_clarification: bool
-        - interpretations: list of possible meanings with their eBay search terms
-        - reasoning: str explanation
-    """
-    # Check hardcoded always-ambiguous list first (bypass LLM for consistency)
-    term_lower = term.lower().strip()
-    if term_lower in ALWAYS_AMBIGUOUS:
-        meanings = ALWAYS_AMBIGUOUS[term_lower]
-        interpretations = [
-            {"meaning": meaning, "search_terms": terms}
-            for meaning, terms in meanings.items()
-        ]
-        return {
-            "needs_clarification": True,
-            "interpretations": interpretations,
-            "reasoning": f"'{term}' is a known ambiguous term with multiple meanings"
-        }
-    
-    if not HAS_HTTPX:
-        return {"needs_clarification": False, "reasoning": "httpx not available", "interpretations": []}
-    
-    prompt = f"""You are an eBay search expert. Your job is to determine if a search term would return MIXED, UNRELATED product categories.
+# O(1) skip set for the hardcoded ambiguous terms
+_AMBIGUOUS_KEYS = frozenset(ALWAYS_AMBIGUOUS)
+
+# Built once at import; only the term is substituted per call
+_PROMPT_TEMPLATE = """You are an eBay search expert. Your job is to determine if a search term would return MIXED, UNRELATED product categories.
 
 Search term: "{term}"
 
@@ -403,6 +398,42 @@ INTERPRETATIONS:
 - meaning2: search term 1, search term 2
 REASONING: [one sentence about the actual ambiguity]"""
 
+
+async def evaluate_search_term(
+    term: str,
+    ollama_url: str = "http://localhost:11434",
+    model: str = "qwen2.5"
+) -> dict:
+    """
+    Evaluate a search term for eBay search quality.
+    
+    The LLM thinks about what eBay would return for this term and determines
+    if the results would be muddied/mixed across unrelated product categories.
+    
+    Returns dict with:
+        - needs_clarification: bool
+        - interpretations: list of possible meanings with their eBay search terms
+        - reasoning: str explanation
+    """
+    # Check hardcoded always-ambiguous list first (bypass LLM for consistency)
+    term_lower = term.lower().strip()
+    if term_lower in _AMBIGUOUS_KEYS:
+        meanings = ALWAYS_AMBIGUOUS[term_lower]
+        interpretations = [
+            {"meaning": meaning, "search_terms": terms}
+            for meaning, terms in meanings.items()
+        ]
+        return {
+            "needs_clarification": True,
+            "interpretations": interpretations,
+            "reasoning": f"'{term}' is a known ambiguous term with multiple meanings"
+        }
+    
+    if not HAS_HTTPX:
+        return {"needs_clarification": False, "reasoning": "httpx not available", "interpretations": []}
+    
+    prompt = _PROMPT_TEMPLATE.format(term=term)
+
     try:
         async with httpx.AsyncClient(timeout=45.0) as client:
             response = await client.post(
@@ -4,40 +4,80 @@ Arbitrage calculation and analysis
 Uses stealth browser for eBay scraping (no API needed).
 """
 import asyncio
-from typing import Optional
+import heapq
+from typing import Awaitable, Callable, Optional
 import sys
 sys.path.insert(0, str(__file__).rsplit('/', 2)[0])
 
 from utils.listing_parser import Listing, clean_title_for_search
 from utils.pickup_cost import PickupCostCalculator, PickupCost
 from services.price_lookup import PriceLookupService, PriceLookupResult
+from utils.rate_limit import AdaptiveConcurrencyLimiter
+from utils.log import get_logger
 
+logger = get_logger("arbitrage")
 
-async def analyze_listing(
-    listing: Listing,
-    price_service: PriceLookupService,
-    price_sources: list[str] = ["ebay"],
+# Highest resale price we believe - matches the sold-price sanity filter
+# in ebay_lookup. FB placeholder prices ($99999 etc.) can never clear it.
+MAX_REFERENCE_PRICE = 50000.0
+
+
+def min_reference_price(
+    price: float,
     ebay_fee_percent: float = 13.25,
     shipping_estimate: float = 15.0,
     min_profit_dollars: float = 30.0,
-    min_profit_percent: float = 20.0,
-    use_ai_matching: bool = True,
+    min_profit_percent: float = 20.0
+) -> float:
+    """
+    Lowest reference price at which a listing could still be an
+    opportunity (pickup cost only raises it, so it's left out).
+    """
+    needed = min(min_profit_dollars, price * min_profit_percent / 100)
+    return (price + shipping_estimate + needed) / (1 - ebay_fee_percent / 100)
+
+
+def _clear_reference(listing: Listing) -> Listing:
+    """Mark a listing as having no usable reference price"""
+    listing.reference_price = None
+    listing.reference_source = None
+    listing.identified_title = None
+    return listing
+
+
+def _skip_unreachable(
+    listing: Listing,
+    ebay_fee_percent: float,
+    shipping_estimate: float,
+    min_profit_dollars: float,
+    min_profit_percent: float,
+    max_reference_price: float
+) -> bool:
+    """
+    Clear the listing's reference and return True if it would need a
+    resale above max_reference_price to turn a profit (no lookup needed).
+    """
+    required = min_reference_price(
+        listing.price, ebay_fee_percent, shipping_estimate,
+        min_profit_dollars, min_profit_percent
+    )
+    if required <= max_reference_price:
+        return False
+    logger.info("⏭️ Skipping (needs $%.0f+ resale): %s...", required, listing.title[:40])
+    _clear_reference(listing)
+    return True
+
+
+async def fetch_reference_price(
+    listing: Listing,
+    price_service: PriceLookupService,
+    price_sources: list[str] = ["ebay"],
     use_lowest_sold_price: bool = True,  # Use min instead of avg
     pickup_calculator: Optional[PickupCostCalculator] = None  # For fuel cost
 ) -> Listing:
     """
-    Analyze a listing for arbitrage opportunity.
-    
-    Updates the listing with:
-    - reference_price
-    - reference_source
-    - potential_profit
-    - profit_percent
-    - is_arbitrage_opportunity
-    
-    When use_ai_matching=True (default), uses the raw title and
-    AI vision model to verify eBay matches. This is more accurate
-    than keyword-cleaning approaches.
+    Fill in a listing's reference price (and pickup cost) - the I/O half
+    of the analysis. Profit math is done afterwards by compute_profits().
     
     Returns the updated listing.
     """
@@ -73,48 +113,118 @@ async def analyze_listing(
         listing.ebay_max_price = result.max_price
         listing.ebay_sample_size = result.sample_size
     else:
-        listing.reference_price = None
-        listing.reference_source = None
-        listing.identified_title = None
+        _clear_reference(listing)
     
     # Calculate pickup cost if calculator provided
-    pickup_cost = 0.0
     if pickup_calculator and hasattr(listing, 'location'):
         pickup_result = await pickup_calculator.calculate(
             location_string=listing.location
         )
         if pickup_result:
-            pickup_cost = pickup_result.fuel_cost
-            listing.pickup_cost = pickup_cost
+            listing.pickup_cost = pickup_result.fuel_cost
             listing.pickup_distance = pickup_result.round_trip_miles
     
-    # Calculate potential profit
-    if listing.reference_price and listing.reference_price > listing.price:
-        # Calculate sell price after fees
-        gross_sale = listing.reference_price
-        ebay_fees = gross_sale * (ebay_fee_percent / 100)
-        net_after_fees = gross_sale - ebay_fees - shipping_estimate
-        
-        # Total cost = purchase price + pickup fuel cost
-        total_cost = listing.price + pickup_cost
-        
-        # Profit = what you'd get - total cost
-        profit = net_after_fees - total_cost
-        profit_percent = (profit / total_cost) * 100 if total_cost > 0 else 0
-        
-        listing.potential_profit = round(profit, 2)
-        listing.profit_percent = round(profit_percent, 1)
+    return listing
+
+
+def compute_profits(
+    listings: list[Listing],
+    ebay_fee_percent: float = 13.25,
+    shipping_estimate: float = 15.0,
+    min_profit_dollars: float = 30.0,
+    min_profit_percent: float = 20.0
+) -> list[Listing]:
+    """
+    Calculate profit and opportunity flags for listings whose reference
+    price has already been fetched. Runs over the whole batch in one pass.
+    
+    Updates each listing's potential_profit, profit_percent and
+    is_arbitrage_opportunity, and returns the listings.
+    """
+    # Loop invariants, hoisted so each listing is a handful of float ops
+    keep_rate = 1 - ebay_fee_percent / 100  # Share of the sale kept after fees
+    
+    for listing in listings:
+        reference_price = listing.reference_price
+        price = listing.price
         
-        # Check if meets thresholds
-        listing.is_arbitrage_opportunity = (
-            profit >= min_profit_dollars or 
-            profit_percent >= min_profit_percent
-        )
-    else:
-        listing.potential_profit = 0
-        listing.profit_percent = 0
-        listing.is_arbitrage_opportunity = False
+        if reference_price and reference_price > price:
+            # Sell price after fees and shipping
+            net_after_fees = reference_price * keep_rate - shipping_estimate
+            
+            # Total cost = purchase price + pickup fuel cost
+            total_cost = price + (listing.pickup_cost or 0.0)
+            
+            # Profit = what you'd get - total cost
+            profit = net_after_fees - total_cost
+            profit_percent = profit * 100 / total_cost if total_cost > 0 else 0
+            
+            listing.potential_profit = round(profit, 2)
+            listing.profit_percent = round(profit_percent, 1)
+            
+            # Check if meets thresholds
+            listing.is_arbitrage_opportunity = (
+                profit >= min_profit_dollars or 
+                profit_percent >= min_profit_percent
+            )
+        else:
+            listing.potential_profit = 0
+            listing.profit_percent = 0
+            listing.is_arbitrage_opportunity = False
+    
+    return listings
+
+
+async def analyze_listing(
+    listing: Listing,
+    price_service: PriceLookupService,
+    price_sources: list[str] = ["ebay"],
+    ebay_fee_percent: float = 13.25,
+    shipping_estimate: float = 15.0,
+    min_profit_dollars: float = 30.0,
+    min_profit_percent: float = 20.0,
+    use_ai_matching: bool = True,
+    use_lowest_sold_price: bool = True,  # Use min instead of avg
+    pickup_calculator: Optional[PickupCostCalculator] = None,  # For fuel cost
+    max_reference_price: float = MAX_REFERENCE_PRICE
+) -> Listing:
+    """
+    Analyze a listing for arbitrage opportunity.
+    
+    Updates the listing with:
+    - reference_price
+    - reference_source
+    - potential_profit
+    - profit_percent
+    - is_arbitrage_opportunity
+    
+    When use_ai_matching=True (default), uses the raw title and
+    AI vision model to verify eBay matches. This is more accurate
+    than keyword-cleaning approaches.
     
+    Listings that would need a reference above max_reference_price to
+    turn a profit are skipped without a price lookup.
+    
+    Returns the updated listing.
+    """
+    if not _skip_unreachable(
+        listing, ebay_fee_percent, shipping_estimate,
+        min_profit_dollars, min_profit_percent, max_reference_price
+    ):
+        await fetch_reference_price(
+            listing,
+            price_service=price_service,
+            price_sources=price_sources,
+            use_lowest_sold_price=use_lowest_sold_price,
+            pickup_calculator=pickup_calculator
+        )
+    compute_profits(
+        [listing],
+        ebay_fee_percent=ebay_fee_percent,
+        shipping_estimate=shipping_estimate,
+        min_profit_dollars=min_profit_dollars,
+        min_profit_percent=min_profit_percent
+    )
     return listing
 
 
@@ -128,22 +238,34 @@ async def analyze_batch(
     shipping_estimate: float = 15.0,
     min_profit_dollars: float = 30.0,
     min_profit_percent: float = 20.0,
-    max_concurrent: int = 1,  # Browser scraping is slow, keep at 1
+    max_concurrent: int = 4,  # Lookups in flight (eBay pacing is per-host)
     use_ai_matching: bool = True,
     use_lowest_sold_price: bool = True,  # Use min price for profit calc
     vehicle_mpg: float = 0.0,  # 0 = don't calculate pickup cost
     zip_code: str = "",  # For gas price lookup
-    ai_min_confidence: float = 0.6
+    ai_min_confidence: float = 0.6,
+    max_reference_price: float = MAX_REFERENCE_PRICE,
+    on_opportunity: Optional[Callable[[Listing], Awaitable[None]]] = None
 ) -> list[Listing]:
     """
-    Analyze multiple listings with rate limiting.
+    Analyze multiple listings concurrently with rate limiting.
+    
+    Listings are finished in completion order; on_opportunity (if given)
+    is awaited as soon as each opportunity is found, so alerts don't wait
+    for the slowest lookup in the batch.
+    
+    Up to max_concurrent listings are analyzed at once; the limit drops
+    when eBay starts throttling (429/503) and recovers after clean runs.
+    eBay searches are paced by a per-host token bucket rather than
+    fixed sleeps. Listings that could only profit against a reference
+    above max_reference_price are skipped before any lookup.
     
     When use_ai_matching=True, uses AI vision model to verify that
     eBay sold items actually match the FB listing. More accurate
     than keyword-based matching.
     
-    Note: Browser scraping is sequential (max_concurrent=1 recommended)
-    because we spawn/close browser for each lookup.
+    One stealth browser session is opened for the whole batch and
+    reused by every lookup (see PriceLookupService.session()).
     """
     # Create price service with AI matching settings
     price_service = PriceLookupService(
@@ -161,64 +283,83 @@ async def analyze_batch(
             vehicle_mpg=vehicle_mpg,
             zip_code=zip_code
         )
-        print(f"🚗 Pickup cost enabled: {vehicle_mpg} MPG from {zip_code}")
+        logger.info("🚗 Pickup cost enabled: %s MPG from %s", vehicle_mpg, zip_code)
     
-    semaphore = asyncio.Semaphore(max_concurrent)
+    limiter = AdaptiveConcurrencyLimiter(max_concurrent)
     
     async def analyze_with_limit(listing: Listing) -> Listing:
-        async with semaphore:
-            print(f"📊 Analyzing: {listing.title[:40]}...")
-            return await analyze_listing(
+        if _skip_unreachable(
+            listing, ebay_fee_percent, shipping_estimate,
+            min_profit_dollars, min_profit_percent, max_reference_price
+        ):
+            return listing
+        
+        async with limiter.slot():
+            logger.info("📊 Analyzing: %s...", listing.title[:40])
+            return await fetch_reference_price(
                 listing,
                 price_service=price_service,
                 price_sources=price_sources,
-                ebay_fee_percent=ebay_fee_percent,
-                shipping_estimate=shipping_estimate,
-                min_profit_dollars=min_profit_dollars,
-                min_profit_percent=min_profit_percent,
                 use_lowest_sold_price=use_lowest_sold_price,
                 pickup_calculator=pickup_calculator
             )
     
-    # Process sequentially for browser scraping
-    if max_concurrent == 1:
-        analyzed = []
-        for listing in listings:
-            try:
-                result = await analyze_with_limit(listing)
-                analyzed.append(result)
-                # Small delay between lookups
-                await asyncio.sleep(1)
-            except Exception as e:
-                print(f"⚠️ Analysis error for {listing.title[:30]}: {e}")
-                analyzed.append(listing)
-        return analyzed
+    async def analyze_one(index: int, listing: Listing) -> tuple[int, Listing]:
+        try:
+            return index, await analyze_with_limit(listing)
+        except Exception as e:
+            logger.warning("⚠️ Analysis error for %s: %s", listing.title[:30], e)
+            return index, listing  # Return original listing
     
-    # Otherwise use gather
-    tasks = [analyze_with_limit(listing) for listing in listings]
-    results = await asyncio.gather(*tasks, return_exceptions=True)
+    analyzed = list(listings)  # Keep input order in the result
     
-    # Filter out exceptions
-    analyzed = []
-    for i, result in enumerate(results):
-        if isinstance(result, Listing):
-            analyzed.append(result)
-        elif isinstance(result, Exception):
-            print(f"⚠️ Analysis error: {result}")
-            analyzed.append(listings[i])  # Return original listing
+    async with price_service.session():
+        try:
+            tasks = [analyze_one(i, listing) for i, listing in enumerate(listings)]
+            for next_done in asyncio.as_completed(tasks):
+                index, listing = await next_done
+                compute_profits(
+                    [listing],
+                    ebay_fee_percent=ebay_fee_percent,
+                    shipping_estimate=shipping_estimate,
+                    min_profit_dollars=min_profit_dollars,
+                    min_profit_percent=min_profit_percent
+                )
+                analyzed[index] = listing
+                
+                if on_opportunity and listing.is_arbitrage_opportunity:
+                    try:
+                        await on_opportunity(listing)
+                    except Exception as e:
+                        logger.warning("⚠️ Opportunity callback error: %s", e)
+        finally:
+            await price_service.close()
     
     return analyzed
 
 
+def _profit_key(listing: Listing) -> float:
+    """Sort key: potential profit, treating None as 0"""
+    return listing.potential_profit or 0
+
+
 def filter_opportunities(listings: list[Listing]) -> list[Listing]:
     """Filter to only arbitrage opportunities, sorted by profit"""
     opportunities = [l for l in listings if l.is_arbitrage_opportunity]
-    return sorted(opportunities, key=lambda l: l.potential_profit or 0, reverse=True)
+    opportunities.sort(key=_profit_key, reverse=True)
+    return opportunities
 
 
 def print_analysis_report(listings: list[Listing]):
     """Print a formatted analysis report"""
-    opportunities = filter_opportunities(listings)
+    # Single pass: split opportunities from priced-but-unprofitable listings
+    opportunities = []
+    analyzed_but_no_profit = []
+    for l in listings:
+        if l.is_arbitrage_opportunity:
+            opportunities.append(l)
+        elif l.reference_price:
+            analyzed_but_no_profit.append(l)
     
     print("\n" + "=" * 70)
     print("ARBITRAGE ANALYSIS REPORT")
@@ -228,7 +369,8 @@ def print_analysis_report(listings: list[Listing]):
     
     if opportunities:
         print("\n🎯 TOP OPPORTUNITIES:\n")
-        for i, listing in enumerate(opportunities[:10], 1):
+        # Only the top 10 are shown - no need to sort the rest
+        for i, listing in enumerate(heapq.nlargest(10, opportunities, key=_profit_key), 1):
             print(f"{i}. {listing.title[:50]}...")
             print(f"   FB Price: ${listing.price:.2f}")
             print(f"   Reference: ${listing.reference_price:.2f} ({listing.reference_source})")
@@ -246,11 +388,6 @@ def print_analysis_report(listings: list[Listing]):
         print("\n❌ No arbitrage opportunities found meeting thresholds.")
     
     # Also show items with reference prices but no profit
-    analyzed_but_no_profit = [
-        l for l in listings 
-        if l.reference_price and not l.is_arbitrage_opportunity
-    ]
-    
     if analyzed_but_no_profit:
         print("\n📋 OTHER ANALYZED (no profit opportunity):\n")
         for listing in analyzed_but_no_profit[:5]:
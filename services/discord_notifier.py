@@ -3,11 +3,69 @@ Discord notification service for arbitrage alerts
 """
 import asyncio
 import httpx
-from datetime import datetime
 from typing import Optional
 import sys
 sys.path.append('..')
 from utils.listing_parser import Listing
+from utils.clock import iso_now
+
+try:
+    import orjson
+    _json_dumps = orjson.dumps
+except ImportError:
+    import json
+    
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _iso_ts() -> str:
+    """Embed timestamp (UTC, cached per second)"""
+    return iso_now(utc=True)
+
+# Shared webhook client (keeps the connection to Discord alive between alerts)
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_discord_client() -> httpx.AsyncClient:
+    """Get or create the shared Discord HTTP client"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(timeout=10.0)
+    return _client
+
+
+async def close_discord_client():
+    """Close the shared Discord HTTP client"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+# Static parts of the alert embed - per alert only the values are filled in
+_COLOR_GOOD = 0x00FF00
+_COLOR_OK = 0xFFFF00
+_FB_PRICE_FIELD = {"name": "📦 FB Marketplace Price", "inline": True}
+_REFERENCE_FIELD = {"name": "📊 Reference Price", "inline": True}
+_PROFIT_FIELD = {"name": "💵 Potential Profit", "inline": True}
+_LOCATION_FIELD = {"name": "📍 Location", "inline": True}
+_CONDITION_FIELD = {"name": "📋 Condition", "inline": True}
+_SOURCE_FIELD = {"name": "🔍 Price Source", "inline": True}
+_IDENTIFIED_FIELD = {"name": "🏷️ Identified As", "inline": False}
+_LINK_FIELD = {"name": "🔗 Listing", "inline": False}
+_footers: dict[str, dict] = {}
+
+
+def _footer(category: str) -> dict:
+    """Embed footer for a category (built once per category)"""
+    footer = _footers.get(category)
+    if footer is None:
+        footer = {"text": f"FB Arbitrage Scanner | {category}" if category else "FB Arbitrage Scanner"}
+        _footers[category] = footer
+    return footer
 
 
 async def send_discord_alert(
@@ -28,72 +86,38 @@ async def send_discord_alert(
     profit_str = f"${listing.potential_profit:.2f}" if listing.potential_profit else "Unknown"
     profit_pct_str = f"{listing.profit_percent:.1f}%" if listing.profit_percent else "Unknown"
     
-    # Build embed
+    # Build embed (the three price fields always come first)
     embed = {
         "title": f"💰 Arbitrage Alert: {listing.title[:100]}",
-        "color": 0x00FF00 if listing.potential_profit and listing.potential_profit > 50 else 0xFFFF00,
+        "color": _COLOR_GOOD if listing.potential_profit and listing.potential_profit > 50 else _COLOR_OK,
         "fields": [
-            {
-                "name": "📦 FB Marketplace Price",
-                "value": f"**${listing.price:.2f}**",
-                "inline": True
-            },
-            {
-                "name": "📊 Reference Price",
-                "value": f"${listing.reference_price:.2f}" if listing.reference_price else "N/A",
-                "inline": True
-            },
-            {
-                "name": "💵 Potential Profit",
-                "value": f"**{profit_str}** ({profit_pct_str})",
-                "inline": True
-            },
+            {**_FB_PRICE_FIELD, "value": f"**${listing.price:.2f}**"},
+            {**_REFERENCE_FIELD, "value": f"${listing.reference_price:.2f}" if listing.reference_price else "N/A"},
+            {**_PROFIT_FIELD, "value": f"**{profit_str}** ({profit_pct_str})"},
         ],
-        "footer": {
-            "text": f"FB Arbitrage Scanner | {category}" if category else "FB Arbitrage Scanner"
-        },
-        "timestamp": datetime.utcnow().isoformat()
+        "footer": _footer(category),
+        "timestamp": _iso_ts()
     }
     
     # Add optional fields
     if listing.location:
-        embed["fields"].append({
-            "name": "📍 Location",
-            "value": listing.location,
-            "inline": True
-        })
+        embed["fields"].append({**_LOCATION_FIELD, "value": listing.location})
     
     if listing.condition:
-        embed["fields"].append({
-            "name": "📋 Condition",
-            "value": listing.condition,
-            "inline": True
-        })
+        embed["fields"].append({**_CONDITION_FIELD, "value": listing.condition})
     
     if listing.reference_source:
-        embed["fields"].append({
-            "name": "🔍 Price Source",
-            "value": listing.reference_source,
-            "inline": True
-        })
+        embed["fields"].append({**_SOURCE_FIELD, "value": listing.reference_source})
     
     # Add identified product name if different from original title
     identified = getattr(listing, 'identified_title', None)
     if identified and identified != listing.title:
-        embed["fields"].append({
-            "name": "🏷️ Identified As",
-            "value": identified[:100],
-            "inline": False
-        })
+        embed["fields"].append({**_IDENTIFIED_FIELD, "value": identified[:100]})
     
     # Add listing URL if available
     if listing.listing_url:
         embed["url"] = listing.listing_url
-        embed["fields"].append({
-            "name": "🔗 Listing",
-            "value": f"[View on Facebook]({listing.listing_url})",
-            "inline": False
-        })
+        embed["fields"].append({**_LINK_FIELD, "value": f"[View on Facebook]({listing.listing_url})"})
     
     # Add image if available
     if listing.image_url:
@@ -104,20 +128,19 @@ async def send_discord_alert(
     }
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.post(
-                webhook_url,
-                json=payload,
-                headers={"Content-Type": "application/json"}
-            )
+        resp = await get_discord_client().post(
+            webhook_url,
+            content=_json_dumps(payload),
+            headers=_JSON_HEADERS
+        )
+        
+        if resp.status_code in (200, 204):
+            print(f"✅ Discord alert sent: {listing.title[:50]}...")
+            return True
+        else:
+            print(f"❌ Discord error: {resp.status_code} {resp.text}")
+            return False
             
-            if resp.status_code in (200, 204):
-                print(f"✅ Discord alert sent: {listing.title[:50]}...")
-                return True
-            else:
-                print(f"❌ Discord error: {resp.status_code} {resp.text}")
-                return False
-                
     except Exception as e:
         print(f"❌ Discord error: {e}")
         return False
@@ -154,7 +177,7 @@ async def send_scan_summary(
                 "inline": True
             }
         ],
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": _iso_ts()
     }
     
     if best_deal and best_deal.potential_profit:
@@ -167,9 +190,12 @@ async def send_scan_summary(
     payload = {"embeds": [embed]}
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.post(webhook_url, json=payload)
-            return resp.status_code in (200, 204)
+        resp = await get_discord_client().post(
+            webhook_url,
+            content=_json_dumps(payload),
+            headers=_JSON_HEADERS
+        )
+        return resp.status_code in (200, 204)
     except:
         return False
 
@@ -184,14 +210,17 @@ async def send_error_alert(webhook_url: str, error_msg: str) -> bool:
             "title": "⚠️ Scanner Error",
             "description": error_msg[:500],
             "color": 0xFF0000,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": _iso_ts()
         }]
     }
     
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.post(webhook_url, json=payload)
-            return resp.status_code in (200, 204)
+        resp = await get_discord_client().post(
+            webhook_url,
+            content=_json_dumps(payload),
+            headers=_JSON_HEADERS
+        )
+        return resp.status_code in (200, 204)
     except:
         return False
 
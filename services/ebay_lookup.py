@@ -7,12 +7,50 @@ import asyncio
 import httpx
 import base64
 import re
+from itertools import islice
+from statistics import fmean, median
 from typing import Optional
 from dataclasses import dataclass
 from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+import sys
+sys.path.insert(0, str(__file__).rsplit('/', 2)[0])
 
+from utils.rate_limit import get_host_limiter, retry_after_seconds
+from utils.log import get_logger
+from utils.clock import iso_now
 
-@dataclass
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_loads = json.loads
+
+logger = get_logger("ebay_lookup")
+
+
+# Sold price in scraped HTML: $XXX.XX / $X,XXX.XX (matched on raw bytes)
+_PRICE_RE = re.compile(rb'\$([\d,]+\.\d{2})')
+# Throttling responses worth retrying, and how many times
+_RETRY_STATUSES = (429, 503)
+MAX_RETRIES = 4
+# Bytes carried into the next chunk so a price split across chunks is still seen
+_PRICE_OVERLAP = 32
+# Characters eBay's keyword search chokes on
+_SANITIZE_RE = re.compile(r'[^\w\s-]')
+
+
+# Finding API JSON wraps every value in a one-element list
+_NO_FIELDS: dict = {}  # Shared read-only default for missing objects
+
+
+def _first(values, default=None):
+    """First element of a Finding API value list, or default if missing/empty"""
+    return values[0] if values else default
+
+
+@dataclass(slots=True, frozen=True)
 class EbayPriceResult:
     """Result from eBay price lookup"""
     query: str
@@ -28,6 +66,40 @@ class EbayPriceResult:
         return f"eBay: ${self.avg_sold_price:.2f} avg (n={self.num_sold})"
 
 
+async def _request(client: httpx.AsyncClient, method: str, url: str, **kwargs) -> httpx.Response:
+    """
+    Send a request paced by the host's token bucket. 429/503 responses
+    pause the bucket (honouring Retry-After) and are retried with
+    exponential backoff.
+    """
+    limiter = get_host_limiter(urlsplit(url).hostname)
+    for attempt in range(MAX_RETRIES + 1):
+        await limiter.acquire()
+        resp = await client.request(method, url, **kwargs)
+        if resp.status_code not in _RETRY_STATUSES or attempt == MAX_RETRIES:
+            return resp
+        delay = retry_after_seconds(resp.headers, attempt)
+        limiter.pause(delay)
+        logger.info("   ⏳ eBay returned %d, backing off %.0fs...", resp.status_code, delay)
+    return resp
+
+
+def _price_result(query: str, prices: list[float], recent_sales: list[dict]) -> EbayPriceResult:
+    """Build an EbayPriceResult from a non-empty list of sold prices"""
+    # One sort yields min, median and max together
+    ordered = sorted(prices)
+    return EbayPriceResult(
+        query=query,
+        avg_sold_price=fmean(ordered),
+        median_sold_price=median(ordered),
+        min_price=ordered[0],
+        max_price=ordered[-1],
+        num_sold=len(ordered),
+        recent_sales=recent_sales[:10],
+        lookup_time=iso_now()
+    )
+
+
 class EbayClient:
     """eBay API client for price lookups"""
     
@@ -37,12 +109,28 @@ class EbayClient:
         self.dev_id = dev_id
         self.access_token = None
         self.token_expires = None
+        self._client: Optional[httpx.AsyncClient] = None
         
         # API endpoints
         self.auth_url = "https://api.ebay.com/identity/v1/oauth2/token"
         self.browse_url = "https://api.ebay.com/buy/browse/v1"
         self.finding_url = "https://svcs.ebay.com/services/search/FindingService/v1"
     
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get or create the shared HTTP client (keeps connections alive across calls)"""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=15.0,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+            )
+        return self._client
+    
+    async def close(self):
+        """Close HTTP client"""
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+    
     async def get_oauth_token(self) -> str:
         """Get OAuth token for Browse API"""
         if self.access_token and self.token_expires and datetime.now() < self.token_expires:
@@ -51,28 +139,28 @@ class EbayClient:
         # Client credentials flow
         credentials = base64.b64encode(f"{self.app_id}:{self.cert_id}".encode()).decode()
         
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                self.auth_url,
-                headers={
-                    "Content-Type": "application/x-www-form-urlencoded",
-                    "Authorization": f"Basic {credentials}"
-                },
-                data={
-                    "grant_type": "client_credentials",
-                    "scope": "https://api.ebay.com/oauth/api_scope"
-                }
-            )
-            
-            if resp.status_code != 200:
-                raise Exception(f"OAuth failed: {resp.status_code} {resp.text}")
-            
-            data = resp.json()
-            self.access_token = data["access_token"]
-            expires_in = data.get("expires_in", 7200)
-            self.token_expires = datetime.now() + timedelta(seconds=expires_in - 60)
-            
-            return self.access_token
+        resp = await _request(
+            self._get_client(), "POST",
+            self.auth_url,
+            headers={
+                "Content-Type": "application/x-www-form-urlencoded",
+                "Authorization": f"Basic {credentials}"
+            },
+            data={
+                "grant_type": "client_credentials",
+                "scope": "https://api.ebay.com/oauth/api_scope"
+            }
+        )
+        
+        if resp.status_code != 200:
+            raise Exception(f"OAuth failed: {resp.status_code} {resp.text}")
+        
+        data = resp.json()
+        self.access_token = data["access_token"]
+        expires_in = data.get("expires_in", 7200)
+        self.token_expires = datetime.now() + timedelta(seconds=expires_in - 60)
+        
+        return self.access_token
     
     async def search_sold_items(self, query: str, limit: int = 50) -> Optional[EbayPriceResult]:
         """
@@ -80,7 +168,7 @@ class EbayClient:
         Uses the Finding API's findCompletedItems.
         """
         # Clean up query
-        query = re.sub(r'[^\w\s-]', '', query)
+        query = _SANITIZE_RE.sub('', query)
         query = ' '.join(query.split()[:10])  # Max 10 words
         
         params = {
@@ -99,22 +187,21 @@ class EbayClient:
         }
         
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.get(self.finding_url, params=params)
-                
-                if resp.status_code != 200:
-                    print(f"eBay API error: {resp.status_code}")
-                    return None
-                
-                data = resp.json()
-                
+            resp = await _request(self._get_client(), "GET", self.finding_url, params=params)
+            
+            if resp.status_code != 200:
+                logger.warning("eBay API error: %d", resp.status_code)
+                return None
+            
+            data = _json_loads(resp.content)
+            
             # Parse response
-            result = data.get("findCompletedItemsResponse", [{}])[0]
-            search_result = result.get("searchResult", [{}])[0]
+            result = _first(data.get("findCompletedItemsResponse"), _NO_FIELDS)
+            search_result = _first(result.get("searchResult"), _NO_FIELDS)
             items = search_result.get("item", [])
             
             if not items:
-                print(f"No sold items found for: {query}")
+                logger.info("No sold items found for: %s", query)
                 return None
             
             # Extract prices
@@ -123,70 +210,79 @@ class EbayClient:
             
             for item in items:
                 try:
-                    selling_status = item.get("sellingStatus", [{}])[0]
-                    price_info = selling_status.get("currentPrice", [{}])[0]
+                    selling_status = _first(item.get("sellingStatus"), _NO_FIELDS)
+                    price_info = _first(selling_status.get("currentPrice"), _NO_FIELDS)
                     price = float(price_info.get("__value__", 0))
                     
                     if price > 0:
                         prices.append(price)
                         
                         recent_sales.append({
-                            "title": item.get("title", [""])[0],
+                            "title": _first(item.get("title"), ""),
                             "price": price,
-                            "end_time": item.get("listingInfo", [{}])[0].get("endTime", [""])[0],
-                            "condition": item.get("condition", [{}])[0].get("conditionDisplayName", [""])[0] if item.get("condition") else "",
-                            "url": item.get("viewItemURL", [""])[0],
+                            "end_time": _first(_first(item.get("listingInfo"), _NO_FIELDS).get("endTime"), ""),
+                            "condition": _first(_first(item.get("condition"), _NO_FIELDS).get("conditionDisplayName"), ""),
+                            "url": _first(item.get("viewItemURL"), ""),
                         })
-                except (KeyError, IndexError, ValueError):
+                except (KeyError, IndexError, AttributeError, ValueError):
                     continue
             
             if not prices:
                 return None
             
-            prices.sort()
-            median_idx = len(prices) // 2
-            
-            return EbayPriceResult(
-                query=query,
-                avg_sold_price=sum(prices) / len(prices),
-                median_sold_price=prices[median_idx],
-                min_price=min(prices),
-                max_price=max(prices),
-                num_sold=len(prices),
-                recent_sales=recent_sales[:10],
-                lookup_time=datetime.now().isoformat()
-            )
+            return _price_result(query, prices, recent_sales)
             
         except Exception as e:
-            print(f"eBay lookup error: {e}")
+            logger.warning("eBay lookup error: %s", e)
             return None
     
     async def search_active_listings(self, query: str, limit: int = 20) -> list[dict]:
         """Search active listings (for comparison)"""
         token = await self.get_oauth_token()
         
-        query = re.sub(r'[^\w\s-]', '', query)
+        query = _SANITIZE_RE.sub('', query)
         
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.get(
-                f"{self.browse_url}/item_summary/search",
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "X-EBAY-C-MARKETPLACE-ID": "EBAY_US"
-                },
-                params={
-                    "q": query,
-                    "limit": limit,
-                    "filter": "buyingOptions:{FIXED_PRICE}"
-                }
-            )
-            
-            if resp.status_code != 200:
-                print(f"eBay search error: {resp.status_code}")
-                return []
-            
-            data = resp.json()
-            return data.get("itemSummaries", [])
+        resp = await _request(
+            self._get_client(), "GET",
+            f"{self.browse_url}/item_summary/search",
+            headers={
+                "Authorization": f"Bearer {token}",
+                "X-EBAY-C-MARKETPLACE-ID": "EBAY_US"
+            },
+            params={
+                "q": query,
+                "limit": limit,
+                "filter": "buyingOptions:{FIXED_PRICE}"
+            }
+        )
+        
+        if resp.status_code != 200:
+            logger.warning("eBay search error: %d", resp.status_code)
+            return []
+        
+        data = _json_loads(resp.content)
+        return data.get("itemSummaries", [])
+
+
+# Shared client for the scrape fallback (reused across lookups)
+_scrape_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_scrape_client() -> httpx.AsyncClient:
+    """Get or create the module-level scrape client"""
+    global _scrape_client
+    if _scrape_client is None or _scrape_client.is_closed:
+        _scrape_client = httpx.AsyncClient(
+            timeout=15.0,
+            http2=True,
+            headers={
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+                # Search pages compress ~5x; httpx decodes transparently
+                "Accept-Encoding": "gzip, br",
+            },
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+        )
+    return _scrape_client
 
 
 # Simple fallback using web scraping if API not available
@@ -201,52 +297,47 @@ async def scrape_ebay_sold_prices(query: str, limit: int = 20) -> Optional[EbayP
     url = f"https://www.ebay.com/sch/i.html?_nkw={encoded_query}&LH_Complete=1&LH_Sold=1&_sop=13"
     
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.get(
-                url,
-                headers={
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                }
-            )
-            
-            if resp.status_code != 200:
-                return None
-            
-            html = resp.text
-            
-        # Extract prices from sold listings
-        # Pattern: $XXX.XX format
-        price_pattern = r'\$([\d,]+\.\d{2})'
-        matches = re.findall(price_pattern, html)
+        # Stream the page and scan raw bytes, stopping once `limit` prices are seen
+        client = _get_scrape_client()
+        limiter = get_host_limiter("ebay.com")
+        matches: list[bytes] = []
+        for attempt in range(MAX_RETRIES + 1):
+            await limiter.acquire()
+            async with client.stream("GET", url) as resp:
+                if resp.status_code in _RETRY_STATUSES and attempt < MAX_RETRIES:
+                    delay = retry_after_seconds(resp.headers, attempt)
+                    limiter.pause(delay)
+                    logger.info("   ⏳ eBay returned %d, backing off %.0fs...", resp.status_code, delay)
+                    continue
+                if resp.status_code != 200:
+                    return None
+                
+                tail = b""
+                async for chunk in resp.aiter_bytes(65536):
+                    buf = tail + chunk
+                    last_end = 0
+                    for m in islice(_PRICE_RE.finditer(buf), limit - len(matches)):
+                        matches.append(m.group(1))
+                        last_end = m.end()
+                    if len(matches) >= limit:
+                        break
+                    tail = buf[max(last_end, len(buf) - _PRICE_OVERLAP):]
+                break
         
-        prices = []
-        for match in matches[:limit]:
-            try:
-                price = float(match.replace(',', ''))
-                if 0 < price < 50000:  # Sanity check
-                    prices.append(price)
-            except ValueError:
-                continue
+        # The pattern guarantees a parseable number once commas are dropped
+        prices = [
+            price for price in (float(m.replace(b',', b'')) for m in matches)
+            if 0 < price < 50000  # Sanity check
+        ]
         
         if not prices:
             return None
         
-        prices.sort()
-        median_idx = len(prices) // 2
-        
-        return EbayPriceResult(
-            query=query,
-            avg_sold_price=sum(prices) / len(prices),
-            median_sold_price=prices[median_idx],
-            min_price=min(prices),
-            max_price=max(prices),
-            num_sold=len(prices),
-            recent_sales=[],  # Can't get details from scrape
-            lookup_time=datetime.now().isoformat()
-        )
+        # Can't get sale details from scrape
+        return _price_result(query, prices, [])
         
     except Exception as e:
-        print(f"eBay scrape error: {e}")
+        logger.warning("eBay scrape error: %s", e)
         return None
 
 
@@ -257,7 +348,10 @@ async def get_ebay_price(query: str, app_id: str = "", cert_id: str = "") -> Opt
     """
     if app_id:
         client = EbayClient(app_id, cert_id)
-        result = await client.search_sold_items(query)
+        try:
+            result = await client.search_sold_items(query)
+        finally:
+            await client.close()
         if result:
             return result
     
@@ -6,19 +6,68 @@ Uses stealth browser for eBay (no API needed).
 Uses AI vision model to verify product matches.
 """
 import asyncio
+import re
+import httpx
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from dataclasses import dataclass
+from statistics import fmean, median, pstdev
 from typing import Optional, Literal
 import sys
 sys.path.insert(0, str(__file__).rsplit('/', 2)[0])
 
 from scrapers.ebay_scraper import EbayScraper, EbayPriceResult, EbaySoldItem, get_ebay_price
-from services.pricecharting_lookup import get_pricecharting_price, PriceChartingResult
-from utils.ai_matcher import AIItemMatcher, MatchResult
+from services.pricecharting_lookup import get_pricecharting_price, close_pricecharting_client, PriceChartingResult
+from utils.ai_matcher import AIItemMatcher, CachedAIMatcher, MatchResult, title_similarity
 from utils.title_identifier import TitleIdentifier, IdentifiedProduct
-from utils.search_term_generator import SearchTermGenerator, SearchTermResult, MultiItemResult
+from utils.log import get_logger
+from utils.search_term_generator import (
+    SearchTermGenerator, CachedSearchTermGenerator, SearchTermResult, MultiItemResult
+)
 
+logger = get_logger("price_lookup")
 
-@dataclass
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _price_stats(prices: list[float]) -> tuple[float, float, float, float]:
+    """(mean, median, min, max) of a non-empty price list, from one sort"""
+    ordered = sorted(prices)
+    return fmean(ordered), median(ordered), ordered[0], ordered[-1]
+
+
+def _prices_converged(prices: list[float], min_samples: int = 5, max_cv: float = 0.15) -> bool:
+    """Enough prices, tightly grouped (coefficient of variation under max_cv)"""
+    if len(prices) < min_samples:
+        return False
+    mean = fmean(prices)
+    return mean > 0 and pstdev(prices, mean) / mean < max_cv
+
+
+def _listing_fingerprint(item: EbaySoldItem) -> tuple[str, int]:
+    """Same title + same (rounded) price = same sale relisted under another URL"""
+    return _WHITESPACE_RE.sub(' ', item.title.lower()).strip(), round(item.total_price)
+
+
+def _rank_by_title(
+    candidates: list[EbaySoldItem],
+    reference_titles: list[str],
+    min_score: float
+) -> list[EbaySoldItem]:
+    """
+    Candidates whose title resembles any reference title (score >= min_score),
+    most similar first - obvious mismatches never reach the LLM.
+    """
+    scored = [
+        (max(title_similarity(ref, item.title) for ref in reference_titles), item)
+        for item in candidates
+    ]
+    scored.sort(key=lambda pair: pair[0], reverse=True)
+    return [item for score, item in scored if score >= min_score]
+
+
+@dataclass(slots=True, frozen=True)
 class PriceLookupResult:
     """Unified price lookup result"""
     query: str
@@ -44,6 +93,18 @@ class PriceLookupService:
     - AI-verified matching (uses vision model to confirm product matches)
     """
     
+    # Successful lookups are reused for duplicate titles within this window
+    LOOKUP_CACHE_TTL = 3600  # seconds
+    LOOKUP_CACHE_SIZE = 512
+    # Concurrent eBay searches (browsers) inside a session() - kept low so
+    # the searches don't look like a bot to eBay
+    MAX_SEARCH_BROWSERS = 3
+    # eBay titles scoring below this against the FB title / search terms
+    # (title_similarity, 0-100) are rejected without an AI comparison
+    MIN_TITLE_SIMILARITY = 45
+    # PriceCharting lookups in flight at once (the API allows ~500/day)
+    MAX_PRICECHARTING_CALLS = 5
+    
     def __init__(
         self,
         stealth_browser_path: str = None,
@@ -51,7 +112,9 @@ class PriceLookupService:
         headless: bool = True,
         ebay_condition: str = "used",
         use_ai_matching: bool = True,
-        ai_min_confidence: float = 0.6
+        ai_min_confidence: float = 0.6,
+        max_concurrent_ai_calls: int = 8,
+        ai_early_exit_matches: int = 8
     ):
         # Auto-detect stealth browser if not provided
         if stealth_browser_path is None:
@@ -64,32 +127,160 @@ class PriceLookupService:
         self.use_ai_matching = use_ai_matching
         self.ai_min_confidence = ai_min_confidence
         
-        # Reuse scraper instance for batch lookups
+        # Caps LLM verification calls in flight across all lookups
+        self._ai_semaphore = asyncio.Semaphore(max_concurrent_ai_calls)
+        # Smart lookups stop verifying once this many matches are found
+        self.ai_early_exit_matches = ai_early_exit_matches
+        self._pricecharting_semaphore = asyncio.Semaphore(self.MAX_PRICECHARTING_CALLS)
+        
+        # Reuse scraper instance for batch lookups (set by session())
         self._ebay_scraper = None
+        self._one_shot_scraper = None
         self._ai_matcher = None
         self._title_identifier = None
         self._search_term_generator = None
+        # One connection pool for the Gemini/ollama/image calls of all three helpers
+        self._http_client: Optional[httpx.AsyncClient] = None
+        
+        # query key -> (stored_at, result), oldest first
+        self._lookup_cache: OrderedDict[tuple, tuple[float, PriceLookupResult]] = OrderedDict()
+    
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Get or create the HTTP client shared by the AI helpers"""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                http2=True,
+                timeout=90.0,
+                limits=httpx.Limits(max_keepalive_connections=10, max_connections=20)
+            )
+        return self._http_client
     
-    async def _get_search_term_generator(self) -> SearchTermGenerator:
-        """Get or create search term generator instance (uses Gemini for vision)"""
+    async def _get_search_term_generator(self) -> CachedSearchTermGenerator:
+        """Get or create search term generator instance (uses Gemini for vision, results cached)"""
         if self._search_term_generator is None:
-            self._search_term_generator = SearchTermGenerator()
+            self._search_term_generator = CachedSearchTermGenerator(
+                SearchTermGenerator(client=self._get_http_client())
+            )
         return self._search_term_generator
     
     async def _get_title_identifier(self) -> TitleIdentifier:
         """Get or create title identifier instance"""
         if self._title_identifier is None:
-            self._title_identifier = TitleIdentifier()
+            self._title_identifier = TitleIdentifier(client=self._get_http_client())
         return self._title_identifier
     
-    async def _get_ai_matcher(self) -> AIItemMatcher:
-        """Get or create AI matcher instance"""
+    async def _get_ai_matcher(self) -> CachedAIMatcher:
+        """Get or create AI matcher instance (verdicts cached on disk)"""
         if self._ai_matcher is None:
-            self._ai_matcher = AIItemMatcher(
-                match_threshold=self.ai_min_confidence
+            self._ai_matcher = CachedAIMatcher(
+                AIItemMatcher(
+                    match_threshold=self.ai_min_confidence,
+                    client=self._get_http_client()
+                )
             )
         return self._ai_matcher
     
+    async def _verify_candidates(
+        self,
+        fb_title: str,
+        fb_description: str,
+        fb_image_url: Optional[str],
+        candidates: list[EbaySoldItem],
+        stop_after_matches: Optional[int] = None,
+        stop_when_converged: bool = False
+    ) -> list[Optional[MatchResult]]:
+        """
+        AI-compare every candidate concurrently; results in candidate order.
+        
+        With stop_after_matches, the remaining comparisons are cancelled
+        once that many matches are in; with stop_when_converged, as soon
+        as the matched prices agree closely (see _prices_converged).
+        Cancelled comparisons come back as None.
+        """
+        matcher = await self._get_ai_matcher()
+        # Only ai_semaphore comparisons run at once; start every image
+        # download now so queued comparisons don't wait on the network
+        matcher.prefetch_images([fb_image_url, *(item.image_url for item in candidates)])
+        
+        async def verify(ebay_item: EbaySoldItem) -> MatchResult:
+            async with self._ai_semaphore:
+                return await matcher.compare_listings(
+                    fb_title=fb_title,
+                    fb_description=fb_description,
+                    fb_image_url=fb_image_url,
+                    ebay_title=ebay_item.title,
+                    ebay_description="",
+                    ebay_image_url=ebay_item.image_url
+                )
+        
+        if stop_after_matches is None and not stop_when_converged:
+            return await asyncio.gather(*(verify(item) for item in candidates))
+        
+        tasks = [asyncio.ensure_future(verify(item)) for item in candidates]
+        item_for_task = dict(zip(tasks, candidates))
+        matched_prices: list[float] = []
+        pending = set(tasks)
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.result().is_match:
+                        matched_prices.append(item_for_task[task].total_price)
+                
+                if stop_after_matches and len(matched_prices) >= stop_after_matches:
+                    break
+                if stop_when_converged and _prices_converged(matched_prices):
+                    logger.info("   🎯 Prices converged after %d matches", len(matched_prices))
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+        
+        return [
+            task.result() if task.done() and not task.cancelled() else None
+            for task in tasks
+        ]
+    
+    async def _get_ebay_scraper(self) -> EbayScraper:
+        """
+        Get the eBay scraper: the warm shared browser while a session() is
+        open, otherwise one reusable scraper that spawns a browser per search.
+        
+        The persistent browser is only started by session() - its MCP
+        connection has to be opened and closed by the same task, which a
+        lazy start inside concurrent lookups can't guarantee.
+        """
+        if self._ebay_scraper is not None:
+            return self._ebay_scraper
+        if self._one_shot_scraper is None:
+            self._one_shot_scraper = EbayScraper(
+                stealth_browser_path=self.stealth_browser_path,
+                headless=self.headless
+            )
+        return self._one_shot_scraper
+    
+    @asynccontextmanager
+    async def session(self):
+        """
+        Keep one stealth browser open for every eBay lookup made inside
+        the block, instead of spawning and closing one per search.
+        
+            async with price_service.session():
+                await price_service.lookup(...)
+        """
+        scraper = EbayScraper(
+            stealth_browser_path=self.stealth_browser_path,
+            headless=self.headless,
+            max_browsers=self.MAX_SEARCH_BROWSERS
+        )
+        await scraper.start()
+        self._ebay_scraper = scraper
+        try:
+            yield self
+        finally:
+            self._ebay_scraper = None
+            await scraper.close()
+    
     async def close(self):
         """Close any open connections"""
         if self._ai_matcher:
@@ -101,6 +292,10 @@ class PriceLookupService:
         if self._search_term_generator:
             await self._search_term_generator.close()
             self._search_term_generator = None
+        if self._http_client:
+            await self._http_client.aclose()
+            self._http_client = None
+        await close_pricecharting_client()
     
     async def lookup_ebay_smart(
         self,
@@ -110,7 +305,8 @@ class PriceLookupService:
         condition: Optional[str] = None,
         max_search_queries: int = 3,
         max_candidates_per_query: int = 5,
-        skip_ai_verification: bool = False  # Skip AI match verification (trust search term)
+        skip_ai_verification: bool = False,  # Skip AI match verification (trust search term)
+        adaptive_stopping: bool = True  # Stop verifying once matched prices agree
     ) -> Optional[PriceLookupResult]:
         """
         Smart eBay lookup with LLM-powered title identification.
@@ -129,6 +325,8 @@ class PriceLookupService:
             condition: eBay condition filter
             max_search_queries: How many query variations to try
             max_candidates_per_query: Max eBay results to check per query
+            adaptive_stopping: Stop AI verification once 5+ matched prices
+                agree within 15% (coefficient of variation)
             
         Returns:
             PriceLookupResult with verified matches, or None
@@ -147,11 +345,11 @@ class PriceLookupService:
         valid_items = multi_result.valid_items
         
         if not valid_items:
-            print(f"   🚫 All items dropped - no searchable products identified")
+            logger.info("   🚫 All items dropped - no searchable products identified")
             return None
         
         if multi_result.is_multi_item:
-            print(f"   📦 Multi-item listing: {len(valid_items)} searchable items found")
+            logger.info("   📦 Multi-item listing: %d searchable items found", len(valid_items))
         
         # Search for each valid item and combine results
         all_ebay_results = []
@@ -161,32 +359,46 @@ class PriceLookupService:
         for item_result in valid_items:
             search_queries.append(item_result.search_term)
         
-        print(f"   🔎 Searching eBay for {len(search_queries)} term(s)...")
+        logger.info("   🔎 Searching eBay for %d term(s)...", len(search_queries))
         
         # Step 2: Search eBay with each query variation
-        scraper = EbayScraper(
-            stealth_browser_path=self.stealth_browser_path,
-            headless=self.headless
-        )
+        scraper = await self._get_ebay_scraper()
         
         all_results: list[EbaySoldItem] = []
         seen_urls = set()
+        seen_fingerprints: set[tuple[str, int]] = set()
         
-        for i, query in enumerate(search_queries):
-            print(f"      [{i+1}/{len(search_queries)}] Searching: {query}")
+        async def search(i: int, query: str):
             result = await scraper.search_sold_items(query, condition=cond)
-            
+            logger.info(
+                "      [%d/%d] Searched: %s (%d sales)", i + 1, len(search_queries), query,
+                len(result.recent_sales) if result and result.recent_sales else 0
+            )
+            return result
+        
+        # Run the searches side by side (the scraper caps how many browsers
+        # are open), then merge in query order
+        results = await asyncio.gather(
+            *(search(i, query) for i, query in enumerate(search_queries))
+        )
+        
+        for result in results:
             if result and result.recent_sales:
                 for item in result.recent_sales[:max_candidates_per_query]:
-                    if item.url not in seen_urls:
-                        all_results.append(item)
-                        seen_urls.add(item.url)
+                    if item.url in seen_urls:
+                        continue
+                    fingerprint = _listing_fingerprint(item)
+                    if fingerprint in seen_fingerprints:
+                        continue
+                    all_results.append(item)
+                    seen_urls.add(item.url)
+                    seen_fingerprints.add(fingerprint)
         
         if not all_results:
-            print(f"   ⚠️ No eBay results found for any query")
+            logger.info("   ⚠️ No eBay results found for any query")
             return None
         
-        print(f"   📦 Found {len(all_results)} unique eBay results")
+        logger.info("   📦 Found %d unique eBay results", len(all_results))
         
         # Step 3: Verify each result with AI matcher (optional)
         # Skip verification if search term came from image (Gemini already verified)
@@ -194,45 +406,48 @@ class PriceLookupService:
         should_skip_verification = skip_ai_verification or best_term_result.source == "image"
         
         if should_skip_verification:
-            print(f"   ⏭️ Skipping AI verification (search term from {best_term_result.source})")
+            logger.info("   ⏭️ Skipping AI verification (search term from %s)", best_term_result.source)
             verified_items = all_results[:max_candidates_per_query]
         else:
-            matcher = await self._get_ai_matcher()
             verified_items: list[EbaySoldItem] = []
             
-            print(f"   🤖 AI-verifying results...")
+            logger.info("   🤖 AI-verifying results...")
             
-            for ebay_item in all_results[:max_candidates_per_query * max_search_queries]:
-                match_result = await matcher.compare_listings(
-                    fb_title=fb_title,
-                    fb_description=fb_description,
-                    fb_image_url=fb_image_url,
-                    ebay_title=ebay_item.title,
-                    ebay_description="",
-                    ebay_image_url=ebay_item.image_url
-                )
-                
-                if match_result.is_match:
-                    print(f"      ✅ {match_result.confidence:.0%}: {ebay_item.title[:40]}...")
+            # Most similar titles first, so an early exit keeps the best candidates
+            candidates = _rank_by_title(
+                all_results, [fb_title, *search_queries], self.MIN_TITLE_SIMILARITY
+            )[:max_candidates_per_query * max_search_queries]
+            if len(candidates) < len(all_results):
+                logger.info("   ✂️ %d result(s) dropped by title similarity",
+                            len(all_results) - len(candidates))
+            match_results = await self._verify_candidates(
+                fb_title, fb_description, fb_image_url, candidates,
+                stop_after_matches=self.ai_early_exit_matches,
+                stop_when_converged=adaptive_stopping
+            )
+            
+            for ebay_item, match_result in zip(candidates, match_results):
+                if match_result and match_result.is_match:
+                    logger.info("      ✅ %.0f%%: %s...", match_result.confidence * 100, ebay_item.title[:40])
                     verified_items.append(ebay_item)
                 # Only print rejections at verbose level
         
         if not verified_items:
-            print(f"   ⚠️ No verified matches found")
+            logger.info("   ⚠️ No verified matches found")
             return None
         
         # Step 4: Calculate stats from verified items
-        prices = [item.total_price for item in verified_items]
-        prices.sort()
-        median_idx = len(prices) // 2
+        avg_price, median_price, min_price, max_price = _price_stats(
+            [item.total_price for item in verified_items]
+        )
         
         return PriceLookupResult(
             query=best_term_result.search_term,
             source=f"eBay Smart (n={len(verified_items)})",
-            avg_price=sum(prices) / len(prices),
-            median_price=prices[median_idx],
-            min_price=min(prices),
-            max_price=max(prices),
+            avg_price=avg_price,
+            median_price=median_price,
+            min_price=min_price,
+            max_price=max_price,
             sample_size=len(verified_items),
             details={
                 "original_title": fb_title,
@@ -281,56 +496,49 @@ class PriceLookupService:
         cond = condition or self.ebay_condition
         
         # Search eBay with raw title (no cleaning!)
-        scraper = EbayScraper(
-            stealth_browser_path=self.stealth_browser_path,
-            headless=self.headless
-        )
+        scraper = await self._get_ebay_scraper()
         
         result = await scraper.search_sold_items(fb_title, condition=cond)
         
         if not result or not result.recent_sales:
             return None
         
-        # Get AI matcher
-        matcher = await self._get_ai_matcher()
-        
         # Verify each eBay result is actually a match
         verified_items: list[EbaySoldItem] = []
         
-        print(f"   🤖 AI-verifying up to {min(max_candidates, len(result.recent_sales))} eBay results...")
+        candidates = _rank_by_title(
+            result.recent_sales, [fb_title], self.MIN_TITLE_SIMILARITY
+        )[:max_candidates]
         
-        for i, ebay_item in enumerate(result.recent_sales[:max_candidates]):
-            match_result = await matcher.compare_listings(
-                fb_title=fb_title,
-                fb_description=fb_description,
-                fb_image_url=fb_image_url,
-                ebay_title=ebay_item.title,
-                ebay_description="",
-                ebay_image_url=ebay_item.image_url
-            )
-            
+        logger.info("   🤖 AI-verifying up to %d eBay results...", len(candidates))
+        
+        match_results = await self._verify_candidates(
+            fb_title, fb_description, fb_image_url, candidates
+        )
+        
+        for ebay_item, match_result in zip(candidates, match_results):
             if match_result.is_match:
-                print(f"      ✅ {match_result.confidence:.0%} match: {ebay_item.title[:40]}...")
+                logger.info("      ✅ %.0f%% match: %s...", match_result.confidence * 100, ebay_item.title[:40])
                 verified_items.append(ebay_item)
             else:
-                print(f"      ❌ {match_result.confidence:.0%}: {match_result.reasoning[:50]}")
+                logger.info("      ❌ %.0f%%: %s", match_result.confidence * 100, match_result.reasoning[:50])
         
         if not verified_items:
-            print(f"   ⚠️ No verified matches found")
+            logger.info("   ⚠️ No verified matches found")
             return None
         
         # Calculate stats from verified items only
-        prices = [item.total_price for item in verified_items]
-        prices.sort()
-        median_idx = len(prices) // 2
+        avg_price, median_price, min_price, max_price = _price_stats(
+            [item.total_price for item in verified_items]
+        )
         
         return PriceLookupResult(
             query=fb_title,
             source=f"eBay AI-Verified (n={len(verified_items)})",
-            avg_price=sum(prices) / len(prices),
-            median_price=prices[median_idx],
-            min_price=min(prices),
-            max_price=max(prices),
+            avg_price=avg_price,
+            median_price=median_price,
+            min_price=min_price,
+            max_price=max_price,
             sample_size=len(verified_items),
             details={
                 "verified_sales": [
@@ -352,7 +560,8 @@ class PriceLookupService:
         self,
         query: str,
         condition: Optional[str] = None,
-        fb_image_url: Optional[str] = None
+        fb_image_url: Optional[str] = None,
+        return_details: bool = True  # Include recent sales (simple lookup only)
     ) -> Optional[PriceLookupResult]:
         """
         Look up sold prices on eBay.
@@ -368,6 +577,7 @@ class PriceLookupService:
             query: Search query (raw title from FB)
             condition: Override default condition ("used", "new", "any")
             fb_image_url: FB listing image for AI matching
+            return_details: False skips building the recent-sales details
             
         Returns:
             PriceLookupResult or None if not found
@@ -381,27 +591,26 @@ class PriceLookupService:
             )
         
         # Fallback: simple eBay lookup (no AI verification)
-        cond = condition or self.ebay_condition
-        
-        scraper = EbayScraper(
-            stealth_browser_path=self.stealth_browser_path,
-            headless=self.headless
+        return await self._simple_ebay(
+            query, condition or self.ebay_condition, return_details=return_details
         )
-        
+    
+    async def _simple_ebay(
+        self,
+        query: str,
+        cond: str,
+        return_details: bool = True
+    ) -> Optional[PriceLookupResult]:
+        """Plain sold-items search, stats taken as-is from the scraper"""
+        scraper = await self._get_ebay_scraper()
         result = await scraper.search_sold_items(query, condition=cond)
         
-        if not result:
+        if result is None or result.num_sold == 0:
             return None
         
-        return PriceLookupResult(
-            query=query,
-            source=f"eBay Sold (n={result.num_sold})",
-            avg_price=result.avg_sold_price,
-            median_price=result.median_sold_price,
-            min_price=result.min_price,
-            max_price=result.max_price,
-            sample_size=result.num_sold,
-            details={
+        details = None
+        if return_details:
+            details = {
                 "recent_sales": [
                     {
                         "title": s.title,
@@ -412,6 +621,16 @@ class PriceLookupService:
                     for s in result.recent_sales[:5]
                 ]
             }
+        
+        return PriceLookupResult(
+            query=query,
+            source=f"eBay Sold (n={result.num_sold})",
+            avg_price=result.avg_sold_price,
+            median_price=result.median_sold_price,
+            min_price=result.min_price,
+            max_price=result.max_price,
+            sample_size=result.num_sold,
+            details=details
         )
     
     async def lookup_pricecharting(
@@ -432,7 +651,8 @@ class PriceLookupService:
         if not self.pricecharting_api_key:
             return None
         
-        result = await get_pricecharting_price(query, self.pricecharting_api_key)
+        async with self._pricecharting_semaphore:
+            result = await get_pricecharting_price(query, self.pricecharting_api_key)
         
         if not result:
             return None
@@ -461,10 +681,26 @@ class PriceLookupService:
                 "loose_price": result.loose_price,
                 "cib_price": result.cib_price,
                 "new_price": result.new_price,
-                "url": result.url
+                "product_name": result.product_name,
+                "product_id": result.product_id
             }
         )
     
+    async def lookup_pricecharting_batch(
+        self,
+        queries: list[str],
+        price_type: str = "cib"
+    ) -> list[Optional[PriceLookupResult]]:
+        """
+        lookup_pricecharting() for many queries at once, results in query order.
+        
+        Queries share one connection pool and run concurrently, up to
+        MAX_PRICECHARTING_CALLS at a time.
+        """
+        return await asyncio.gather(
+            *(self.lookup_pricecharting(query, price_type) for query in queries)
+        )
+    
     async def lookup(
         self,
         query: str,
@@ -484,6 +720,33 @@ class PriceLookupService:
         Returns:
             First successful PriceLookupResult or None
         """
+        # Feeds often repeat the same title - reuse a recent result. The FB
+        # image is part of the key since it drives the AI match verdict
+        key = (_WHITESPACE_RE.sub(' ', query).strip().lower(), tuple(sources), stop_on_first, fb_image_url)
+        cached = self._lookup_cache.get(key)
+        if cached and time.monotonic() - cached[0] < self.LOOKUP_CACHE_TTL:
+            self._lookup_cache.move_to_end(key)
+            logger.info("   ♻️ Using cached price for: %s", query[:40])
+            return cached[1]
+        
+        result = await self._lookup_uncached(query, sources, stop_on_first, fb_image_url)
+        
+        if result:
+            self._lookup_cache[key] = (time.monotonic(), result)
+            self._lookup_cache.move_to_end(key)
+            while len(self._lookup_cache) > self.LOOKUP_CACHE_SIZE:
+                self._lookup_cache.popitem(last=False)
+        
+        return result
+    
+    async def _lookup_uncached(
+        self,
+        query: str,
+        sources: list[str],
+        stop_on_first: bool,
+        fb_image_url: Optional[str]
+    ) -> Optional[PriceLookupResult]:
+        """Run the lookup against each source in order"""
         for source in sources:
             result = None
             
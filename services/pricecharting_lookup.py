@@ -5,12 +5,118 @@ API Docs: https://www.pricecharting.com/api-documentation
 Free tier: 500 requests/day
 """
 import asyncio
+import re
 import httpx
+from itertools import islice
+from lxml import html as lxml_html
 from typing import Optional
 from dataclasses import dataclass
+from urllib.parse import urlencode
+import sys
+sys.path.insert(0, str(__file__).rsplit('/', 2)[0])
 
+from utils.cache import SQLiteCache
+from utils.paths import get_cache_dir
 
-@dataclass
+# PriceCharting prices change at most daily; search pages a bit more often
+API_CACHE_TTL = 24 * 3600  # seconds
+SCRAPE_CACHE_TTL = 6 * 3600
+
+# Search page scraping: first product name / console cells, price cells
+_NAME_XPATH = "//a[contains(@class, 'product_name')]"
+_CONSOLE_XPATH = "//td[contains(@class, 'console')]"
+_PRICE_XPATH = "//*[contains(@class, 'js-price')]"
+# Fallback when the page has no price cells: first $ amounts anywhere
+_PRICE_RE = re.compile(r'\$(\d+\.?\d*)')
+
+
+def _first_text(doc, xpath: str) -> str:
+    nodes = doc.xpath(xpath)
+    return nodes[0].text_content().strip() if nodes else ""
+
+
+def _parse_search_page(html: str) -> tuple[str, str, list[str]]:
+    """(product name, console, first few prices) from a search results page"""
+    doc = lxml_html.fromstring(html)
+    
+    prices = []
+    for node in doc.xpath(_PRICE_XPATH):
+        text = node.text_content().strip().lstrip("$").replace(",", "")
+        if text.replace(".", "", 1).isdigit():  # Skip "N/A" / empty cells
+            prices.append(text)
+            if len(prices) == 5:
+                break
+    if not prices:
+        prices = [m.group(1) for m in islice(_PRICE_RE.finditer(html), 5)]
+    
+    return _first_text(doc, _NAME_XPATH), _first_text(doc, _CONSOLE_XPATH), prices
+
+# Shared client + response cache (kept for the life of the process)
+_client: Optional[httpx.AsyncClient] = None
+_cache: Optional[SQLiteCache] = None
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Get or create the shared PriceCharting HTTP client"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=15.0,
+            limits=httpx.Limits(max_keepalive_connections=10, max_connections=20)
+        )
+    return _client
+
+
+def _get_cache() -> SQLiteCache:
+    global _cache
+    if _cache is None:
+        _cache = SQLiteCache(get_cache_dir() / "pricecharting.sqlite3", ttl=API_CACHE_TTL)
+    return _cache
+
+
+async def close_pricecharting_client():
+    """Close the shared HTTP client and response cache"""
+    global _client, _cache
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+    if _cache is not None:
+        _cache.close()
+        _cache = None
+
+
+async def _cached_get(
+    url: str,
+    params: dict = None,
+    headers: dict = None,
+    ttl: float = API_CACHE_TTL,
+    as_json: bool = True
+) -> tuple[int, object]:
+    """
+    GET through the on-disk response cache.
+    
+    Returns (status_code, body) - body is parsed JSON or page text.
+    Only 200 responses are cached; the API key is left out of the key.
+    """
+    params = params or {}
+    key = url + "?" + urlencode(sorted((k, v) for k, v in params.items() if k != "t"))
+    
+    cache = _get_cache()
+    body = await cache.aget(key)
+    if body is not None:
+        return 200, body
+    
+    resp = await _get_client().get(url, params=params, headers=headers)
+    if resp.status_code != 200:
+        return resp.status_code, None
+    
+    body = resp.json() if as_json else resp.text
+    await cache.aset(key, body, ttl=ttl)
+    return 200, body
+
+
+@dataclass(slots=True, frozen=True)
 class PriceChartingResult:
     """Result from PriceCharting lookup"""
     query: str
@@ -34,41 +140,42 @@ class PriceChartingClient:
     def __init__(self, api_key: str):
         self.api_key = api_key
     
+    async def aclose(self):
+        """Close the shared connection (also done by close_pricecharting_client)"""
+        await close_pricecharting_client()
+    
     async def search(self, query: str) -> list[dict]:
         """Search for products matching query"""
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.get(
-                f"{self.BASE_URL}/products",
-                params={
-                    "t": self.api_key,
-                    "q": query,
-                    "type": "json"
-                }
-            )
-            
-            if resp.status_code != 200:
-                print(f"PriceCharting error: {resp.status_code}")
-                return []
-            
-            data = resp.json()
-            return data.get("products", [])
+        status, data = await _cached_get(
+            f"{self.BASE_URL}/products",
+            params={
+                "t": self.api_key,
+                "q": query,
+                "type": "json"
+            }
+        )
+        
+        if status != 200:
+            print(f"PriceCharting error: {status}")
+            return []
+        
+        return data.get("products", [])
     
     async def get_product(self, product_id: str) -> Optional[dict]:
         """Get detailed pricing for a specific product"""
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.get(
-                f"{self.BASE_URL}/product",
-                params={
-                    "t": self.api_key,
-                    "id": product_id,
-                    "type": "json"
-                }
-            )
-            
-            if resp.status_code != 200:
-                return None
-            
-            return resp.json()
+        status, data = await _cached_get(
+            f"{self.BASE_URL}/product",
+            params={
+                "t": self.api_key,
+                "id": product_id,
+                "type": "json"
+            }
+        )
+        
+        if status != 200:
+            return None
+        
+        return data
     
     async def lookup_price(self, query: str) -> Optional[PriceChartingResult]:
         """Search and get price for best matching product"""
@@ -108,40 +215,27 @@ async def scrape_pricecharting(query: str) -> Optional[PriceChartingResult]:
     Use as fallback if no API key.
     """
     import urllib.parse
-    import re
     
     encoded_query = urllib.parse.quote(query)
     url = f"https://www.pricecharting.com/search-products?q={encoded_query}"
     
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            resp = await client.get(
-                url,
-                headers={
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                }
-            )
-            
-            if resp.status_code != 200:
-                return None
-            
-            html = resp.text
-        
-        # Extract first product row
-        # Looking for price cells with class like "price js-price"
-        # Prices are in format $XX.XX
-        
-        # Find product name
-        name_match = re.search(r'<a[^>]*class="[^"]*product_name[^"]*"[^>]*>([^<]+)</a>', html)
-        product_name = name_match.group(1).strip() if name_match else query
+        status, html = await _cached_get(
+            url,
+            headers={
+                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+            },
+            ttl=SCRAPE_CACHE_TTL,
+            as_json=False
+        )
         
-        # Find console/platform
-        console_match = re.search(r'<td[^>]*class="[^"]*console[^"]*"[^>]*>([^<]+)</td>', html)
-        console = console_match.group(1).strip() if console_match else ""
+        if status != 200:
+            return None
         
-        # Find prices
-        price_pattern = r'\$(\d+\.?\d*)'
-        prices = re.findall(price_pattern, html)[:5]  # Get first few prices
+        # Extract first product row: name, console/platform and the
+        # price cells (class like "price js-price", text "$XX.XX")
+        product_name, console, prices = _parse_search_page(html)
+        product_name = product_name or query
         
         if len(prices) >= 2:
             loose = float(prices[0]) if prices[0] else 0
@@ -193,5 +287,6 @@ if __name__ == "__main__":
             print(f"New: ${result.new_price:.2f}")
         else:
             print("No results")
+        await close_pricecharting_client()
     
     asyncio.run(test())
@@ -7,13 +7,18 @@ Monitors positive hits (opportunities) and rechecks them twice daily to:
 3. Update profit calculations
 """
 import asyncio
-import json
+import atexit
+import re
 import sqlite3
+import time
+from contextlib import AsyncExitStack
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Optional
 
+import httpx
+
 import sys
 _project_root = str(Path(__file__).parent.parent)
 if _project_root not in sys.path:
@@ -21,7 +26,8 @@ if _project_root not in sys.path:
 
 from database import DB_PATH, get_connection
 from scrapers.ebay_scraper import EbayScraper
-from utils.title_identifier import TitleIdentifier
+from utils.rate_limit import AdaptiveConcurrencyLimiter
+from utils.title_identifier import TitleIdentifier, CachedTitleIdentifier
 
 
 @dataclass
@@ -41,42 +47,151 @@ class RecheckResult:
     checked_at: datetime
 
 
+@dataclass(slots=True)
+class OpportunityRow:
+    """Opportunity due for a recheck (columns in get_opportunities_to_check's SELECT order)"""
+    id: int
+    fb_listing_id: int
+    ebay_listing_id: Optional[int]
+    fb_price: float
+    ebay_price: float
+    profit_dollars: float
+    profit_margin: float
+    status: str
+    fb_status: Optional[str]
+    last_checked_at: Optional[str]
+    check_count: Optional[int]
+    title: str
+    listing_url: Optional[str]
+    image_url: Optional[str]
+    location: Optional[str]
+
+
+# One connection per process, in autocommit mode - writes open their own
+# BEGIN IMMEDIATE ... COMMIT instead of relying on sqlite3's implicit transactions
+_conn: Optional[sqlite3.Connection] = None
+
+
+def _get_conn() -> sqlite3.Connection:
+    global _conn
+    if _conn is None:
+        _conn = get_connection()
+        _conn.isolation_level = None
+        atexit.register(close_db)
+    return _conn
+
+
+def close_db():
+    """Close the shared recheck connection (safe to call twice)"""
+    global _conn
+    if _conn is not None:
+        _conn.close()
+        _conn = None
+
+
+# Recheck tracking columns on opportunities
+RECHECK_COLUMNS = {
+    'last_checked_at': "TIMESTAMP",
+    'fb_status': "TEXT DEFAULT 'available'",
+    'check_count': "INTEGER DEFAULT 0",
+    'price_history': "TEXT",  # JSON array (superseded by opportunity_price_history)
+    'ebay_min_price': "REAL",
+    'ebay_avg_price': "REAL",
+    'ebay_sample_size': "INTEGER",
+}
+# One row per recheck price point (append-only, pruned to MAX_PRICE_HISTORY per
+# opportunity). Clustered on (opp_id, ts) with no rowid, so a history read is
+# one contiguous range and each point is ~50 bytes.
+PRICE_HISTORY_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS opportunity_price_history (
+        opp_id INTEGER NOT NULL,
+        ts REAL NOT NULL,  -- unix seconds
+        fb_price REAL,
+        ebay_price REAL,
+        ebay_min REAL,
+        profit REAL,
+        PRIMARY KEY (opp_id, ts),
+        FOREIGN KEY (opp_id) REFERENCES opportunities(id)
+    ) WITHOUT ROWID
+"""
+# Local ISO timestamp (as written by earlier versions) -> unix seconds
+_ISO_TO_UNIX_SQL = "(julianday({}, 'utc') - 2440587.5) * 86400.0"
+# Rows get_opportunities_to_check() can return, most profitable first - the
+# query reads the index backwards and stops at its LIMIT instead of
+# scanning and sorting the table. The predicate must match the query's.
+RECHECK_INDEX_SQL = """
+    CREATE INDEX IF NOT EXISTS ix_opps_recheck
+    ON opportunities(profit_dollars DESC, last_checked_at)
+    WHERE status IN ('new', 'reviewed')
+      AND (fb_status IS NULL OR fb_status = 'available')
+      AND is_defective = FALSE
+"""
+# get_recheck_status() buckets
+STATUS_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS ix_opps_status_fbstatus "
+    "ON opportunities(status, fb_status, last_checked_at)"
+)
+# stored_ebay_prices() lookups
+EBAY_QUERY_INDEX_SQL = (
+    "CREATE INDEX IF NOT EXISTS ix_ebay_query_scraped "
+    "ON ebay_listings(search_query, scraped_at DESC)"
+)
+# PRAGMA user_version once the schema above exists - later runs skip the schema check
+# (1: recheck columns, opportunity_price_history, ix_opps_recheck,
+#  ix_opps_status_fbstatus, ix_ebay_query_scraped)
+RECHECK_SCHEMA_VERSION = 1
+
+
 def migrate_db():
-    """Add recheck tracking columns to database"""
-    conn = get_connection()
-    cursor = conn.cursor()
+    """Add recheck tracking columns and the price history table to database"""
+    conn = _get_conn()
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version >= RECHECK_SCHEMA_VERSION:
+        return
     
     # Check if columns exist
-    cursor.execute("PRAGMA table_info(opportunities)")
-    columns = {row[1] for row in cursor.fetchall()}
-    
-    migrations = []
-    
-    if 'last_checked_at' not in columns:
-        migrations.append("ALTER TABLE opportunities ADD COLUMN last_checked_at TIMESTAMP")
-    if 'fb_status' not in columns:
-        migrations.append("ALTER TABLE opportunities ADD COLUMN fb_status TEXT DEFAULT 'available'")
-    if 'check_count' not in columns:
-        migrations.append("ALTER TABLE opportunities ADD COLUMN check_count INTEGER DEFAULT 0")
-    if 'price_history' not in columns:
-        migrations.append("ALTER TABLE opportunities ADD COLUMN price_history TEXT")  # JSON array
-    if 'ebay_min_price' not in columns:
-        migrations.append("ALTER TABLE opportunities ADD COLUMN ebay_min_price REAL")
-    if 'ebay_avg_price' not in columns:
-        migrations.append("ALTER TABLE opportunities ADD COLUMN ebay_avg_price REAL")
-    if 'ebay_sample_size' not in columns:
-        migrations.append("ALTER TABLE opportunities ADD COLUMN ebay_sample_size INTEGER")
-    
-    for sql in migrations:
-        try:
-            cursor.execute(sql)
-            print(f"   ✅ {sql}")
-        except sqlite3.OperationalError as e:
-            if "duplicate column" not in str(e).lower():
-                print(f"   ⚠️ Migration error: {e}")
-    
-    conn.commit()
-    conn.close()
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(opportunities)")}
+    migrations = [
+        f"ALTER TABLE opportunities ADD COLUMN {name} {definition}"
+        for name, definition in RECHECK_COLUMNS.items()
+        if name not in columns
+    ]
+    
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        failed = False
+        for sql in migrations:
+            try:
+                conn.execute(sql)
+                print(f"   ✅ {sql}")
+            except sqlite3.OperationalError as e:
+                if "duplicate column" not in str(e).lower():
+                    print(f"   ⚠️ Migration error: {e}")
+                    failed = True
+        if not failed:
+            conn.execute(PRICE_HISTORY_SCHEMA)
+            # Move existing JSON histories into the table
+            conn.execute(f"""
+                INSERT OR IGNORE INTO opportunity_price_history (opp_id, ts, fb_price, ebay_price, ebay_min, profit)
+                SELECT o.id,
+                       {_ISO_TO_UNIX_SQL.format("json_extract(h.value, '$.timestamp')")},
+                       json_extract(h.value, '$.fb_price'),
+                       json_extract(h.value, '$.ebay_price'),
+                       json_extract(h.value, '$.ebay_min'),
+                       json_extract(h.value, '$.profit')
+                FROM opportunities o, json_each(o.price_history) h
+                WHERE o.price_history IS NOT NULL AND o.price_history != ''
+            """)
+            conn.execute(RECHECK_INDEX_SQL)
+            conn.execute(STATUS_INDEX_SQL)
+            conn.execute(EBAY_QUERY_INDEX_SQL)
+            # Without stats the planner prefers idx_opportunities_status + a sort
+            conn.execute("ANALYZE opportunities")
+            conn.execute(f"PRAGMA user_version = {RECHECK_SCHEMA_VERSION}")
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
     
     if migrations:
         print(f"✅ Applied {len(migrations)} database migrations")
@@ -85,7 +200,7 @@ def migrate_db():
 def get_opportunities_to_check(
     min_hours_since_check: float = 12.0,  # Twice daily = every 12 hours
     limit: int = 50
-) -> list[dict]:
+) -> list[OpportunityRow]:
     """
     Get opportunities that need rechecking.
     
@@ -94,8 +209,7 @@ def get_opportunities_to_check(
     - Are still in active status (not purchased/skipped)
     - FB listing is still available
     """
-    conn = get_connection()
-    cursor = conn.cursor()
+    cursor = _get_conn().cursor()
     
     cutoff_time = datetime.now() - timedelta(hours=min_hours_since_check)
     
@@ -104,7 +218,6 @@ def get_opportunities_to_check(
             o.id, o.fb_listing_id, o.ebay_listing_id,
             o.fb_price, o.ebay_price, o.profit_dollars, o.profit_margin,
             o.status, o.fb_status, o.last_checked_at, o.check_count,
-            o.price_history,
             f.title, f.listing_url, f.image_url, f.location
         FROM opportunities o
         JOIN fb_listings f ON o.fb_listing_id = f.id
@@ -116,9 +229,151 @@ def get_opportunities_to_check(
         LIMIT ?
     """, (cutoff_time.isoformat(), limit))
     
-    rows = cursor.fetchall()
-    conn.close()
+    return [OpportunityRow(*row) for row in cursor]
+
+
+# ~30 days of price points at 2 checks/day
+MAX_PRICE_HISTORY = 60
+
+# Resale assumptions for recheck profit (kept in sync with _PROFIT_SQL)
+EBAY_FEE_PERCENT = 13.25
+SHIPPING_ESTIMATE = 15.0
+MIN_RECHECK_PROFIT = 30.0
+
+
+def recheck_profit(fb_price: float, ebay_price: float) -> tuple[float, float]:
+    """(profit_dollars, profit_margin) for reselling at ebay_price"""
+    profit = ebay_price * (1 - EBAY_FEE_PERCENT / 100) - SHIPPING_ESTIMATE - fb_price
+    margin = (profit / fb_price * 100) if fb_price > 0 else 0
+    return profit, margin
+
+
+# Optional recheck fields - a None value leaves the column unchanged
+_CHECK_UPDATE_FIELDS = (
+    'fb_status', 'fb_price', 'ebay_price', 'ebay_min_price', 'ebay_avg_price',
+    'ebay_sample_size', 'status', 'notes'
+)
+_CHECK_UPDATE_SQL = (
+    "UPDATE opportunities SET last_checked_at = CURRENT_TIMESTAMP, "
+    "check_count = COALESCE(check_count, 0) + 1, "
+    + ", ".join(f"{field} = COALESCE(?, {field})" for field in _CHECK_UPDATE_FIELDS)
+    + " WHERE id = ?"
+)
+# Profit from the row's stored prices, run after the prices are updated
+_PROFIT_SQL = """
+    UPDATE opportunities SET
+        profit_dollars = ebay_price * (1 - :fee / 100.0) - :shipping - fb_price,
+        profit_margin = CASE WHEN fb_price > 0
+            THEN (ebay_price * (1 - :fee / 100.0) - :shipping - fb_price) * 100.0 / fb_price
+            ELSE 0 END
+    WHERE id = :id
+"""
+_PRUNE_HISTORY_SQL = """
+    DELETE FROM opportunity_price_history
+    WHERE opp_id = ? AND ts < (
+        SELECT ts FROM opportunity_price_history
+        WHERE opp_id = ? ORDER BY ts DESC LIMIT 1 OFFSET ?
+    )
+"""
+
+# Sold listings seen by a recheck scrape, refreshed when seen again so
+# stored_ebay_prices() can tell how recent the data is
+_STORE_SALES_SQL = """
+    INSERT INTO ebay_listings
+    (ebay_id, title, price, sold_date, condition, image_url, listing_url, search_query)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (ebay_id, search_query) DO UPDATE SET
+        price = excluded.price, scraped_at = CURRENT_TIMESTAMP
+"""
+_EBAY_ITEM_ID_RE = re.compile(r'/itm/(?:[^/?#]+/)?(\d+)')
+
+# Stored sales are used instead of scraping when there are at least
+# MIN_STORED_SALES from the last STORED_SALES_DAYS and the newest was
+# seen within STORED_SALES_MAX_AGE_HOURS
+MIN_STORED_SALES = 5
+STORED_SALES_DAYS = 30
+STORED_SALES_MAX_AGE_HOURS = 48
+_STORED_SALES_SQL = """
+    SELECT MIN(price), AVG(price), COUNT(*), MAX(scraped_at) >= datetime('now', ?)
+    FROM ebay_listings
+    WHERE search_query = ? AND price > 0 AND scraped_at >= datetime('now', ?)
+"""
+
+
+def stored_ebay_prices(search_query: str) -> Optional[tuple[float, float, int]]:
+    """(min, avg, count) from recently stored sales, or None if a scrape is needed"""
+    min_price, avg_price, count, fresh = _get_conn().execute(_STORED_SALES_SQL, (
+        f"-{STORED_SALES_MAX_AGE_HOURS} hours", search_query, f"-{STORED_SALES_DAYS} days"
+    )).fetchone()
+    if count < MIN_STORED_SALES or not fresh:
+        return None
+    return min_price, avg_price, count
+
+
+def _sale_rows(search_query: str, sales) -> list[tuple]:
+    """_STORE_SALES_SQL rows for scraped sales (items without an eBay id are skipped)"""
+    rows = []
+    for sale in sales:
+        match = _EBAY_ITEM_ID_RE.search(sale.url or "")
+        if match and sale.price > 0:
+            rows.append((
+                match.group(1), sale.title, sale.price, sale.sold_date, sale.condition,
+                sale.image_url, sale.url, search_query
+            ))
+    return rows
+
+
+def update_opportunity_check_bulk(conn: sqlite3.Connection, updates: list[dict]):
+    """
+    Apply many rechecks in one transaction.
     
+    Each update is a dict with `opportunity_id` plus any of the
+    update_opportunity_check() keyword arguments, and optionally
+    `ebay_sales` rows for _STORE_SALES_SQL. Profit is recomputed in SQL
+    from the stored prices, and the resulting row is appended to
+    opportunity_price_history; all statements go through executemany.
+    """
+    if not updates:
+        return
+    
+    timestamp = time.time()
+    ids = [update['opportunity_id'] for update in updates]
+    
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        conn.executemany(_CHECK_UPDATE_SQL, [
+            (*(update.get(field) for field in _CHECK_UPDATE_FIELDS), update['opportunity_id'])
+            for update in updates
+        ])
+        conn.executemany(_PROFIT_SQL, [
+            {'fee': EBAY_FEE_PERCENT, 'shipping': SHIPPING_ESTIMATE, 'id': opp_id} for opp_id in ids
+        ])
+        conn.executemany("""
+            INSERT INTO opportunity_price_history (opp_id, ts, fb_price, ebay_price, ebay_min, profit)
+            SELECT id, ?, fb_price, ebay_price, ebay_min_price, profit_dollars
+            FROM opportunities WHERE id = ?
+        """, [(timestamp, opp_id) for opp_id in ids])
+        conn.executemany(_PRUNE_HISTORY_SQL, [
+            (opp_id, opp_id, MAX_PRICE_HISTORY - 1) for opp_id in ids
+        ])
+        conn.executemany(_STORE_SALES_SQL, [
+            sale for update in updates for sale in update.get('ebay_sales', ())
+        ])
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def get_price_history(opportunity_id: int, limit: int = MAX_PRICE_HISTORY) -> list[dict]:
+    """Recheck price points for an opportunity, newest first (ts in unix seconds)"""
+    rows = _get_conn().execute("""
+        SELECT ts, fb_price, ebay_price, ebay_min, profit
+        FROM opportunity_price_history
+        WHERE opp_id = ?
+        ORDER BY ts DESC
+        LIMIT ?
+    """, (opportunity_id, limit))
     return [dict(row) for row in rows]
 
 
@@ -130,199 +385,244 @@ def update_opportunity_check(
     ebay_min_price: float = None,
     ebay_avg_price: float = None,
     ebay_sample_size: int = None,
-    profit_dollars: float = None,
-    profit_margin: float = None,
     status: str = None,
     notes: str = None
 ):
-    """Update opportunity after recheck"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    # Get current price history
-    cursor.execute("SELECT price_history, check_count FROM opportunities WHERE id = ?", (opportunity_id,))
-    row = cursor.fetchone()
-    
-    price_history = json.loads(row['price_history']) if row and row['price_history'] else []
-    check_count = (row['check_count'] or 0) + 1 if row else 1
-    
-    # Add new price point to history
-    price_history.append({
-        'timestamp': datetime.now().isoformat(),
+    """Update opportunity after recheck (profit is recomputed from the prices)"""
+    update_opportunity_check_bulk(_get_conn(), [{
+        'opportunity_id': opportunity_id,
+        'fb_status': fb_status or None,
         'fb_price': fb_price,
         'ebay_price': ebay_price,
-        'ebay_min': ebay_min_price,
-        'profit': profit_dollars
-    })
-    
-    # Keep last 30 days of history
-    if len(price_history) > 60:  # ~30 days at 2x/day
-        price_history = price_history[-60:]
-    
-    # Build update query
-    updates = ["last_checked_at = CURRENT_TIMESTAMP", "check_count = ?"]
-    params = [check_count]
-    
-    if fb_status:
-        updates.append("fb_status = ?")
-        params.append(fb_status)
-    if fb_price is not None:
-        updates.append("fb_price = ?")
-        params.append(fb_price)
-    if ebay_price is not None:
-        updates.append("ebay_price = ?")
-        params.append(ebay_price)
-    if ebay_min_price is not None:
-        updates.append("ebay_min_price = ?")
-        params.append(ebay_min_price)
-    if ebay_avg_price is not None:
-        updates.append("ebay_avg_price = ?")
-        params.append(ebay_avg_price)
-    if ebay_sample_size is not None:
-        updates.append("ebay_sample_size = ?")
-        params.append(ebay_sample_size)
-    if profit_dollars is not None:
-        updates.append("profit_dollars = ?")
-        params.append(profit_dollars)
-    if profit_margin is not None:
-        updates.append("profit_margin = ?")
-        params.append(profit_margin)
-    if status:
-        updates.append("status = ?")
-        params.append(status)
-    if notes:
-        updates.append("notes = ?")
-        params.append(notes)
-    
-    updates.append("price_history = ?")
-    params.append(json.dumps(price_history))
-    
-    params.append(opportunity_id)
-    
-    sql = f"UPDATE opportunities SET {', '.join(updates)} WHERE id = ?"
-    cursor.execute(sql, params)
-    
-    conn.commit()
-    conn.close()
+        'ebay_min_price': ebay_min_price,
+        'ebay_avg_price': ebay_avg_price,
+        'ebay_sample_size': ebay_sample_size,
+        'status': status or None,
+        'notes': notes or None
+    }])
+
+
+# One pooled HTTP/2 client for every listing status check in a run
+_fb_client: Optional[httpx.AsyncClient] = None
+
+_FB_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+# Markers in the listing page's HTML / embedded JSON. Only listing-specific
+# wording counts as removed: FB's generic "This content isn't available"
+# page is also what logged-out or throttled clients get.
+_FB_REMOVED_RE = re.compile(r"This listing is no longer available|listing isn.t available", re.I)
+# Present only when the page actually carries the listing's data
+_FB_PAYLOAD_RE = re.compile(r'"(?:listing_price|is_sold)"\s*:')
+_FB_SOLD_RE = re.compile(r'"is_sold"\s*:\s*true')
+_FB_PENDING_RE = re.compile(r'"is_pending"\s*:\s*true')
+_FB_PRICE_RE = re.compile(r'"listing_price"\s*:\s*\{[^{}]*?"amount"\s*:\s*"([\d.]+)"')
+
+
+def _get_fb_client() -> httpx.AsyncClient:
+    global _fb_client
+    if _fb_client is None or _fb_client.is_closed:
+        _fb_client = httpx.AsyncClient(
+            http2=True,
+            timeout=15.0,
+            follow_redirects=True,
+            headers=_FB_HEADERS,
+            limits=httpx.Limits(max_keepalive_connections=10, max_connections=10)
+        )
+    return _fb_client
+
+
+async def close_fb_client():
+    """Close the shared listing-status client (safe to call twice)"""
+    global _fb_client
+    if _fb_client is not None:
+        await _fb_client.aclose()
+        _fb_client = None
 
 
 async def check_fb_listing_status(listing_url: str) -> tuple[str, Optional[float]]:
     """
     Check if FB listing is still available.
     
+    Fetches the listing page over the shared client and looks for FB's
+    sold/pending flags and "no longer available" notice. Anything
+    inconclusive (network error, login wall, a page without the listing's
+    data) counts as available so the opportunity isn't dropped on a bad
+    fetch.
+    
     Returns: (status, current_price)
     - status: "available", "sold", "pending", "removed"
     - current_price: Price if available, None otherwise
     """
-    # TODO: Implement FB listing status check via browser
-    # For now, return available
-    # This would need to:
-    # 1. Navigate to listing_url
-    # 2. Check for "This listing is no longer available" → removed
-    # 3. Check for "Pending" badge → pending
-    # 4. Check for "Sold" → sold
-    # 5. Extract current price if available
-    
-    return "available", None  # Placeholder
+    try:
+        response = await _get_fb_client().get(listing_url)
+    except httpx.HTTPError:
+        return "available", None
+    
+    if response.status_code == 404:
+        return "removed", None
+    if response.status_code != 200:
+        return "available", None
+    
+    html = response.text
+    if _FB_REMOVED_RE.search(html):
+        return "removed", None
+    if not _FB_PAYLOAD_RE.search(html):
+        return "available", None
+    if _FB_SOLD_RE.search(html):
+        return "sold", None
+    if _FB_PENDING_RE.search(html):
+        return "pending", None
+    
+    match = _FB_PRICE_RE.search(html)
+    return "available", float(match.group(1)) if match else None
+
+
+# FB statuses that end an opportunity, and the status they map to
+TERMINAL_FB_STATUSES = {
+    "sold": "fb_sold",
+    "removed": "fb_removed",
+    "pending": "fb_pending",
+}
+
+
+def _save_check(update: dict, pending_updates: Optional[list[dict]]):
+    """Queue a check result for the bulk write, or write it now"""
+    if pending_updates is not None:
+        pending_updates.append(update)
+    else:
+        update_opportunity_check_bulk(_get_conn(), [update])
 
 
 async def recheck_opportunity(
-    opportunity: dict,
-    ebay_scraper: EbayScraper = None,
-    identifier: TitleIdentifier = None
+    opportunity: OpportunityRow,
+    ebay_scraper: EbayScraper = None,  # or CoalescedEbaySearch
+    identifier: TitleIdentifier = None,  # or CachedTitleIdentifier
+    pending_updates: Optional[list[dict]] = None
 ) -> RecheckResult:
     """
     Recheck a single opportunity.
     
     1. Check FB listing status
-    2. Get fresh eBay prices
+    2. Get fresh eBay prices (skipped once the listing is gone)
     3. Recalculate profit
+    
+    The database update is written immediately, or appended to
+    `pending_updates` for update_opportunity_check_bulk() when given.
     """
-    opp_id = opportunity['id']
-    title = opportunity['title']
-    old_fb_price = opportunity['fb_price']
-    old_ebay_price = opportunity['ebay_price']
-    old_profit = opportunity['profit_dollars']
+    opp_id = opportunity.id
+    title = opportunity.title
+    old_fb_price = opportunity.fb_price
+    old_ebay_price = opportunity.ebay_price
+    old_profit = opportunity.profit_dollars
     
     print(f"   🔄 Rechecking: {title[:40]}...")
     
+    # Identify the product while the FB status check is in flight (the
+    # identification is cancelled if the listing turns out to be gone)
+    identify = None
+    if ebay_scraper and identifier:
+        identify = asyncio.ensure_future(
+            identifier.identify_product(title, image_url=opportunity.image_url)
+        )
+    
     # Check FB status
     fb_status = "available"
     new_fb_price = old_fb_price
     
-    if opportunity.get('listing_url'):
-        fb_status, price = await check_fb_listing_status(opportunity['listing_url'])
-        if price is not None:
-            new_fb_price = price
+    try:
+        if opportunity.listing_url:
+            fb_status, price = await check_fb_listing_status(opportunity.listing_url)
+            if price is not None:
+                new_fb_price = price
+    except BaseException:
+        if identify:
+            identify.cancel()
+        raise
+    
+    if fb_status != "available":
+        # Listing is gone - nothing to price, just record the new status
+        if identify:
+            identify.cancel()
+        _save_check({
+            'opportunity_id': opp_id,
+            'fb_status': fb_status,
+            'fb_price': new_fb_price,
+            'ebay_price': old_ebay_price,
+            'ebay_min_price': None,
+            'ebay_avg_price': None,
+            'ebay_sample_size': 0,
+            'status': TERMINAL_FB_STATUSES.get(fb_status, "no_longer_profitable")
+        }, pending_updates)
+        new_profit, _ = recheck_profit(new_fb_price, old_ebay_price)
+        return RecheckResult(
+            opportunity_id=opp_id,
+            fb_listing_id=opportunity.fb_listing_id,
+            fb_status=fb_status,
+            old_fb_price=old_fb_price,
+            new_fb_price=new_fb_price,
+            old_ebay_price=old_ebay_price,
+            new_ebay_price=old_ebay_price,
+            old_profit=old_profit,
+            new_profit=new_profit,
+            price_changed=new_fb_price != old_fb_price,
+            still_opportunity=False,
+            checked_at=datetime.now()
+        )
     
     # Get fresh eBay prices
     new_ebay_price = old_ebay_price
     ebay_min = None
     ebay_avg = None
     ebay_count = 0
+    ebay_sales = []
     
-    if ebay_scraper and fb_status == "available":
+    if ebay_scraper:
         # Generate search query
-        if identifier:
-            product = await identifier.identify_product(title, image_url=opportunity.get('image_url'))
+        if identify:
+            product = await identify
             queries = product.get_search_queries(max_queries=1)
             search_query = queries[0] if queries else title
         else:
             search_query = title
         
-        result = await ebay_scraper.search_sold_items(search_query, limit=10)
-        if result and result.num_sold > 0:
-            new_ebay_price = result.min_price  # Use min for conservative estimate
-            ebay_min = result.min_price
-            ebay_avg = result.avg_sold_price
-            ebay_count = result.num_sold
-    
-    # Calculate new profit
-    ebay_fee_percent = 13.25
-    shipping_estimate = 15.0
-    
-    gross_sale = new_ebay_price
-    ebay_fees = gross_sale * (ebay_fee_percent / 100)
-    net_after_fees = gross_sale - ebay_fees - shipping_estimate
-    new_profit = net_after_fees - new_fb_price
-    new_margin = (new_profit / new_fb_price * 100) if new_fb_price > 0 else 0
-    
-    # Determine if still an opportunity
-    still_opportunity = (
-        fb_status == "available" and
-        new_profit >= 30.0  # Min profit threshold
-    )
-    
-    # Update status based on FB status
-    new_status = None
-    if fb_status == "sold":
-        new_status = "fb_sold"
-    elif fb_status == "removed":
-        new_status = "fb_removed"
-    elif fb_status == "pending":
-        new_status = "fb_pending"
-    elif not still_opportunity:
-        new_status = "no_longer_profitable"
+        # Recent sales stored by earlier runs save a browser scrape
+        stored = stored_ebay_prices(search_query)
+        if stored:
+            ebay_min, ebay_avg, ebay_count = stored
+            new_ebay_price = ebay_min  # Use min for conservative estimate
+        else:
+            result = await ebay_scraper.search_sold_items(search_query, limit=10)
+            if result and result.num_sold > 0:
+                new_ebay_price = result.min_price  # Use min for conservative estimate
+                ebay_min = result.min_price
+                ebay_avg = result.avg_sold_price
+                ebay_count = result.num_sold
+                ebay_sales = _sale_rows(search_query, result.recent_sales)
+    
+    # Calculate new profit (the stored value is computed by the update itself)
+    new_profit, _ = recheck_profit(new_fb_price, new_ebay_price)
+    still_opportunity = new_profit >= MIN_RECHECK_PROFIT
     
     # Update database
-    update_opportunity_check(
-        opportunity_id=opp_id,
-        fb_status=fb_status,
-        fb_price=new_fb_price,
-        ebay_price=new_ebay_price,
-        ebay_min_price=ebay_min,
-        ebay_avg_price=ebay_avg,
-        ebay_sample_size=ebay_count,
-        profit_dollars=new_profit,
-        profit_margin=new_margin,
-        status=new_status
-    )
+    _save_check({
+        'opportunity_id': opp_id,
+        'fb_status': fb_status,
+        'fb_price': new_fb_price,
+        'ebay_price': new_ebay_price,
+        'ebay_min_price': ebay_min,
+        'ebay_avg_price': ebay_avg,
+        'ebay_sample_size': ebay_count,
+        'status': None if still_opportunity else "no_longer_profitable",
+        'ebay_sales': ebay_sales
+    }, pending_updates)
     
     price_changed = (new_fb_price != old_fb_price or new_ebay_price != old_ebay_price)
     
     return RecheckResult(
         opportunity_id=opp_id,
-        fb_listing_id=opportunity['fb_listing_id'],
+        fb_listing_id=opportunity.fb_listing_id,
         fb_status=fb_status,
         old_fb_price=old_fb_price,
         new_fb_price=new_fb_price,
@@ -336,14 +636,43 @@ async def recheck_opportunity(
     )
 
 
+class CoalescedEbaySearch:
+    """
+    Wraps an EbayScraper so each distinct query is searched once per
+    recheck run - duplicate listings (same product, many sellers) share
+    the first search's result, even while it's still in flight.
+    """
+    
+    def __init__(self, scraper: EbayScraper):
+        self.scraper = scraper
+        self._searches: dict[tuple, asyncio.Future] = {}
+    
+    async def search_sold_items(self, query: str, **kwargs):
+        key = (' '.join(query.lower().split()), tuple(sorted(kwargs.items())))
+        search = self._searches.get(key)
+        if search is None:
+            search = asyncio.ensure_future(self.scraper.search_sold_items(query, **kwargs))
+            self._searches[key] = search
+        return await asyncio.shield(search)
+
+
+# Opportunities rechecked at once, and browsers they share for eBay searches
+MAX_CONCURRENT_RECHECKS = 5
+RECHECK_BROWSERS = 3
+
+
 async def run_recheck(
     min_hours: float = 12.0,
-    limit: int = 20
+    limit: int = 20,
+    ebay_scraper: Optional[EbayScraper] = None,
+    identifier: Optional[CachedTitleIdentifier] = None
 ) -> list[RecheckResult]:
     """
     Run recheck on opportunities that need updating.
     
-    Call this twice daily (e.g., via cron at 9am and 9pm).
+    Call this twice daily (e.g., via cron at 9am and 9pm, or the
+    services.scheduler daemon). A started ebay_scraper / identifier
+    passed in is used as-is and left open for the next run.
     """
     print("\n" + "=" * 60)
     print("🔄 OPPORTUNITY RECHECK")
@@ -361,33 +690,52 @@ async def run_recheck(
     
     print(f"📋 Found {len(opportunities)} opportunities to recheck")
     
-    # Initialize services
-    scraper = EbayScraper(headless=True)
-    identifier = TitleIdentifier()
-    
     results = []
-    
-    for opp in opportunities:
-        try:
-            result = await recheck_opportunity(opp, scraper, identifier)
-            results.append(result)
-            
-            # Log changes
-            if result.fb_status != "available":
-                print(f"      ❌ FB Status: {result.fb_status}")
-            elif result.price_changed:
-                profit_change = result.new_profit - result.old_profit
-                direction = "📈" if profit_change > 0 else "📉"
-                print(f"      {direction} Profit: ${result.old_profit:.2f} → ${result.new_profit:.2f}")
-            else:
-                print(f"      ✅ No changes")
-            
-            await asyncio.sleep(2)  # Rate limit
-            
-        except Exception as e:
-            print(f"      ⚠️ Error: {e}")
-    
-    await identifier.close()
+    # Written together in one transaction once every opportunity is checked
+    pending_updates: list[dict] = []
+    # Fewer rechecks at once while eBay is pushing back, more as it recovers
+    limiter = AdaptiveConcurrencyLimiter(MAX_CONCURRENT_RECHECKS)
+    
+    async def recheck_one(opp: OpportunityRow):
+        async with limiter.slot():
+            try:
+                result = await recheck_opportunity(opp, scraper, identifier, pending_updates)
+            except Exception as e:
+                print(f"      ⚠️ Error ({opp.title[:30]}): {e}")
+                return
+        results.append(result)
+        
+        # Log changes
+        label = opp.title[:30]
+        if result.fb_status != "available":
+            print(f"      ❌ FB Status: {result.fb_status} ({label})")
+        elif result.price_changed:
+            profit_change = result.new_profit - result.old_profit
+            direction = "📈" if profit_change > 0 else "📉"
+            print(f"      {direction} Profit: ${result.old_profit:.2f} → ${result.new_profit:.2f} ({label})")
+        else:
+            print(f"      ✅ No changes ({label})")
+    
+    # Initialize services - eBay searches share a small browser pool and
+    # are paced by the ebay.com rate limiter, so no sleeps between items
+    owns_identifier = identifier is None
+    if owns_identifier:
+        identifier = CachedTitleIdentifier(TitleIdentifier())
+    async with AsyncExitStack() as stack:
+        if ebay_scraper is None:
+            ebay_scraper = await stack.enter_async_context(
+                EbayScraper(headless=True, max_browsers=RECHECK_BROWSERS)
+            )
+        scraper = CoalescedEbaySearch(ebay_scraper)
+        await asyncio.gather(*(recheck_one(opp) for opp in opportunities))
+    
+    if owns_identifier:
+        await identifier.close()
+    await close_fb_client()
+    
+    conn = _get_conn()
+    update_opportunity_check_bulk(conn, pending_updates)
+    conn.execute("PRAGMA optimize")  # Keeps planner stats current for ix_opps_recheck
     
     # Summary
     still_good = sum(1 for r in results if r.still_opportunity)
@@ -408,28 +756,40 @@ async def run_recheck(
 
 def get_recheck_status() -> dict:
     """Get summary of opportunity tracking status"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
+    # One pass: a row per (fb_status, checked recently) bucket
+    rows = _get_conn().execute("""
         SELECT 
-            COUNT(*) as total,
-            SUM(CASE WHEN fb_status = 'available' OR fb_status IS NULL THEN 1 ELSE 0 END) as available,
-            SUM(CASE WHEN fb_status = 'sold' THEN 1 ELSE 0 END) as sold,
-            SUM(CASE WHEN fb_status = 'pending' THEN 1 ELSE 0 END) as pending,
-            SUM(CASE WHEN fb_status = 'removed' THEN 1 ELSE 0 END) as removed,
-            SUM(CASE WHEN last_checked_at > datetime('now', '-12 hours') THEN 1 ELSE 0 END) as checked_recently,
-            AVG(check_count) as avg_checks
+            COALESCE(fb_status, 'available') as fb_status,
+            COALESCE(last_checked_at > datetime('now', '-12 hours'), 0) as recent,
+            COUNT(*) as count,
+            SUM(check_count) as checks,
+            COUNT(check_count) as checked
         FROM opportunities
         WHERE status IN ('new', 'reviewed')
-    """)
-    
-    row = cursor.fetchone()
-    conn.close()
-    
-    return dict(row) if row else {}
+        GROUP BY 1, 2
+    """).fetchall()
+    
+    status = {
+        'total': 0, 'available': 0, 'sold': 0, 'pending': 0, 'removed': 0,
+        'checked_recently': 0
+    }
+    checks = checked = 0
+    for row in rows:
+        status['total'] += row['count']
+        if row['fb_status'] in status:
+            status[row['fb_status']] += row['count']
+        if row['recent']:
+            status['checked_recently'] += row['count']
+        checks += row['checks'] or 0
+        checked += row['checked']
+    status['avg_checks'] = checks / checked if checked else None
+    
+    return status
 
 
 if __name__ == "__main__":
-    # Run recheck
-    asyncio.run(run_recheck(min_hours=0.1, limit=5))  # Test with short interval
+    # Scheduled run (setup_cron.py); --test rechecks a few with a short interval
+    if "--test" in sys.argv:
+        asyncio.run(run_recheck(min_hours=0.1, limit=5))
+    else:
+        asyncio.run(run_recheck())
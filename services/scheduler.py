@@ -0,0 +1,61 @@
+"""
+Recheck Scheduler
+
+Long-running alternative to the cron jobs: one process runs the
+opportunity recheck at 9am and 9pm, keeping Python, the imports, the
+eBay browser and the title-identifier cache warm between runs.
+
+    python -m services.scheduler
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import sys
+from pathlib import Path
+_project_root = str(Path(__file__).parent.parent)
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+from scrapers.ebay_scraper import EbayScraper
+from services.recheck import RECHECK_BROWSERS, run_recheck
+from utils.title_identifier import TitleIdentifier, CachedTitleIdentifier
+
+# Local hours to run at (same schedule as setup_cron.py)
+RUN_HOURS = (9, 21)
+
+
+def seconds_until_next_run(now: datetime = None, hours: tuple[int, ...] = RUN_HOURS) -> float:
+    """Seconds from now until the next of `hours` o'clock"""
+    now = now or datetime.now()
+    candidates = [
+        now.replace(hour=hour, minute=0, second=0, microsecond=0) + timedelta(days=day)
+        for day in (0, 1)
+        for hour in hours
+    ]
+    return min((at - now).total_seconds() for at in candidates if at > now)
+
+
+async def run_forever():
+    """Recheck at every RUN_HOURS o'clock until interrupted"""
+    # The browser is started and closed by this task (its MCP connection
+    # has to be) and reused by every run in between
+    identifier = CachedTitleIdentifier(TitleIdentifier())
+    try:
+        async with EbayScraper(headless=True, max_browsers=RECHECK_BROWSERS) as scraper:
+            while True:
+                delay = seconds_until_next_run()
+                print(f"⏰ Next recheck at {datetime.now() + timedelta(seconds=delay):%Y-%m-%d %H:%M}")
+                await asyncio.sleep(delay)
+                try:
+                    await run_recheck(ebay_scraper=scraper, identifier=identifier)
+                except Exception as e:
+                    print(f"⚠️ Recheck failed: {e}")
+    finally:
+        await identifier.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(run_forever())
+    except KeyboardInterrupt:
+        pass
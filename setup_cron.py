@@ -4,8 +4,11 @@ Setup cron jobs for ScrapedFace - FB Arbitrage Scanner
 
 Installs:
 - Twice-daily opportunity recheck (9am and 9pm)
+- or, with `install --daemon`, a systemd user service running the same
+  schedule from one long-lived process (services/scheduler.py)
 """
 import os
+import re
 import subprocess
 import sys
 from pathlib import Path
@@ -15,9 +18,19 @@ PROJECT_DIR = Path(__file__).parent.resolve()
 VENV_PYTHON = PROJECT_DIR / ".venv" / "bin" / "python"
 
 CRON_MARKER = "# SCRAPEDFACE-SCANNER"
+# Marker comment + the entry line below it: (job name, schedule)
+CRON_JOB_RE = re.compile(
+    rf'^{re.escape(CRON_MARKER)}[ \t]*(.*)\n[ \t]*(\S+[ \t]+\S+[ \t]+\S+[ \t]+\S+[ \t]+\S+)',
+    re.M
+)
+# Any marker line and the line after it, for removal
+CRON_ENTRY_RE = re.compile(rf'^.*{re.escape(CRON_MARKER)}.*\n?.*(?:\n|\Z)', re.M)
 
 LOG_FILE = "/tmp/scrapedface-recheck.log"
 
+# Runs services/recheck.py's __main__ (bytecode is precompiled on install)
+RECHECK_COMMAND = f"cd {PROJECT_DIR} && {VENV_PYTHON} -m services.recheck"
+
 # Jobs are built dynamically to use resolved paths
 def get_cron_jobs():
     return [
@@ -25,19 +38,39 @@ def get_cron_jobs():
         {
             "schedule": "0 9 * * *",
             "name": "recheck-morning",
-            "command": f'cd {PROJECT_DIR} && {VENV_PYTHON} -c "import asyncio; from services.recheck import run_recheck; asyncio.run(run_recheck())"',
+            "command": RECHECK_COMMAND,
             "log": LOG_FILE
         },
         {
             "schedule": "0 21 * * *",
             "name": "recheck-evening",
-            "command": f'cd {PROJECT_DIR} && {VENV_PYTHON} -c "import asyncio; from services.recheck import run_recheck; asyncio.run(run_recheck())"',
+            "command": RECHECK_COMMAND,
             "log": LOG_FILE
         },
     ]
 
 CRON_JOBS = get_cron_jobs()
 
+# Always-on alternative to the cron jobs (services/scheduler.py)
+SYSTEMD_UNIT_NAME = "scrapedface.service"
+SYSTEMD_UNIT_PATH = Path.home() / ".config" / "systemd" / "user" / SYSTEMD_UNIT_NAME
+
+
+def get_systemd_unit() -> str:
+    return f"""[Unit]
+Description=ScrapedFace opportunity recheck scheduler
+
+[Service]
+WorkingDirectory={PROJECT_DIR}
+ExecStart={VENV_PYTHON} -m services.scheduler
+Restart=on-failure
+StandardOutput=append:{LOG_FILE}
+StandardError=append:{LOG_FILE}
+
+[Install]
+WantedBy=default.target
+"""
+
 
 def get_current_crontab() -> str:
     """Get current user's crontab"""
@@ -71,20 +104,7 @@ def set_crontab(content: str) -> bool:
 
 def remove_existing_jobs(crontab: str) -> str:
     """Remove existing FB Arbitrage cron jobs"""
-    lines = crontab.split('\n')
-    filtered = []
-    skip_next = False
-    
-    for line in lines:
-        if CRON_MARKER in line:
-            skip_next = True
-            continue
-        if skip_next:
-            skip_next = False
-            continue
-        filtered.append(line)
-    
-    return '\n'.join(filtered)
+    return CRON_ENTRY_RE.sub('', crontab)
 
 
 def install_cron_jobs() -> bool:
@@ -99,6 +119,9 @@ def install_cron_jobs() -> bool:
         print("   Run: python -m venv .venv && source .venv/bin/activate && pip install -r requirements.txt")
         return False
     
+    # Precompile bytecode so each cron run skips compiling the project
+    subprocess.run([str(VENV_PYTHON), "-m", "compileall", "-q", "-x", r"/\.venv/", str(PROJECT_DIR)])
+    
     # Get current crontab
     current = get_current_crontab()
     
@@ -145,10 +168,55 @@ def install_cron_jobs() -> bool:
         return False
 
 
+def install_daemon() -> bool:
+    """Install the recheck scheduler as a systemd user service (replaces the cron jobs)"""
+    print("\n" + "=" * 50)
+    print("🕐 SCHEDULER DAEMON SETUP")
+    print("=" * 50)
+    
+    if not VENV_PYTHON.exists():
+        print(f"❌ Virtual environment not found at {VENV_PYTHON}")
+        print("   Run: python -m venv .venv && source .venv/bin/activate && pip install -r requirements.txt")
+        return False
+    
+    print(f"\nWill write {SYSTEMD_UNIT_PATH}")
+    print("  📅 Rechecks at 9:00 AM and 9:00 PM from one long-running process")
+    print(f"     Log: {LOG_FILE}")
+    
+    print()
+    confirm = input("Install scheduler service? (y/n): ").strip().lower()
+    if confirm != 'y':
+        print("❌ Cancelled")
+        return False
+    
+    SYSTEMD_UNIT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    SYSTEMD_UNIT_PATH.write_text(get_systemd_unit())
+    
+    # The daemon does the cron jobs' work - don't run both
+    set_crontab(remove_existing_jobs(get_current_crontab()))
+    
+    try:
+        subprocess.run(["systemctl", "--user", "daemon-reload"], check=True)
+        subprocess.run(["systemctl", "--user", "enable", "--now", SYSTEMD_UNIT_NAME], check=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"❌ Failed to start service: {e}")
+        print(f"   Unit written to {SYSTEMD_UNIT_PATH} - enable it with:")
+        print(f"   systemctl --user enable --now {SYSTEMD_UNIT_NAME}")
+        return False
+    
+    print("\n✅ Scheduler service installed and started!")
+    return True
+
+
 def uninstall_cron_jobs() -> bool:
     """Remove FB Arbitrage cron jobs"""
     print("\n🗑️  Removing FB Arbitrage cron jobs...")
     
+    if SYSTEMD_UNIT_PATH.exists():
+        subprocess.run(["systemctl", "--user", "disable", "--now", SYSTEMD_UNIT_NAME])
+        SYSTEMD_UNIT_PATH.unlink()
+        print("✅ Scheduler service removed")
+    
     current = get_current_crontab()
     cleaned = remove_existing_jobs(current)
     
@@ -164,31 +232,27 @@ def show_cron_status():
     
     current = get_current_crontab()
     
-    found = False
-    lines = current.split('\n')
-    for i, line in enumerate(lines):
-        if CRON_MARKER in line:
-            found = True
-            job_name = line.replace(CRON_MARKER, '').strip()
-            if i + 1 < len(lines):
-                schedule = lines[i + 1].split()[0:5]
-                print(f"  ✅ {job_name}: {' '.join(schedule)}")
-    
-    if not found:
+    jobs = CRON_JOB_RE.findall(current)
+    for job_name, schedule in jobs:
+        print(f"  ✅ {job_name.strip()}: {' '.join(schedule.split())}")
+    
+    if not jobs:
         print("  ❌ No cron jobs installed")
         print("\n  Run: python setup_cron.py install")
 
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python setup_cron.py [install|uninstall|status]")
+        print("Usage: python setup_cron.py [install [--daemon]|uninstall|status]")
         print()
         show_cron_status()
         return
     
     action = sys.argv[1].lower()
     
-    if action == "install":
+    if action == "install" and "--daemon" in sys.argv:
+        install_daemon()
+    elif action == "install":
         install_cron_jobs()
     elif action == "uninstall":
         uninstall_cron_jobs()
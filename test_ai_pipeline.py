@@ -12,7 +12,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from utils.title_identifier import TitleIdentifier
-from utils.ai_matcher import AIItemMatcher
+from utils.ai_matcher import AIItemMatcher, close_matcher_client, title_similarity
 from scrapers.ebay_scraper import EbayScraper
 import database as db
 
@@ -163,17 +163,17 @@ async def test_pipeline():
     best_match = None
     best_confidence = 0
     
-    for ebay in ebay_results[:3]:  # Check top 3
-        print(f"\n🔍 Comparing to: {ebay['title'][:50]}...")
-        
-        result = await matcher.compare_listings(
-            fb_title=fb_listing["title"],
-            fb_description=fb_listing.get("description", ""),
-            fb_image_url=fb_listing["image_url"],
-            ebay_title=ebay["title"],
-            ebay_image_url=ebay.get("image_url")
-        )
-        
+    # Check top 3 (one request for all of them)
+    top_results = ebay_results[:3]
+    match_results = await matcher.compare_listings_batch(
+        fb_title=fb_listing["title"],
+        fb_description=fb_listing.get("description", ""),
+        fb_image_url=fb_listing["image_url"],
+        ebay_candidates=top_results
+    )
+    
+    for ebay, result in zip(top_results, match_results):
+        print(f"\n🔍 Compared to: {ebay['title'][:50]}...")
         print(f"   {result}")
         
         # Save match result to database
@@ -182,10 +182,10 @@ async def test_pipeline():
             ebay_listing_id=ebay['id'],
             is_match=result.is_match,
             confidence=result.confidence,
-            title_similarity=result.title_similarity,
-            image_match=result.image_match,
-            image_confidence=result.image_confidence,
-            reasoning=result.reasoning
+            title_similarity=title_similarity(fb_listing["title"], ebay["title"]) / 100,
+            reasoning=result.reasoning,
+            fb_synthesis=result.fb_synthesis,
+            ebay_synthesis=result.ebay_synthesis
         )
         
         if result.is_match and result.confidence > best_confidence:
@@ -225,6 +225,7 @@ async def test_pipeline():
     # Cleanup
     await identifier.close()
     await matcher.close()
+    await close_matcher_client()
     
     print("\n" + "=" * 60)
     print("✅ E2E TEST COMPLETE")
@@ -8,15 +8,103 @@ Match if more likely than not (>50%).
 """
 import asyncio
 import base64
+import hashlib
+import heapq
+import io
+import json
 import os
 import re
-from dataclasses import dataclass
+from collections import Counter, OrderedDict
+from dataclasses import asdict, dataclass
+from difflib import SequenceMatcher
+from functools import lru_cache
 from typing import Optional
 
 import httpx
 
+import sys
+sys.path.insert(0, str(__file__).rsplit('/', 2)[0])
 
-@dataclass
+from utils.log import get_logger
+from utils.rate_limit import get_host_limiter, retry_after_seconds
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None  # Images are sent as downloaded
+
+
+logger = get_logger("ai_matcher")
+
+GEMINI_HOST = "generativelanguage.googleapis.com"
+# Gemini requests in flight per matcher (set to fit the API key's quota)
+GEMINI_CONCURRENCY = int(os.environ.get("GEMINI_CONCURRENCY", "8"))
+# Retries of a throttled (429/503) request before falling back
+MAX_GEMINI_RETRIES = 4
+_RETRY_STATUSES = {429, 503}
+
+# Sent with image downloads (the client may be shared, so not set on it)
+_IMAGE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+
+# Larger photos are downscaled to fit MAX_IMAGE_SIDE and re-encoded as
+# WebP before upload - plenty for identifying an item, and a fraction
+# of the request size/tokens of a full-size listing photo
+MAX_IMAGE_SIDE = 768
+SHRINK_IMAGES_OVER = 200 * 1024  # bytes
+
+
+def _shrink_image(content: bytes) -> bytes:
+    """Downscaled WebP copy of an image (the original if decoding fails or it isn't smaller)"""
+    try:
+        with Image.open(io.BytesIO(content)) as img:
+            img.thumbnail((MAX_IMAGE_SIDE, MAX_IMAGE_SIDE), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            img.convert("RGB").save(buffer, format="WEBP", quality=80, method=4)
+    except Exception:
+        return content
+    shrunk = buffer.getvalue()
+    return shrunk if len(shrunk) < len(content) else content
+
+
+# Number in the model's "PROBABILITY: 85%" line
+_PROBABILITY_RE = re.compile(r'(\d+)')
+# "FB_ITEM: ..." / "PROBABILITY: 85" lines of a single comparison
+_FIELD_RE = re.compile(r'^[ \t]*(FB_ITEM|EBAY_ITEM|PROBABILITY|REASONING):(.*)$', re.M)
+# A complete REASONING line - the last field of a single comparison
+_REASONING_DONE_RE = re.compile(r'^\s*REASONING:.*\n', re.M)
+# "FB_ITEM: ..." / "PROBABILITY_2: 85" lines of a batch response
+_BATCH_FIELD_RE = re.compile(
+    r'^\s*\**(FB_ITEM|EBAY_ITEM|PROBABILITY|REASONING)(?:_(\d+))?\**\s*:\s*(.*)$', re.M
+)
+
+
+# One connection pool for every matcher that isn't handed a client
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_shared_client() -> httpx.AsyncClient:
+    """Get or create the HTTP client shared by AIItemMatcher instances"""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=30.0)
+        )
+    return _client
+
+
+async def close_matcher_client():
+    """Close the shared matcher HTTP client"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+@dataclass(slots=True, frozen=True)
 class MatchResult:
     """Result of AI matching between two listings"""
     is_match: bool
@@ -24,12 +112,21 @@ class MatchResult:
     fb_synthesis: str  # What the FB listing is
     ebay_synthesis: str  # What the eBay listing is
     reasoning: str
+    is_fallback: bool = False  # Word-overlap heuristic, AI was unavailable
     
     def __str__(self):
         status = "✅ MATCH" if self.is_match else "❌ NO MATCH"
         return f"{status} ({self.confidence:.0%}) - {self.reasoning[:80]}"
 
 
+@dataclass(slots=True)
+class CachedImage:
+    """Downloaded image, base64-encoded once for every request it goes into"""
+    data: bytes
+    b64: str
+    mime_type: str
+
+
 class AIItemMatcher:
     """
     Matches items using holistic AI synthesis.
@@ -45,86 +142,164 @@ class AIItemMatcher:
         self,
         gemini_api_key: str = None,
         gemini_model: str = "gemini-2.0-flash",
-        match_threshold: float = 0.5  # Match if >50% likely
+        match_threshold: float = 0.5,  # Match if >50% likely
+        client: Optional[httpx.AsyncClient] = None  # Defaults to the module's shared client
     ):
         self.gemini_api_key = gemini_api_key or os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
         self.gemini_model = gemini_model
         self.match_threshold = match_threshold
-        self._client = None
+        self._client = client
+        # url -> download task; the FB photo is compared against every
+        # eBay candidate, so it's fetched once and shared
+        self._images: OrderedDict[str, asyncio.Task] = OrderedDict()
+        self._gemini_slots = asyncio.Semaphore(GEMINI_CONCURRENCY)
+        # How _prefilter decided each comparison ("rejected"/"accepted"/"ai") - for tuning its thresholds
+        self.prefilter_counts = Counter()
     
     async def _get_client(self) -> httpx.AsyncClient:
-        if self._client is None:
-            self._client = httpx.AsyncClient(timeout=60.0)
+        if self._client is None or self._client.is_closed:
+            self._client = _get_shared_client()
         return self._client
     
     async def close(self):
-        if self._client:
-            await self._client.aclose()
-            self._client = None
+        """Drop cached images (the HTTP client is left to its owner / close_matcher_client)"""
+        for task in self._images.values():
+            task.cancel()
+        self._images.clear()
+        self._client = None
+    
+    IMAGE_CACHE_SIZE = 64  # ~100-300KB each, plus the base64 copy
+    
+    def _image_task(self, url: str) -> asyncio.Task:
+        task = self._images.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_image(url))
+            self._images[url] = task
+            while len(self._images) > self.IMAGE_CACHE_SIZE:
+                self._images.popitem(last=False)
+        else:
+            self._images.move_to_end(url)
+        return task
     
-    async def _download_image(self, url: str) -> Optional[bytes]:
-        """Download image from URL"""
+    def prefetch_images(self, urls):
+        """Start downloading images in the background so later compares find them ready"""
+        for url in urls:
+            if url:
+                self._image_task(url)
+    
+    async def _download_image(self, url: str) -> Optional[CachedImage]:
+        """Download image from URL (cached per URL, concurrent callers share one fetch)"""
         if not url:
             return None
+        task = self._image_task(url)
+        image = await asyncio.shield(task)
+        if image is None:
+            self._images.pop(url, None)  # Don't remember failures
+        return image
+    
+    async def _fetch_image(self, url: str) -> Optional[CachedImage]:
         try:
             client = await self._get_client()
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-            }
-            response = await client.get(url, follow_redirects=True, headers=headers)
+            response = await client.get(url, follow_redirects=True, headers=_IMAGE_HEADERS)
             if response.status_code == 200:
-                return response.content
+                # Off the event loop so other comparisons keep their I/O going
+                return await asyncio.to_thread(self._prepare_image, response.content)
         except Exception:
             pass
         return None
     
+    def _prepare_image(self, content: bytes) -> CachedImage:
+        """Shrink (when Pillow is available) and base64-encode a downloaded image"""
+        if Image is not None and len(content) > SHRINK_IMAGES_OVER:
+            content = _shrink_image(content)
+        return CachedImage(
+            data=content,
+            b64=base64.b64encode(content).decode('ascii'),
+            mime_type=self._detect_mime_type(content)
+        )
+    
     def _detect_mime_type(self, image_data: bytes) -> str:
-        """Detect image MIME type from bytes"""
-        if image_data[:4] == b'\x89PNG':
+        """Detect image MIME type from bytes (startswith compares in place, no slices)"""
+        if image_data.startswith(b'\xff\xd8'):  # Most listing photos
+            return "image/jpeg"
+        elif image_data.startswith(b'\x89PNG'):
             return "image/png"
-        elif image_data[:4] == b'RIFF' and image_data[8:12] == b'WEBP':
+        elif image_data.startswith(b'RIFF') and image_data.startswith(b'WEBP', 8):
             return "image/webp"
-        elif image_data[:3] == b'GIF':
+        elif image_data.startswith(b'GIF'):
             return "image/gif"
         return "image/jpeg"
     
     async def _call_gemini(
         self,
         prompt: str,
-        images: list[tuple[bytes, str]] = None  # List of (image_data, mime_type)
+        images: list[CachedImage] = None,
+        done: Optional[re.Pattern] = None
     ) -> Optional[str]:
         """Call Gemini API with text and optional images"""
+        # Build content parts
+        parts = [{"text": prompt}]
+        
+        if images:
+            for image in images:
+                parts.append(self._image_part(image))
+        
+        return await self._generate(parts, done)
+    
+    def _image_part(self, image: CachedImage) -> dict:
+        return {"inline_data": {"mime_type": image.mime_type, "data": image.b64}}
+    
+    async def _generate(self, parts: list[dict], done: Optional[re.Pattern] = None) -> Optional[str]:
+        """
+        Send content parts (text and inline images, in order) to Gemini;
+        response text or None. The response is streamed, and once `done`
+        matches the text so far the rest (trailing explanation the
+        parser ignores) is not waited for.
+        
+        At most GEMINI_CONCURRENCY requests run at once; 429/503 responses
+        pause the Gemini host bucket (honouring Retry-After) and are
+        retried with exponential backoff.
+        """
         if not self.gemini_api_key:
             return None
         
+        limiter = get_host_limiter(GEMINI_HOST)
         try:
             client = await self._get_client()
             
-            # Build content parts
-            parts = [{"text": prompt}]
-            
-            if images:
-                for img_data, mime_type in images:
-                    img_b64 = base64.b64encode(img_data).decode('utf-8')
-                    parts.append({
-                        "inline_data": {"mime_type": mime_type, "data": img_b64}
-                    })
-            
-            response = await client.post(
-                f"https://generativelanguage.googleapis.com/v1beta/models/{self.gemini_model}:generateContent?key={self.gemini_api_key}",
-                headers={"Content-Type": "application/json"},
-                json={"contents": [{"parts": parts}]},
-                timeout=45.0
-            )
-            
-            if response.status_code != 200:
-                return None
-            
-            result = response.json()
-            try:
-                return result["candidates"][0]["content"]["parts"][0]["text"]
-            except (KeyError, IndexError):
-                return None
+            async with self._gemini_slots:
+                for attempt in range(MAX_GEMINI_RETRIES + 1):
+                    await limiter.acquire()
+                    text = ""
+                    async with client.stream(
+                        "POST",
+                        f"https://{GEMINI_HOST}/v1beta/models/{self.gemini_model}:streamGenerateContent?alt=sse&key={self.gemini_api_key}",
+                        headers={"Content-Type": "application/json"},
+                        json={"contents": [{"parts": parts}]},
+                        timeout=45.0
+                    ) as response:
+                        if response.status_code in _RETRY_STATUSES and attempt < MAX_GEMINI_RETRIES:
+                            delay = retry_after_seconds(response.headers, attempt, cap=30.0)
+                            limiter.pause(delay)
+                            logger.info("   ⏳ Gemini returned %d, backing off %.0fs...", response.status_code, delay)
+                            continue
+                        if response.status_code != 200:
+                            if response.status_code in _RETRY_STATUSES:
+                                logger.info("   ⚠️ Gemini still throttled after %d retries", MAX_GEMINI_RETRIES)
+                            return None
+                        
+                        async for line in response.aiter_lines():
+                            if not line.startswith("data:"):
+                                continue
+                            try:
+                                chunk = json.loads(line[5:])
+                                text += chunk["candidates"][0]["content"]["parts"][0]["text"]
+                            except (ValueError, KeyError, IndexError):
+                                continue
+                            if done and done.search(text):
+                                break  # Leaving the block closes the stream
+                    
+                    return text or None
                 
         except Exception:
             return None
@@ -147,10 +322,32 @@ class AIItemMatcher:
         2. Ask it to synthesize what each item IS
         3. Determine probability they're the same item
         4. Match if >50%
+        
+        Title pairs _prefilter can already decide are answered without it.
         """
+        decided = self._prefilter(fb_title, ebay_title)
+        if decided:
+            return decided
+        return await self._ai_compare(
+            fb_title, fb_description, fb_image_url,
+            ebay_title, ebay_description, ebay_image_url, ebay_price
+        )
+    
+    async def _ai_compare(
+        self,
+        fb_title: str,
+        fb_description: str,
+        fb_image_url: Optional[str],
+        ebay_title: str,
+        ebay_description: str,
+        ebay_image_url: Optional[str],
+        ebay_price: Optional[float]
+    ) -> MatchResult:
+        """compare_listings' model call"""
         # Download images if available
-        fb_image = await self._download_image(fb_image_url) if fb_image_url else None
-        ebay_image = await self._download_image(ebay_image_url) if ebay_image_url else None
+        fb_image, ebay_image = await asyncio.gather(
+            self._download_image(fb_image_url), self._download_image(ebay_image_url)
+        )
         
         # Build the comparison prompt
         prompt = f"""You are an expert at identifying products and determining if two listings are for the same item.
@@ -182,42 +379,23 @@ PROBABILITY: [0-100]
 REASONING: [one sentence explaining your judgment]"""
 
         # Prepare images for API call
-        images = []
-        if fb_image:
-            images.append((fb_image, self._detect_mime_type(fb_image)))
-        if ebay_image:
-            images.append((ebay_image, self._detect_mime_type(ebay_image)))
+        images = [image for image in (fb_image, ebay_image) if image]
         
         # Call Gemini
-        response = await self._call_gemini(prompt, images if images else None)
+        response = await self._call_gemini(prompt, images if images else None, _REASONING_DONE_RE)
         
         if not response:
             # Fallback: no AI available, use simple heuristic
             return self._fallback_comparison(fb_title, ebay_title)
         
-        # Parse response
-        fb_synthesis = ""
-        ebay_synthesis = ""
-        probability = 0
-        reasoning = ""
-        
-        for line in response.split('\n'):
-            line = line.strip()
-            if line.startswith('FB_ITEM:'):
-                fb_synthesis = line.split(':', 1)[1].strip()
-            elif line.startswith('EBAY_ITEM:'):
-                ebay_synthesis = line.split(':', 1)[1].strip()
-            elif line.startswith('PROBABILITY:'):
-                try:
-                    prob_str = line.split(':', 1)[1].strip()
-                    # Extract number from string like "85" or "85%"
-                    prob_match = re.search(r'(\d+)', prob_str)
-                    if prob_match:
-                        probability = int(prob_match.group(1))
-                except:
-                    pass
-            elif line.startswith('REASONING:'):
-                reasoning = line.split(':', 1)[1].strip()
+        # Parse response (one regex pass; a repeated field keeps its last value)
+        fields = {key: value.strip() for key, value in _FIELD_RE.findall(response)}
+        fb_synthesis = fields.get('FB_ITEM', "")
+        ebay_synthesis = fields.get('EBAY_ITEM', "")
+        reasoning = fields.get('REASONING', "")
+        # Extract number from string like "85" or "85%"
+        prob_match = _PROBABILITY_RE.search(fields.get('PROBABILITY', ""))
+        probability = int(prob_match.group(1)) if prob_match else 0
         
         confidence = probability / 100.0
         is_match = confidence > self.match_threshold
@@ -230,6 +408,195 @@ REASONING: [one sentence explaining your judgment]"""
             reasoning=reasoning or f"Match probability: {probability}%"
         )
     
+    async def compare_listings_batch(
+        self,
+        fb_title: str,
+        fb_description: str,
+        fb_image_url: Optional[str],
+        ebay_candidates: list[dict]
+    ) -> list[MatchResult]:
+        """
+        Compare a Facebook listing to several eBay listings in one request.
+        
+        Same judgment as compare_listings, but the FB listing (and its
+        photo) is sent once with every candidate labeled by number.
+        Candidates are dicts with 'title', 'description', 'image_url',
+        'price'; results come back in candidate order. Any candidate the
+        response doesn't cover is compared on its own.
+        """
+        if len(ebay_candidates) <= 1:
+            return [
+                await self.compare_listings(
+                    fb_title=fb_title,
+                    fb_description=fb_description,
+                    fb_image_url=fb_image_url,
+                    ebay_title=ebay.get('title', ''),
+                    ebay_description=ebay.get('description', ''),
+                    ebay_image_url=ebay.get('image_url'),
+                    ebay_price=ebay.get('price')
+                )
+                for ebay in ebay_candidates
+            ]
+        
+        # Only the candidates _prefilter can't decide go to the model
+        results = [self._prefilter(fb_title, ebay.get('title', '')) for ebay in ebay_candidates]
+        pending = [i for i, result in enumerate(results) if result is None]
+        if len(pending) == 1:
+            ebay = ebay_candidates[pending[0]]
+            results[pending[0]] = await self._ai_compare(
+                fb_title, fb_description, fb_image_url,
+                ebay.get('title', ''), ebay.get('description', ''),
+                ebay.get('image_url'), ebay.get('price')
+            )
+        elif pending:
+            fresh = await self._ai_compare_batch(
+                fb_title, fb_description, fb_image_url,
+                [ebay_candidates[i] for i in pending]
+            )
+            for i, result in zip(pending, fresh):
+                results[i] = result
+        return results
+    
+    async def _ai_compare_batch(
+        self,
+        fb_title: str,
+        fb_description: str,
+        fb_image_url: Optional[str],
+        ebay_candidates: list[dict]
+    ) -> list[MatchResult]:
+        """compare_listings_batch's model call (two or more candidates)"""
+        fb_image, *ebay_images = await asyncio.gather(
+            self._download_image(fb_image_url),
+            *(self._download_image(ebay.get('image_url')) for ebay in ebay_candidates)
+        )
+        
+        candidate_text = []
+        for number, (ebay, image) in enumerate(zip(ebay_candidates, ebay_images), 1):
+            price = ebay.get('price')
+            candidate_text.append(f"""=== EBAY SOLD LISTING {number} ===
+Title: {ebay.get('title', '')}
+Description: {ebay.get('description') or "(no description)"}
+{f"Sold Price: ${price:.2f}" if price else ""}
+{"[Image attached below]" if image else "(no image)"}""")
+        
+        count = len(ebay_candidates)
+        prompt = f"""You are an expert at identifying products and determining if two listings are for the same item.
+
+=== FACEBOOK MARKETPLACE LISTING ===
+Title: {fb_title}
+Description: {fb_description or "(no description)"}
+{"[Image attached below]" if fb_image else "(no image)"}
+
+{chr(10).join(candidate_text)}
+
+Based on ALL available information (titles, descriptions, and images), determine:
+
+1. SYNTHESIZE: What specific product is the Facebook listing selling? (brand, model, variant, condition)
+2. For EACH eBay listing N (1 to {count}):
+   - SYNTHESIZE: What specific product is eBay listing N showing? (brand, model, variant, condition)
+   - MATCH PROBABILITY: What is the probability (0-100%) that it is the SAME or BASICALLY THE SAME item as the Facebook listing?
+   - "Same" means: same brand, same model/product line, same general type
+   - Minor differences in color, condition, or accessories are OK
+   - Different models/generations are NOT the same (e.g., iPhone 14 vs iPhone 15)
+
+Respond in this EXACT format, with one EBAY_ITEM/PROBABILITY/REASONING group per eBay listing:
+FB_ITEM: [what the Facebook listing is selling]
+EBAY_ITEM_1: [what eBay listing 1 is showing]
+PROBABILITY_1: [0-100]
+REASONING_1: [one sentence explaining your judgment]
+EBAY_ITEM_2: ...
+(and so on up to {count})"""
+        
+        # Each image follows a label naming the listing it belongs to
+        parts = [{"text": prompt}]
+        if fb_image:
+            parts.append({"text": "Image for the FACEBOOK MARKETPLACE LISTING:"})
+            parts.append(self._image_part(fb_image))
+        for number, image in enumerate(ebay_images, 1):
+            if image:
+                parts.append({"text": f"Image for EBAY SOLD LISTING {number}:"})
+                parts.append(self._image_part(image))
+        
+        # Stop reading once the last candidate's reasoning line is complete
+        response = await self._generate(
+            parts, re.compile(rf'^\s*\**REASONING_{count}\**\s*:.*\n', re.M)
+        )
+        if not response:
+            return [self._fallback_comparison(fb_title, ebay.get('title', '')) for ebay in ebay_candidates]
+        
+        fb_synthesis = ""
+        fields: dict[int, dict[str, str]] = {}
+        for match in _BATCH_FIELD_RE.finditer(response):
+            key, number, value = match.groups()
+            if key == 'FB_ITEM':
+                fb_synthesis = value.strip()
+            elif number:
+                fields.setdefault(int(number), {})[key] = value.strip()
+        
+        results = []
+        for number, ebay in enumerate(ebay_candidates, 1):
+            answer = fields.get(number, {})
+            prob_match = _PROBABILITY_RE.search(answer.get('PROBABILITY', ''))
+            if not prob_match:
+                results.append(None)
+                continue
+            probability = int(prob_match.group(1))
+            confidence = probability / 100.0
+            results.append(MatchResult(
+                is_match=confidence > self.match_threshold,
+                confidence=confidence,
+                fb_synthesis=fb_synthesis,
+                ebay_synthesis=answer.get('EBAY_ITEM', ''),
+                reasoning=answer.get('REASONING') or f"Match probability: {probability}%"
+            ))
+        
+        # Candidates the response skipped get their own request
+        missing = [i for i, result in enumerate(results) if result is None]
+        if missing:
+            retried = await asyncio.gather(*[
+                self._ai_compare(
+                    fb_title, fb_description, fb_image_url,
+                    ebay_candidates[i].get('title', ''), ebay_candidates[i].get('description', ''),
+                    ebay_candidates[i].get('image_url'), ebay_candidates[i].get('price')
+                )
+                for i in missing
+            ])
+            for i, result in zip(missing, retried):
+                results[i] = result
+        return results
+    
+    def _prefilter(self, fb_title: str, ebay_title: str) -> Optional[MatchResult]:
+        """
+        Verdict for title pairs that don't need the model, else None.
+        
+        Titles with (almost) no word in common, allowing for typos, are
+        rejected (see fuzzy_token_overlap). Titles made of exactly the same
+        words including a model number are accepted. Everything in between
+        goes to the model.
+        """
+        fb_tokens = _split_title_tokens(fb_title)
+        ebay_tokens = _split_title_tokens(ebay_title)
+        if fb_tokens and ebay_tokens and fuzzy_token_overlap(fb_title, ebay_title) < PREFILTER_REJECT_OVERLAP:
+            self.prefilter_counts["rejected"] += 1
+            return MatchResult(
+                is_match=False,
+                confidence=0.0,
+                fb_synthesis=fb_title,
+                ebay_synthesis=ebay_title,
+                reasoning="Pre-filter reject: titles share no similar words"
+            )
+        if fb_tokens == ebay_tokens and any(c.isdigit() for token in fb_tokens for c in token):
+            self.prefilter_counts["accepted"] += 1
+            return MatchResult(
+                is_match=True,
+                confidence=1.0,
+                fb_synthesis=fb_title,
+                ebay_synthesis=ebay_title,
+                reasoning="Pre-filter accept: same title words incl. model number"
+            )
+        self.prefilter_counts["ai"] += 1
+        return None
+    
     def _fallback_comparison(self, fb_title: str, ebay_title: str) -> MatchResult:
         """Simple fallback when AI is unavailable"""
         # Basic word overlap check
@@ -247,7 +614,8 @@ REASONING: [one sentence explaining your judgment]"""
                 confidence=0.0,
                 fb_synthesis=fb_title,
                 ebay_synthesis=ebay_title,
-                reasoning="Cannot compare: insufficient data"
+                reasoning="Cannot compare: insufficient data",
+                is_fallback=True
             )
         
         overlap = len(fb_words & ebay_words)
@@ -259,14 +627,20 @@ REASONING: [one sentence explaining your judgment]"""
             confidence=confidence,
             fb_synthesis=fb_title,
             ebay_synthesis=ebay_title,
-            reasoning=f"Word overlap: {overlap}/{total} ({confidence:.0%})"
+            reasoning=f"Word overlap: {overlap}/{total} ({confidence:.0%})",
+            is_fallback=True
         )
     
+    # find_best_match keeps this many candidates per max_candidates after
+    # the token-overlap prescreen
+    PRESCREEN_FACTOR = 4
+    
     async def find_best_match(
         self,
         fb_listing: dict,
         ebay_results: list[dict],
-        max_candidates: int = 5
+        max_candidates: int = 5,
+        min_title_similarity: float = 0.0
     ) -> Optional[tuple[dict, MatchResult]]:
         """
         Find the best matching eBay result for a FB listing.
@@ -275,6 +649,8 @@ REASONING: [one sentence explaining your judgment]"""
             fb_listing: Dict with 'title', 'description', 'image_url'
             ebay_results: List of dicts with same fields + 'price'
             max_candidates: Max number to compare (for rate limiting)
+            min_title_similarity: Candidates below this title_similarity
+                (0-100) are dropped without an AI comparison
             
         Returns:
             Tuple of (best_ebay_match, match_result) or None
@@ -283,37 +659,33 @@ REASONING: [one sentence explaining your judgment]"""
         fb_desc = fb_listing.get('description', '')
         fb_image = fb_listing.get('image_url')
         
-        # Quick pre-filter: basic word overlap to find likely candidates
-        candidates = []
-        for ebay in ebay_results:
-            ebay_title = ebay.get('title', '')
-            
-            # Simple relevance score based on shared words
-            fb_words = set(fb_title.lower().split())
-            ebay_words = set(ebay_title.lower().split())
-            overlap = len(fb_words & ebay_words)
-            
-            candidates.append((ebay, overlap))
+        # Long result lists are first cut down by token overlap (set ops in C),
+        # so the difflib scoring below only runs on plausible candidates
+        if len(ebay_results) > self.PRESCREEN_FACTOR * max_candidates:
+            fb_tokens = _title_tokens(fb_title)
+            ebay_results = heapq.nlargest(
+                self.PRESCREEN_FACTOR * max_candidates, ebay_results,
+                key=lambda ebay: len(fb_tokens & _title_tokens(ebay.get('title', '')))
+            )
+        
+        # Quick pre-filter: top N by title similarity (ties keep eBay's order)
+        scored = [
+            (title_similarity(fb_title, ebay.get('title', '')), ebay) for ebay in ebay_results
+        ]
+        top_candidates = [
+            ebay for score, ebay in heapq.nlargest(max_candidates, scored, key=lambda pair: pair[0])
+            if score >= min_title_similarity
+        ]
+        if not top_candidates:
+            return None
         
-        # Sort by overlap, take top N
-        candidates.sort(key=lambda x: x[1], reverse=True)
-        top_candidates = [c[0] for c in candidates[:max_candidates]]
+        # Full AI comparison on top candidates (one request for all of them)
+        results = await self.compare_listings_batch(fb_title, fb_desc, fb_image, top_candidates)
         
-        # Full AI comparison on top candidates
         best_match = None
         best_result = None
         
-        for ebay in top_candidates:
-            result = await self.compare_listings(
-                fb_title=fb_title,
-                fb_description=fb_desc,
-                fb_image_url=fb_image,
-                ebay_title=ebay.get('title', ''),
-                ebay_description=ebay.get('description', ''),
-                ebay_image_url=ebay.get('image_url'),
-                ebay_price=ebay.get('price')
-            )
-            
+        for ebay, result in zip(top_candidates, results):
             if result.is_match:
                 if best_result is None or result.confidence > best_result.confidence:
                     best_match = ebay
@@ -324,6 +696,272 @@ REASONING: [one sentence explaining your judgment]"""
         return None
 
 
+# Words that don't change what an eBay title is selling - dropped when
+# deciding whether two titles are the same listing in different words
+_TITLE_FILLER = frozenset({
+    'a', 'an', 'and', 'the', 'for', 'with', 'w', 'in', 'of',
+    'console', 'system', 'used', 'tested', 'working', 'works',
+    'good', 'great', 'excellent', 'condition', 'free', 'shipping', 'fast',
+})
+_TITLE_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+@lru_cache(maxsize=4096)
+def _title_tokens(title: str) -> frozenset[str]:
+    """Lowercased word tokens of a title, minus filler (memoized - the FB title is compared many times)"""
+    return frozenset(_TITLE_TOKEN_RE.findall(title.lower())) - _TITLE_FILLER
+
+
+def title_signature(title: str) -> str:
+    """
+    Order/case/punctuation-insensitive form of a title, minus filler words.
+    "Nintendo Switch OLED - White" and "Nintendo Switch OLED White Console"
+    share a signature; "iPhone 14" and "iPhone 14 Pro" don't.
+    """
+    return ' '.join(sorted(_title_tokens(title)))
+
+
+@lru_cache(maxsize=8192)
+def title_similarity(a: str, b: str) -> float:
+    """
+    Token-set similarity of two titles, 0-100 (filler words ignored).
+    Shared words count fully, so "Switch OLED" vs "Nintendo Switch OLED
+    White Console" scores high while unrelated titles score low - cheap
+    enough to screen candidates before an LLM comparison. Memoized: the
+    same eBay titles come back for each search variant of a listing.
+    """
+    tokens_a = _title_tokens(a)
+    tokens_b = _title_tokens(b)
+    if not tokens_a or not tokens_b:
+        return 0.0
+    if tokens_a == tokens_b:
+        return 100.0
+    shared = ' '.join(sorted(tokens_a & tokens_b))
+    only_a = ' '.join(sorted(tokens_a - tokens_b))
+    only_b = ' '.join(sorted(tokens_b - tokens_a))
+    with_a = f"{shared} {only_a}".strip()
+    with_b = f"{shared} {only_b}".strip()
+    return 100 * max(
+        SequenceMatcher(None, shared, with_a).ratio() if shared else 0.0,
+        SequenceMatcher(None, shared, with_b).ratio() if shared else 0.0,
+        SequenceMatcher(None, with_a, with_b).ratio()
+    )
+
+
+# Letter and digit runs as separate tokens, so "iphone12 128gb" lines up
+# with "iPhone 12 128 GB" and "PS5" with "PlayStation 5"
+_SPLIT_TOKEN_RE = re.compile(r'[a-z]+|[0-9]+')
+# Two words count as the same at this similarity ("nintedo"/"nintendo")
+SIMILAR_WORD_RATIO = 0.75
+# Pairs below this fuzzy_token_overlap are rejected without the model
+PREFILTER_REJECT_OVERLAP = 0.10
+
+
+@lru_cache(maxsize=4096)
+def _split_title_tokens(title: str) -> frozenset[str]:
+    """Like _title_tokens, but with letter/digit runs split apart"""
+    return frozenset(_SPLIT_TOKEN_RE.findall(title.lower())) - _TITLE_FILLER
+
+
+def _similar_words(a: str, b: str) -> bool:
+    """Same word allowing for a typo; numbers have to match exactly"""
+    if a == b:
+        return True
+    if a.isdigit() or b.isdigit():
+        return False
+    matcher = SequenceMatcher(None, a, b)
+    return (
+        matcher.real_quick_ratio() >= SIMILAR_WORD_RATIO
+        and matcher.quick_ratio() >= SIMILAR_WORD_RATIO
+        and matcher.ratio() >= SIMILAR_WORD_RATIO
+    )
+
+
+@lru_cache(maxsize=8192)
+def fuzzy_token_overlap(a: str, b: str) -> float:
+    """
+    Fraction (0-1) of the shorter title's words that have a similar word
+    in the other title (filler ignored, letter/digit runs split). Typo'd
+    FB titles like "Nintedo Swich" still overlap "Nintendo Switch OLED";
+    titles about different things score 0.
+    """
+    tokens_a = _split_title_tokens(a)
+    tokens_b = _split_title_tokens(b)
+    if not tokens_a or not tokens_b:
+        return 0.0
+    if len(tokens_a) > len(tokens_b):
+        tokens_a, tokens_b = tokens_b, tokens_a
+    matched = sum(
+        1 for token in tokens_a
+        if token in tokens_b or any(_similar_words(token, other) for other in tokens_b)
+    )
+    return matched / len(tokens_a)
+
+
+class CachedAIMatcher:
+    """
+    AIItemMatcher with verdicts persisted on disk.
+    
+    Re-running a listing (or seeing the same eBay sale for another
+    listing) returns the stored MatchResult instead of another LLM call.
+    A second, looser key reuses the verdict for an eBay title that only
+    differs in wording/filler from one already judged against the same
+    FB listing (see title_signature). A third key uses the images'
+    content hashes instead of their URLs, since FB photo URLs carry
+    expiring tokens and change between scrapes of the same listing.
+    Heuristic fallback verdicts are never stored.
+    """
+    
+    CACHE_TTL = 7 * 24 * 3600  # seconds
+    
+    def __init__(self, matcher: AIItemMatcher, cache=None):  # utils.cache.SQLiteCache
+        if cache is None:
+            from utils.cache import SQLiteCache
+            from utils.paths import get_cache_dir
+            cache = SQLiteCache(get_cache_dir() / "ai_match.sqlite3", ttl=self.CACHE_TTL)
+        self.matcher = matcher
+        self.cache = cache
+    
+    def __getattr__(self, name):
+        # Everything except the compare/find_best_match/close methods goes to the wrapped matcher
+        return getattr(self.matcher, name)
+    
+    def _cache_key(self, *inputs) -> str:
+        payload = json.dumps([*inputs, self.matcher.gemini_model, self.matcher.match_threshold])
+        return hashlib.sha256(payload.encode()).hexdigest()
+    
+    async def _lookup(
+        self,
+        fb_title: str,
+        fb_description: str,
+        fb_image_url: Optional[str],
+        ebay_title: str,
+        ebay_description: str,
+        ebay_image_url: Optional[str],
+        ebay_price: Optional[float]
+    ) -> tuple[Optional[MatchResult], list[str]]:
+        """(cached verdict or None, keys to store a fresh verdict under)"""
+        key = self._cache_key(
+            fb_title, fb_description, fb_image_url,
+            ebay_title, ebay_description, ebay_image_url, ebay_price
+        )
+        
+        cached = await self.cache.aget(key)
+        if cached is not None:
+            return MatchResult(**cached), []
+        
+        # Near-duplicate eBay title for the same FB listing + photo
+        similar_key = self._cache_key(
+            "similar", fb_title, fb_image_url, title_signature(ebay_title)
+        )
+        cached = await self.cache.aget(similar_key)
+        if cached is not None:
+            return MatchResult(**cached), []
+        
+        # Same photos under new URLs (the downloads are reused by the compare)
+        fb_hash, ebay_hash = await asyncio.gather(
+            self._image_hash(fb_image_url), self._image_hash(ebay_image_url)
+        )
+        content_key = self._cache_key(
+            "content", fb_title, fb_description, fb_hash,
+            ebay_title, ebay_description, ebay_hash, ebay_price
+        )
+        cached = await self.cache.aget(content_key)
+        if cached is not None:
+            await self.cache.aset(key, cached)
+            return MatchResult(**cached), []
+        
+        return None, [key, similar_key, content_key]
+    
+    async def _store(self, keys: list[str], result: MatchResult):
+        if not result.is_fallback:
+            verdict = asdict(result)
+            for key in keys:
+                await self.cache.aset(key, verdict)
+    
+    async def compare_listings(
+        self,
+        fb_title: str,
+        fb_description: str,
+        fb_image_url: Optional[str],
+        ebay_title: str,
+        ebay_description: str = "",
+        ebay_image_url: Optional[str] = None,
+        ebay_price: float = None
+    ) -> MatchResult:
+        """Same as AIItemMatcher.compare_listings, answered from cache when possible"""
+        decided = self.matcher._prefilter(fb_title, ebay_title)
+        if decided:
+            return decided
+        
+        cached, keys = await self._lookup(
+            fb_title, fb_description, fb_image_url,
+            ebay_title, ebay_description, ebay_image_url, ebay_price
+        )
+        if cached is not None:
+            return cached
+        
+        result = await self.matcher._ai_compare(
+            fb_title, fb_description, fb_image_url,
+            ebay_title, ebay_description, ebay_image_url, ebay_price
+        )
+        await self._store(keys, result)
+        return result
+    
+    async def compare_listings_batch(
+        self,
+        fb_title: str,
+        fb_description: str,
+        fb_image_url: Optional[str],
+        ebay_candidates: list[dict]
+    ) -> list[MatchResult]:
+        """Same as AIItemMatcher.compare_listings_batch; only uncached candidates are sent"""
+        results = [self.matcher._prefilter(fb_title, ebay.get('title', '')) for ebay in ebay_candidates]
+        pending = [i for i, result in enumerate(results) if result is None]
+        
+        lookups = dict(zip(pending, await asyncio.gather(*[
+            self._lookup(
+                fb_title, fb_description, fb_image_url,
+                ebay_candidates[i].get('title', ''), ebay_candidates[i].get('description', ''),
+                ebay_candidates[i].get('image_url'), ebay_candidates[i].get('price')
+            )
+            for i in pending
+        ])))
+        for i, (cached, _) in lookups.items():
+            results[i] = cached
+        
+        missing = [i for i in pending if results[i] is None]
+        if len(missing) == 1:
+            ebay = ebay_candidates[missing[0]]
+            fresh = [await self.matcher._ai_compare(
+                fb_title, fb_description, fb_image_url,
+                ebay.get('title', ''), ebay.get('description', ''),
+                ebay.get('image_url'), ebay.get('price')
+            )]
+        elif missing:
+            fresh = await self.matcher._ai_compare_batch(
+                fb_title, fb_description, fb_image_url,
+                [ebay_candidates[i] for i in missing]
+            )
+        else:
+            fresh = []
+        for i, result in zip(missing, fresh):
+            await self._store(lookups[i][1], result)
+            results[i] = result
+        return results
+    
+    async def _image_hash(self, url: Optional[str]) -> Optional[str]:
+        image = await self.matcher._download_image(url)
+        return hashlib.sha256(image.data).hexdigest() if image else None
+    
+    # Runs against this class so the candidate comparisons go through the cache
+    find_best_match = AIItemMatcher.find_best_match
+    
+    async def close(self):
+        await self.matcher.close()
+        self.cache.close()
+
+
 async def test_matcher():
     """Test the AI matcher"""
     matcher = AIItemMatcher()
@@ -348,6 +986,7 @@ async def test_matcher():
     print(f"  Reasoning: {result.reasoning}")
     
     await matcher.close()
+    await close_matcher_client()
 
 
 if __name__ == "__main__":
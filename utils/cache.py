@@ -0,0 +1,119 @@
+"""
+Key/value caches
+
+Small SQLite-backed store with per-entry expiry, used to keep expensive
+results (AI match verdicts, etc.) across scans. Values are stored as JSON.
+TTLCache is the in-process layer for hot keys.
+"""
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+
+class SQLiteCache:
+    """JSON values in one SQLite table, expired after `ttl` seconds"""
+    
+    # Expired rows are purged on open and again after this many writes
+    PRUNE_EVERY = 500
+
+    def __init__(self, path: Path, ttl: float):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _get_conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS ix_cache_expires ON cache(expires_at)")
+            self._prune()
+        return self._conn
+    
+    def _prune(self):
+        """Delete expired rows (caller holds the lock)"""
+        self._conn.execute("DELETE FROM cache WHERE expires_at < ?", (time.time(),))
+        self._conn.commit()
+        self._writes = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value, or None if missing/expired"""
+        with self._lock:
+            conn = self._get_conn()
+            row = conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < time.time():
+                conn.execute("DELETE FROM cache WHERE key = ? AND expires_at = ?", (key, row[1]))
+                conn.commit()
+                return None
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store a value for `ttl` seconds (defaults to the cache's ttl)"""
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            conn = self._get_conn()
+            conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at)
+            )
+            conn.commit()
+            self._writes += 1
+            if self._writes >= self.PRUNE_EVERY:
+                self._prune()
+
+    async def aget(self, key: str) -> Optional[Any]:
+        """get() off the event loop"""
+        return await asyncio.to_thread(self.get, key)
+
+    async def aset(self, key: str, value: Any, ttl: Optional[float] = None):
+        """set() off the event loop"""
+        await asyncio.to_thread(self.set, key, value, ttl)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class TTLCache:
+    """In-memory LRU with per-entry expiry (values kept as-is)"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key) -> Optional[Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= self.ttl:
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return entry[1]
+
+    def set(self, key, value):
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
@@ -0,0 +1,21 @@
+"""
+Coarse timestamps
+
+ISO timestamps for alerts and lookup results only need one-second
+resolution, so the formatted string is reused until the second ticks over.
+"""
+import time
+from datetime import datetime, timezone
+
+_cache: dict[bool, tuple[int, str]] = {}
+
+
+def iso_now(utc: bool = False) -> str:
+    """Local (or naive UTC) datetime.now() as ISO text, refreshed at most once a second"""
+    second = int(time.time())
+    cached = _cache.get(utc)
+    if cached is None or cached[0] != second:
+        stamp = datetime.now(timezone.utc).replace(tzinfo=None) if utc else datetime.now()
+        cached = (second, stamp.replace(microsecond=0).isoformat())
+        _cache[utc] = cached
+    return cached[1]
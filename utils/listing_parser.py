@@ -2,13 +2,68 @@
 Parse Facebook Marketplace listings from page content
 """
 import re
-import json
-from dataclasses import dataclass, asdict
+from bisect import bisect_left
+from dataclasses import dataclass, fields
 from typing import Optional
 from datetime import datetime
 
+from lxml import etree, html as lxml_html
 
-@dataclass
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_loads = json.loads
+
+
+# Title junk stripped before searching eBay (see clean_title_for_search)
+_PARTNER_RE = re.compile(r'^Partner\s+listing\s*', re.IGNORECASE)
+_PRICE_IN_TITLE_RE = re.compile(r'\$[\d,]+(?:\.\d{2})?\s*')
+_INCL_RE = re.compile(r'^Incl\s+\d+\s+', re.IGNORECASE)
+_LOC_SUFFIX_RE = re.compile(r'\s+[A-Z][a-z]+,\s*[A-Z]{2}\s*$')
+_LISTED_RE = re.compile(r'\s*Listed\s+.*$', re.IGNORECASE)
+_DIM_RE = re.compile(r'\s+\d+(?:\.\d+)?\s*[xX]\s*\d+(?:\.\d+)?(?:mm|cm|in)?\s*$')
+
+# Search keywords worth keeping (see extract_product_keywords)
+_BRANDS = (
+    'apple', 'iphone', 'ipad', 'macbook', 'samsung', 'sony', 'nintendo',
+    'playstation', 'xbox', 'rolex', 'omega', 'seiko', 'american eagle',
+    'silver', 'gold', 'platinum', 'sterling', 'burgtec', 'shimano'
+)
+_BRAND_RE = re.compile('|'.join(re.escape(brand) for brand in _BRANDS))
+_MODEL_NUMBER_RE = re.compile(r'^[a-z]+\d+|\d+[a-z]+', re.IGNORECASE)
+_DESCRIPTORS = frozenset({'new', 'sealed', 'vintage', 'rare', 'limited', 'edition'})
+
+# Characters usually found around a price; anything else falls back to a digit filter
+_PRICE_JUNK = str.maketrans('', '', '$,€£¥ \t\n')
+# Pages without this anywhere can't hold JSON-LD, so skip parsing them
+_JSON_LD_HINT_RE = re.compile(r'ld\+json', re.IGNORECASE)
+# Fallback for markup lxml refuses (e.g. an XML declaration in a str)
+_JSON_LD_RE = re.compile(
+    r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.DOTALL | re.IGNORECASE
+)
+
+# Listing fields pulled from the text after each price (see extract_from_patterns)
+_PRICE_RE = re.compile(r'\$[\d,]+(?:\.\d{2})?')
+_TITLE_RE = re.compile(r'[\s\n]*([^\n$]{5,100})')  # used with .match() at the context start
+_WS_RE = re.compile(r'\s+')
+_UI_TEXT_RE = re.compile(
+    r'^(log in|sign up|marketplace|home|notifications)'
+    r'|^(see more|view all|filter|sort)'
+    r'|^(message seller|save|share|hide)',
+    re.IGNORECASE
+)
+_LOC_RE = re.compile(r'([\d\.]+ miles? away|in .{3,30})', re.IGNORECASE)
+_COND_RE = re.compile(r'(new|used|like new|good|fair|refurbished)', re.IGNORECASE)
+_PENDING_RE = re.compile(r'\b(pending|sale pending)\b', re.IGNORECASE)
+_TIME_RE = re.compile(r'(listed\s+)?(\d+)\s*(minute|hour|day|week|month)s?\s*ago', re.IGNORECASE)
+_NORMALIZE_RE = re.compile(r'[^a-z0-9]')
+_LISTING_URL_RE = re.compile(r'facebook\.com/marketplace/item/(\d+)')
+
+
+@dataclass(slots=True)
 class Listing:
     """Represents a single FB Marketplace listing"""
     title: str
@@ -35,13 +90,24 @@ class Listing:
     pickup_cost: Optional[float] = None
     pickup_distance: Optional[float] = None
     
+    # Price lookup details (filled in by arbitrage service, used in reports)
+    identified_title: Optional[str] = None
+    ebay_avg_price: Optional[float] = None
+    ebay_min_price: Optional[float] = None
+    ebay_max_price: Optional[float] = None
+    ebay_sample_size: Optional[int] = None
+    
     def to_dict(self):
-        return asdict(self)
+        # Every field is a scalar, so skip asdict()'s recursive deepcopy
+        return {name: getattr(self, name) for name in _LISTING_FIELDS}
     
     def __str__(self):
         return f"{self.title} - ${self.price:.2f} ({self.location})"
 
 
+_LISTING_FIELDS = tuple(f.name for f in fields(Listing))
+
+
 def clean_title_for_search(title: str) -> str:
     """
     Clean a FB Marketplace listing title for use in eBay search.
@@ -53,23 +119,23 @@ def clean_title_for_search(title: str) -> str:
     cleaned = title
     
     # Remove "Partner listing" prefix
-    cleaned = re.sub(r'^Partner\s+listing\s*', '', cleaned, flags=re.IGNORECASE)
+    cleaned = _PARTNER_RE.sub('', cleaned)
     
     # Remove price patterns like "$164.99" anywhere in title
-    cleaned = re.sub(r'\$[\d,]+(?:\.\d{2})?\s*', '', cleaned)
+    cleaned = _PRICE_IN_TITLE_RE.sub('', cleaned)
     
     # Remove "Incl" prefix patterns
-    cleaned = re.sub(r'^Incl\s+\d+\s+', '', cleaned, flags=re.IGNORECASE)
+    cleaned = _INCL_RE.sub('', cleaned)
     
     # Remove location suffixes like "Youngstown, OH" or "Pittsburgh, PA"
-    cleaned = re.sub(r'\s+[A-Z][a-z]+,\s*[A-Z]{2}\s*$', '', cleaned)
+    cleaned = _LOC_SUFFIX_RE.sub('', cleaned)
     
     # Remove "Listed X ago" or "Listed in..."
-    cleaned = re.sub(r'\s*Listed\s+.*$', '', cleaned, flags=re.IGNORECASE)
+    cleaned = _LISTED_RE.sub('', cleaned)
     
     # Remove trailing dimensions/specs that are too specific
     # e.g., "0 Degree 35.0 X 35mm" - keep brand/model, remove exact specs
-    cleaned = re.sub(r'\s+\d+(?:\.\d+)?\s*[xX]\s*\d+(?:\.\d+)?(?:mm|cm|in)?\s*$', '', cleaned)
+    cleaned = _DIM_RE.sub('', cleaned)
     
     # Truncate to first 80 chars for more general search (keeps main product name)
     if len(cleaned) > 80:
@@ -94,29 +160,22 @@ def extract_product_keywords(title: str) -> str:
     """
     cleaned = clean_title_for_search(title)
     
-    # Common brands to look for and preserve
-    brands = [
-        'apple', 'iphone', 'ipad', 'macbook', 'samsung', 'sony', 'nintendo',
-        'playstation', 'xbox', 'rolex', 'omega', 'seiko', 'american eagle',
-        'silver', 'gold', 'platinum', 'sterling', 'burgtec', 'shimano'
-    ]
-    
     words = cleaned.lower().split()
     
     # Keep brand words and model-like words (alphanumeric)
     keywords = []
     for word in words:
-        # Keep if it's a known brand
-        if any(brand in word for brand in brands):
+        # Keep if it contains a known brand
+        if _BRAND_RE.search(word):
             keywords.append(word)
         # Keep model numbers (mix of letters and numbers)
-        elif re.match(r'^[a-z]+\d+|\d+[a-z]+', word, re.IGNORECASE):
+        elif _MODEL_NUMBER_RE.match(word):
             keywords.append(word)
         # Keep capitalized words (likely product names)
         elif word[0].isupper() if word else False:
             keywords.append(word)
         # Keep descriptive words
-        elif word in ['new', 'sealed', 'vintage', 'rare', 'limited', 'edition']:
+        elif word in _DESCRIPTORS:
             keywords.append(word)
     
     # Limit to most important keywords
@@ -128,13 +187,15 @@ def parse_price(price_str: str) -> Optional[float]:
     if not price_str:
         return None
     
-    price_str = price_str.strip().lower()
+    price_str = price_str.strip()
     
-    if price_str == "free":
+    if len(price_str) == 4 and price_str.lower() == "free":
         return 0.0
     
     # Remove currency symbols and commas
-    cleaned = re.sub(r'[^\d.]', '', price_str)
+    cleaned = price_str.translate(_PRICE_JUNK)
+    if not cleaned.replace('.', '').isdecimal():
+        cleaned = ''.join(ch for ch in cleaned if ch == '.' or ch.isdecimal())
     
     try:
         return float(cleaned)
@@ -171,13 +232,22 @@ def extract_from_json_ld(content: str) -> list[Listing]:
     """Try to find JSON-LD product data"""
     listings = []
     
+    if not content or not _JSON_LD_HINT_RE.search(content):
+        return listings
+    
     # Look for script tags with JSON-LD
-    json_ld_pattern = r'<script[^>]*type=["\']application/ld\+json["\'][^>]*>(.*?)</script>'
-    matches = re.findall(json_ld_pattern, content, re.DOTALL | re.IGNORECASE)
+    try:
+        doc = lxml_html.fromstring(content)
+        blocks = [
+            node.text for node in doc.iter('script')
+            if node.text and (node.get('type') or '').lower() == 'application/ld+json'
+        ]
+    except (ValueError, etree.ParserError):
+        blocks = _JSON_LD_RE.findall(content)
     
-    for match in matches:
+    for match in blocks:
         try:
-            data = json.loads(match)
+            data = _json_loads(match)
             if isinstance(data, list):
                 for item in data:
                     listing = parse_json_ld_item(item)
@@ -187,7 +257,7 @@ def extract_from_json_ld(content: str) -> list[Listing]:
                 listing = parse_json_ld_item(data)
                 if listing:
                     listings.append(listing)
-        except json.JSONDecodeError:
+        except ValueError:  # JSONDecodeError from either parser
             continue
     
     return listings
@@ -227,6 +297,30 @@ def parse_json_ld_item(data: dict) -> Optional[Listing]:
     )
 
 
+def _index_matches(pattern: re.Pattern, content: str) -> tuple[list[int], list[re.Match]]:
+    """Every match of `pattern` in `content`, plus their start offsets for bisecting"""
+    matches = list(pattern.finditer(content))
+    return [m.start() for m in matches], matches
+
+
+def _first_in_window(index, pattern: re.Pattern, content: str, start: int, end: int) -> Optional[re.Match]:
+    """
+    First match of `pattern` in content[start:end], looked up in the
+    whole-content index from _index_matches. Only when an indexed match
+    straddles a window edge is the window itself searched. Only for
+    patterns without ^/$/\b anchors, which would see the slice edges.
+    """
+    starts, matches = index
+    i = bisect_left(starts, start)
+    if i and matches[i - 1].end() > start:
+        return pattern.search(content[start:end])
+    if i == len(matches) or starts[i] >= end:
+        return None
+    if matches[i].end() > end:
+        return pattern.search(content[start:end])
+    return matches[i]
+
+
 def extract_from_patterns(content: str) -> list[Listing]:
     """
     Extract listings using regex patterns.
@@ -236,68 +330,64 @@ def extract_from_patterns(content: str) -> list[Listing]:
     """
     listings = []
     
+    # Scan for each field once up front; each price then just looks up the
+    # first hit in the 500 chars after it instead of re-searching that text.
+    # _PENDING_RE is searched per window instead: its \b anchors depend on
+    # the window edges (e.g. "$100pending"), which a page-wide index can't see
+    loc_index = _index_matches(_LOC_RE, content)
+    cond_index = _index_matches(_COND_RE, content)
+    time_index = _index_matches(_TIME_RE, content)
+    
     # Pattern: Price followed by text (common in FB Marketplace)
     # Looking for: $XXX Title of item Location
-    price_pattern = r'\$[\d,]+(?:\.\d{2})?'
-    
-    # Find all prices
-    prices = list(re.finditer(price_pattern, content))
-    
-    for match in prices:
+    for match in _PRICE_RE.finditer(content):
         price_str = match.group()
-        price = parse_price(price_str)
+        digits = price_str[1:].replace(',', '')
+        if not digits:
+            continue
+        price = float(digits)
         
-        if price is None or price > 50000:  # Sanity check
+        if price > 50000:  # Sanity check
             continue
         
         # Get surrounding context (500 chars after price)
         start = match.end()
         end = min(start + 500, len(content))
-        context = content[start:end]
         
         # Try to extract title (first line of text after price)
-        title_match = re.search(r'^[\s\n]*([^\n$]{5,100})', context)
+        title_match = _TITLE_RE.match(content, start, end)
         if not title_match:
             continue
         
         title = title_match.group(1).strip()
         
         # Clean up title
-        title = re.sub(r'\s+', ' ', title)
+        title = _WS_RE.sub(' ', title)
         title = title.strip('.,;:!?')
         
         # Skip if title looks like navigation/UI text
-        skip_patterns = [
-            r'^(log in|sign up|marketplace|home|notifications)',
-            r'^(see more|view all|filter|sort)',
-            r'^(message seller|save|share|hide)',
-        ]
-        
-        if any(re.match(p, title, re.IGNORECASE) for p in skip_patterns):
+        if _UI_TEXT_RE.match(title):
             continue
         
         # Try to find location
         location = ""
-        loc_match = re.search(r'([\d\.]+ miles? away|in .{3,30})', context, re.IGNORECASE)
+        loc_match = _first_in_window(loc_index, _LOC_RE, content, start, end)
         if loc_match:
             location = loc_match.group(1)
         
         # Try to find condition
         condition = None
-        cond_match = re.search(r'(new|used|like new|good|fair|refurbished)', context, re.IGNORECASE)
+        cond_match = _first_in_window(cond_index, _COND_RE, content, start, end)
         if cond_match:
             condition = cond_match.group(1).title()
         
         # Check if pending
-        is_pending = bool(re.search(r'\b(pending|sale pending)\b', context, re.IGNORECASE))
+        is_pending = bool(_PENDING_RE.search(content[start:end]))
         
         # Try to find posted time and calculate age
         posted_time = None
         listing_age_days = None
-        time_match = re.search(
-            r'(listed\s+)?(\d+)\s*(minute|hour|day|week|month)s?\s*ago',
-            context, re.IGNORECASE
-        )
+        time_match = _first_in_window(time_index, _TIME_RE, content, start, end)
         if time_match:
             num = int(time_match.group(2))
             unit = time_match.group(3).lower()
@@ -334,7 +424,7 @@ def extract_from_patterns(content: str) -> list[Listing]:
     
     for listing in listings:
         # Normalize title for comparison
-        normalized = re.sub(r'[^a-z0-9]', '', listing.title.lower())
+        normalized = _NORMALIZE_RE.sub('', listing.title.lower())
         if normalized not in seen_titles and len(normalized) > 5:
             seen_titles.add(normalized)
             unique_listings.append(listing)
@@ -344,8 +434,7 @@ def extract_from_patterns(content: str) -> list[Listing]:
 
 def extract_listing_urls(content: str) -> list[str]:
     """Extract marketplace listing URLs"""
-    pattern = r'facebook\.com/marketplace/item/(\d+)'
-    matches = re.findall(pattern, content)
+    matches = _LISTING_URL_RE.findall(content)
     
     return [f"https://www.facebook.com/marketplace/item/{m}" for m in set(matches)]
 
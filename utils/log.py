@@ -0,0 +1,67 @@
+"""
+Logging for the analysis hot path
+
+Records go onto a queue and a background thread writes them to stdout,
+so concurrent lookups never block on terminal/log-file writes.
+"""
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+
+class _StdoutHandler(logging.Handler):
+    """Writes to whatever sys.stdout is at emit time (e.g. the scanner's TeeWriter)"""
+
+    def emit(self, record):
+        try:
+            sys.stdout.write(self.format(record) + "\n")
+        except Exception:
+            self.handleError(record)
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """Drops records instead of blocking when the writer falls behind"""
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+# Records waiting to be written; beyond this the newest are dropped
+MAX_QUEUED_RECORDS = 10000
+
+_listener: QueueListener = None
+
+
+def _start():
+    global _listener
+    log_queue = queue.Queue(maxsize=MAX_QUEUED_RECORDS)
+    handler = _StdoutHandler()
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    _listener = QueueListener(log_queue, handler)
+    _listener.start()
+
+    root = logging.getLogger("facescrape")
+    root.addHandler(_DroppingQueueHandler(log_queue))
+    root.setLevel(logging.INFO)
+    root.propagate = False
+    atexit.register(stop_logging)
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Get a queue-backed logger (messages print like the rest of the scanner)"""
+    if _listener is None:
+        _start()
+    return logging.getLogger(f"facescrape.{name}")
+
+
+def stop_logging():
+    """Flush queued messages and stop the writer thread (safe to call twice)"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
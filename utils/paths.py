@@ -4,14 +4,17 @@ Path utilities for ScrapedFace
 Auto-detects paths for stealth-browser-mcp and other dependencies.
 """
 import os
+from functools import lru_cache
 from pathlib import Path
 
 
+@lru_cache(maxsize=1)
 def get_project_root() -> Path:
     """Get the project root directory"""
     return Path(__file__).parent.parent.resolve()
 
 
+@lru_cache(maxsize=1)
 def find_stealth_browser() -> str:
     """
     Find stealth-browser-mcp installation.
@@ -22,7 +25,9 @@ def find_stealth_browser() -> str:
     3. Sibling directory ../stealth-browser-mcp/src/server.py
     4. ./stealth-browser-mcp/src/server.py (inside project)
     
-    Returns path or empty string if not found.
+    Returns path or empty string if not found. The result is cached for the
+    life of the process, so changes to STEALTH_BROWSER_PATH or the install
+    location after the first call are not picked up.
     """
     candidates = [
         get_project_root() / "stealth-browser-mcp" / "src" / "server.py",
@@ -57,6 +62,13 @@ def get_database_path() -> Path:
     return get_project_root() / "arbitrage.db"
 
 
+def get_cache_dir() -> Path:
+    """Get path to on-disk cache directory (AI match verdicts, etc.)"""
+    cache = get_project_root() / ".cache"
+    cache.mkdir(exist_ok=True)
+    return cache
+
+
 def get_reports_dir() -> Path:
     """Get path to reports directory"""
     reports = get_project_root() / "reports"
@@ -13,6 +13,17 @@ from typing import Optional
 import httpx
 
 
+# GasBuddy shows prices like "$3.459"
+_GAS_PRICE_RE = re.compile(r'\$(\d+\.\d{2,3})')
+
+# Distance in a FB location string: number followed by "mile(s)" or "mi"
+_DISTANCE_RES = (
+    re.compile(r'(\d+(?:\.\d+)?)\s*miles?\s*away'),
+    re.compile(r'(\d+(?:\.\d+)?)\s*mi\b'),
+    re.compile(r'·\s*(\d+(?:\.\d+)?)\s*miles?'),
+)
+
+
 @dataclass
 class PickupCost:
     """Calculated pickup cost breakdown"""
@@ -104,7 +115,7 @@ class PickupCostCalculator:
                     text = response.text
                     
                     # Try to find price pattern
-                    price_match = re.search(r'\$(\d+\.\d{2,3})', text)
+                    price_match = _GAS_PRICE_RE.search(text)
                     if price_match:
                         price = float(price_match.group(1))
                         if 1.50 < price < 8.00:  # Sanity check
@@ -143,15 +154,8 @@ class PickupCostCalculator:
         
         location = location.lower()
         
-        # Pattern: number followed by "mile(s)" or "mi"
-        patterns = [
-            r'(\d+(?:\.\d+)?)\s*miles?\s*away',
-            r'(\d+(?:\.\d+)?)\s*mi\b',
-            r'·\s*(\d+(?:\.\d+)?)\s*miles?',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, location)
+        for pattern in _DISTANCE_RES:
+            match = pattern.search(location)
             if match:
                 return float(match.group(1))
         
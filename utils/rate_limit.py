@@ -0,0 +1,150 @@
+"""
+Rate limiting helpers
+
+Per-host token buckets so concurrent lookups stay under a site's
+request ceiling without fixed sleeps between items, plus an adaptive
+concurrency limit that backs off when those hosts start throttling.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+
+# Number of 429/503 pauses so far (across all hosts); each pause is
+# identified by the count after it
+_pause_count = 0
+# Inside AdaptiveConcurrencyLimiter.slot(): a one-item list holding the
+# latest pause hit by the work in that slot. A shared list rather than a
+# plain value so pauses in child tasks (gather) reach the slot too.
+_slot_pause: ContextVar[Optional[list[int]]] = ContextVar("slot_pause", default=None)
+
+
+class TokenBucket:
+    """Async token bucket: `rate` requests per second, bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    def pause(self, seconds: float):
+        """Hold off every request on this bucket for `seconds` (e.g. after a 429)"""
+        global _pause_count
+        _pause_count += 1
+        holder = _slot_pause.get()
+        if holder is not None:
+            holder[0] = _pause_count
+        self._refill()
+        self._tokens = min(self._tokens, 1 - seconds * self.rate)
+
+
+def retry_after_seconds(headers, attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """
+    Delay before retrying a throttled request: the server's Retry-After
+    hint if it sent one in seconds, otherwise exponential backoff.
+    """
+    value = headers.get("Retry-After")
+    if value:
+        try:
+            return min(float(value), cap)
+        except ValueError:
+            pass  # HTTP-date form - fall back to backoff
+    return min(base * (2 ** attempt), cap)
+
+
+# Requests per second and burst size per host
+HOST_RATES = {
+    "ebay.com": (1.0, 1),  # Browser searches / page scrapes: ~1 per second, no bursts
+    "api.ebay.com": (5.0, 5),
+    "svcs.ebay.com": (5.0, 5),
+    "generativelanguage.googleapis.com": (10.0, 10),  # Gemini (bounded by GEMINI_CONCURRENCY too)
+}
+DEFAULT_HOST_RATE = (2.0, 2)
+
+_host_limiters: dict[str, TokenBucket] = {}
+
+
+def get_host_limiter(host: str) -> TokenBucket:
+    """Get the shared token bucket for a host (www. prefix ignored)"""
+    host = host.lower().removeprefix("www.")
+    limiter = _host_limiters.get(host)
+    if limiter is None:
+        rate, capacity = HOST_RATES.get(host, DEFAULT_HOST_RATE)
+        limiter = TokenBucket(rate, capacity)
+        _host_limiters[host] = limiter
+    return limiter
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Resizable replacement for asyncio.Semaphore.
+
+    `active` tasks run while active < limit. A task that hit a throttle
+    itself lowers the limit by one (in-flight work drains naturally) -
+    once per pause, however many tasks ran into it; `increase_after`
+    clean completions in a row raise it by one, up to `maximum`.
+    """
+
+    def __init__(self, limit: int, minimum: int = 1, maximum: int = None, increase_after: int = 5):
+        self.limit = limit
+        self.minimum = minimum
+        self.maximum = maximum or limit
+        self.increase_after = increase_after
+        self.active = 0
+        self._successes = 0
+        self._last_pause = 0  # Latest pause the limit was already lowered for
+        self._cond = asyncio.Condition(asyncio.Lock())
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+    async def release(self, pause: int = 0):
+        """Free a slot; `pause` is the pause the task hit (0 if none)"""
+        async with self._cond:
+            self.active -= 1
+            if pause:
+                self._successes = 0
+                if pause > self._last_pause:
+                    self._last_pause = pause
+                    self.limit = max(self.minimum, self.limit - 1)
+                self._cond.notify(1)
+                return
+            self._successes += 1
+            if self._successes >= self.increase_after and self.limit < self.maximum:
+                self._successes = 0
+                self.limit += 1
+                self._cond.notify_all()
+            else:
+                self._cond.notify(1)
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold a slot for the block; throttled if the block's own requests got paused"""
+        await self.acquire()
+        holder = [0]
+        token = _slot_pause.set(holder)
+        try:
+            yield
+        finally:
+            _slot_pause.reset(token)
+            await self.release(holder[0])
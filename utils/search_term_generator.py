@@ -17,8 +17,10 @@ Flow:
 """
 import asyncio
 import base64
+import hashlib
+import json
 import os
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from typing import Optional
 
 import httpx
@@ -53,6 +55,15 @@ class MultiItemResult:
     def all_dropped(self) -> bool:
         """True if all items were dropped"""
         return len(self.valid_items) == 0
+    
+    @classmethod
+    def from_dict(cls, data: dict) -> "MultiItemResult":
+        """Rebuild from dataclasses.asdict() output"""
+        return cls(
+            items=[SearchTermResult(**item) for item in data["items"]],
+            is_multi_item=data["is_multi_item"],
+            original_title=data["original_title"]
+        )
 
 
 class SearchTermGenerator:
@@ -69,23 +80,26 @@ class SearchTermGenerator:
         ollama_url: str = "http://localhost:11434",
         text_model: str = "qwen2.5",
         gemini_api_key: Optional[str] = None,
-        gemini_model: str = "gemini-2.0-flash"
+        gemini_model: str = "gemini-2.0-flash",
+        client: Optional[httpx.AsyncClient] = None  # Shared client (caller closes it)
     ):
         self.ollama_url = ollama_url
         self.text_model = text_model
         self.gemini_api_key = gemini_api_key or os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
         self.gemini_model = gemini_model
-        self._client: Optional[httpx.AsyncClient] = None
+        self._client: Optional[httpx.AsyncClient] = client
+        self._owns_client = client is None
     
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None:
             self._client = httpx.AsyncClient(timeout=90.0)
+            self._owns_client = True
         return self._client
     
     async def close(self):
-        if self._client:
+        if self._client and self._owns_client:
             await self._client.aclose()
-            self._client = None
+        self._client = None
     
     async def _download_image(self, url: str) -> Optional[bytes]:
         """Download image from URL"""
@@ -745,6 +759,74 @@ Do NOT include notes, explanations, or commentary - ONLY product names."""
         )
 
 
+class CachedSearchTermGenerator:
+    """
+    SearchTermGenerator with generate_search_terms_multi memoized.
+    
+    Two tiers: an in-process LRU for repeats within a run, then an
+    on-disk cache so re-running the same listing skips the LLM calls.
+    Listings with neither image nor description aren't worth caching,
+    and results where every item was dropped (possibly an LLM outage)
+    aren't stored.
+    """
+    
+    MEMORY_CACHE_SIZE = 1024
+    MEMORY_CACHE_TTL = 3600  # seconds
+    DISK_CACHE_TTL = 24 * 3600
+    
+    def __init__(self, generator: SearchTermGenerator, cache=None):  # utils.cache.SQLiteCache
+        from utils.cache import SQLiteCache, TTLCache
+        if cache is None:
+            from utils.paths import get_cache_dir
+            cache = SQLiteCache(get_cache_dir() / "search_terms.sqlite3", ttl=self.DISK_CACHE_TTL)
+        self.generator = generator
+        self.cache = cache
+        self._memory = TTLCache(self.MEMORY_CACHE_SIZE, self.MEMORY_CACHE_TTL)
+    
+    def __getattr__(self, name):
+        # Everything except generate_search_terms_multi/close goes to the generator
+        return getattr(self.generator, name)
+    
+    async def generate_search_terms_multi(
+        self,
+        title: str,
+        description: Optional[str] = None,
+        image_url: Optional[str] = None
+    ) -> MultiItemResult:
+        """Same as SearchTermGenerator.generate_search_terms_multi, memoized"""
+        if not image_url and not description:
+            return await self.generator.generate_search_terms_multi(title, description, image_url)
+        
+        key = hashlib.sha256(json.dumps([
+            title, description or '', image_url or '',
+            self.generator.gemini_model, self.generator.text_model
+        ]).encode()).hexdigest()
+        
+        result = self._memory.get(key)
+        if result is not None:
+            return result
+        
+        cached = await self.cache.aget(key)
+        if cached is not None:
+            result = MultiItemResult.from_dict(cached)
+            self._memory.set(key, result)
+            return result
+        
+        result = await self.generator.generate_search_terms_multi(title, description, image_url)
+        
+        if not result.all_dropped:
+            self._memory.set(key, result)
+            try:
+                await self.cache.aset(key, asdict(result))
+            except (TypeError, ValueError):
+                pass  # Non-JSON debug payload in raw_responses - memory tier only
+        return result
+    
+    async def close(self):
+        await self.generator.close()
+        self.cache.close()
+
+
 async def test_generator():
     """Test the search term generator"""
     generator = SearchTermGenerator()
@@ -8,14 +8,115 @@ Uses local LLMs to:
 """
 import asyncio
 import base64
+import hashlib
 import json
 import re
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
 from typing import Optional
 
 import httpx
 
 
+def _alternation(patterns: list[str], flags: int = 0) -> re.Pattern:
+    """
+    Patterns joined into one regex, each wrapped in group `p<index>`,
+    so a title/description is scanned once instead of once per pattern.
+    """
+    return re.compile('|'.join(f'(?P<p{i}>{pattern})' for i, pattern in enumerate(patterns)), flags)
+
+
+def _first_listed_match(regex: re.Pattern, text: str) -> Optional[tuple[int, re.Match]]:
+    """(index, match) for the earliest-listed pattern of an _alternation() found in text"""
+    best = None
+    for match in regex.finditer(text):
+        index = int(match.lastgroup[1:])
+        if best is None or index < best[0]:
+            best = (index, match)
+            if index == 0:
+                break
+    return best
+
+
+# FB junk removed from titles before searching
+_TITLE_JUNK_RE = _alternation([
+    r'\b(obo|or best offer|firm|no lowball|must sell|need gone)\b',
+    r'\b(local pickup|pick up only|cash only|venmo|zelle)\b',
+    r'\b(great deal|excellent condition|like new condition)\b',
+    r'\b(pittsburgh|pa|ohio|oh|wv|west virginia)\b',  # Location
+    r'\b\d+ miles? away\b',
+    r'\blisted \d+ \w+ ago\b',
+    r'[!]{2,}',  # Multiple exclamation marks
+], re.IGNORECASE)
+
+# Model/version info that makes a title specific enough to search as-is
+_SPECIFIC_MODEL_RE = _alternation([
+    r'\b(rtx|gtx|rx)\s*\d{3,4}',  # GPU models
+    r'\b(i[3579]|ryzen\s*[3579])',  # CPU models
+    r'\bswitch\s*(oled|lite)?\b',  # Nintendo Switch
+    r'\b(ps[45]|playstation\s*[45])\b',  # PlayStation
+    r'\b(xbox\s*(one|series)\s*[xs]?)\b',  # Xbox
+    r'\biphone\s*\d{1,2}',  # iPhone
+    r'\bipad\s*(pro|air|mini)?\b',  # iPad
+    r'\b\d+\s*(oz|gram|g)\b',  # Weight (coins/bullion)
+    r'\b(20\d{2}|19\d{2})\b',  # Year (coins, dated items)
+    r'\b\d{3,4}\s*(gb|tb)\b',  # Storage capacity
+])
+
+# Description brands, in priority order
+_DESCRIPTION_BRANDS = [
+    ('nvidia', r'\b(nvidia|geforce)\b'),
+    ('amd', r'\b(amd|radeon)\b'),
+    ('intel', r'\b(intel|core i[3579])\b'),
+    ('apple', r'\b(apple|iphone|ipad|macbook|airpods)\b'),
+    ('samsung', r'\b(samsung|galaxy)\b'),
+    ('sony', r'\b(sony|playstation|ps[45])\b'),
+    ('microsoft', r'\b(microsoft|xbox)\b'),
+    ('nintendo', r'\b(nintendo|switch)\b'),
+    ('asus', r'\b(asus|rog)\b'),
+    ('msi', r'\b(msi)\b'),
+    ('gigabyte', r'\b(gigabyte|aorus)\b'),
+    ('evga', r'\b(evga)\b'),
+    ('zotac', r'\b(zotac)\b'),
+    ('corsair', r'\b(corsair)\b'),
+    ('dell', r'\b(dell|alienware)\b'),
+    ('hp', r'\b(hp|hewlett|pavilion|omen)\b'),
+    ('lenovo', r'\b(lenovo|thinkpad|legion)\b'),
+]
+_DESCRIPTION_BRAND_RE = _alternation([pattern for _, pattern in _DESCRIPTION_BRANDS])
+
+# Description model numbers (group 1 of each is the model), in priority order
+_DESCRIPTION_MODELS = [
+    (r'\b(rtx\s*\d{4}(?:\s*ti)?)\b', 'gpu'),
+    (r'\b(gtx\s*\d{4}(?:\s*ti)?)\b', 'gpu'),
+    (r'\b(rx\s*\d{4}(?:\s*xt)?)\b', 'gpu'),
+    (r'\b(i[3579][-\s]*\d{4,5}[a-z]*)\b', 'cpu'),
+    (r'\b(ryzen\s*[3579]\s*\d{4}[a-z]*)\b', 'cpu'),
+    (r'\b(iphone\s*\d{1,2}(?:\s*pro)?(?:\s*max)?)\b', 'phone'),
+    (r'\b(ipad\s*(?:pro|air|mini)?(?:\s*\d+)?)\b', 'tablet'),
+    (r'\b(galaxy\s*s\d{2}(?:\s*ultra|\+)?)\b', 'phone'),
+    (r'\b(switch\s*(?:oled|lite)?)\b', 'console'),
+    (r'\b(ps[45](?:\s*pro)?)\b', 'console'),
+    (r'\b(xbox\s*(?:one|series)\s*[xs]?)\b', 'console'),
+    (r'\b(\d+\s*(?:oz|gram|g)\s*(?:silver|gold))\b', 'bullion'),
+    (r'\b(silver\s*eagle|american\s*eagle)\b', 'coin'),
+    (r'\b(morgan|peace)\s*dollar\b', 'coin'),
+]
+_DESCRIPTION_MODEL_RE = _alternation([pattern for pattern, _ in _DESCRIPTION_MODELS])
+_STORAGE_RE = re.compile(r'\b(\d+)\s*(gb|tb)\b')
+
+# Title model patterns for identify_product, in priority order
+_TITLE_MODEL_RE = _alternation([
+    r'\b(rtx|gtx|rx)\s*\d{3,4}',
+    r'\b(i[3579][-\s]*\d{4,5})',
+    r'\b(ryzen\s*[3579])',
+    r'\b(switch\s*(?:oled|lite)?)\b',
+    r'\b(ps[45])\b',
+    r'\b(xbox\s*(?:one|series))',
+    r'\biphone\s*\d{1,2}',
+    r'\b\d+\s*(oz|gram)',
+])
+
+
 @dataclass
 class IdentifiedProduct:
     """Result of product identification"""
@@ -74,23 +175,8 @@ class IdentifiedProduct:
     
     def _clean_title_for_search(self, title: str) -> str:
         """Clean title for eBay search - remove junk but preserve product identity"""
-        import re
-        
-        cleaned = title
-        
         # Remove common FB junk
-        junk_patterns = [
-            r'\b(obo|or best offer|firm|no lowball|must sell|need gone)\b',
-            r'\b(local pickup|pick up only|cash only|venmo|zelle)\b',
-            r'\b(great deal|excellent condition|like new condition)\b',
-            r'\b(pittsburgh|pa|ohio|oh|wv|west virginia)\b',  # Location
-            r'\b\d+ miles? away\b',
-            r'\blisted \d+ \w+ ago\b',
-            r'[!]{2,}',  # Multiple exclamation marks
-        ]
-        
-        for pattern in junk_patterns:
-            cleaned = re.sub(pattern, '', cleaned, flags=re.IGNORECASE)
+        cleaned = _TITLE_JUNK_RE.sub('', title)
         
         # Clean up whitespace
         cleaned = ' '.join(cleaned.split())
@@ -104,7 +190,6 @@ class IdentifiedProduct:
         
         Specific = has recognizable brand AND model/version info
         """
-        import re
         title_lower = title.lower()
         
         # Known brands that indicate specificity
@@ -120,20 +205,7 @@ class IdentifiedProduct:
         has_brand = any(brand in title_lower for brand in brands)
         
         # Model patterns (numbers, version indicators)
-        model_patterns = [
-            r'\b(rtx|gtx|rx)\s*\d{3,4}',  # GPU models
-            r'\b(i[3579]|ryzen\s*[3579])',  # CPU models
-            r'\bswitch\s*(oled|lite)?\b',  # Nintendo Switch
-            r'\b(ps[45]|playstation\s*[45])\b',  # PlayStation
-            r'\b(xbox\s*(one|series)\s*[xs]?)\b',  # Xbox
-            r'\biphone\s*\d{1,2}',  # iPhone
-            r'\bipad\s*(pro|air|mini)?\b',  # iPad
-            r'\b\d+\s*(oz|gram|g)\b',  # Weight (coins/bullion)
-            r'\b(20\d{2}|19\d{2})\b',  # Year (coins, dated items)
-            r'\b\d{3,4}\s*(gb|tb)\b',  # Storage capacity
-        ]
-        
-        has_model = any(re.search(p, title_lower) for p in model_patterns)
+        has_model = _SPECIFIC_MODEL_RE.search(title_lower) is not None
         
         return has_brand or has_model
     
@@ -163,22 +235,25 @@ class TitleIdentifier:
         self,
         ollama_url: str = "http://localhost:11434",
         vision_model: str = "llava:13b",
-        text_model: str = "qwen2.5"
+        text_model: str = "qwen2.5",
+        client: Optional[httpx.AsyncClient] = None  # Shared client (caller closes it)
     ):
         self.ollama_url = ollama_url
         self.vision_model = vision_model
         self.text_model = text_model
-        self._client = None
+        self._client = client
+        self._owns_client = client is None
     
     async def _get_client(self) -> httpx.AsyncClient:
         if self._client is None:
             self._client = httpx.AsyncClient(timeout=90.0)
+            self._owns_client = True
         return self._client
     
     async def close(self):
-        if self._client:
+        if self._client and self._owns_client:
             await self._client.aclose()
-            self._client = None
+        self._client = None
     
     async def _download_image(self, url: str) -> Optional[bytes]:
         """Download image from URL"""
@@ -203,59 +278,22 @@ class TitleIdentifier:
         desc_lower = description.lower()
         result = {}
         
-        # Brand patterns
-        brand_patterns = {
-            'nvidia': r'\b(nvidia|geforce)\b',
-            'amd': r'\b(amd|radeon)\b',
-            'intel': r'\b(intel|core i[3579])\b',
-            'apple': r'\b(apple|iphone|ipad|macbook|airpods)\b',
-            'samsung': r'\b(samsung|galaxy)\b',
-            'sony': r'\b(sony|playstation|ps[45])\b',
-            'microsoft': r'\b(microsoft|xbox)\b',
-            'nintendo': r'\b(nintendo|switch)\b',
-            'asus': r'\b(asus|rog)\b',
-            'msi': r'\b(msi)\b',
-            'gigabyte': r'\b(gigabyte|aorus)\b',
-            'evga': r'\b(evga)\b',
-            'zotac': r'\b(zotac)\b',
-            'corsair': r'\b(corsair)\b',
-            'dell': r'\b(dell|alienware)\b',
-            'hp': r'\b(hp|hewlett|pavilion|omen)\b',
-            'lenovo': r'\b(lenovo|thinkpad|legion)\b',
-        }
-        
-        for brand, pattern in brand_patterns.items():
-            if re.search(pattern, desc_lower):
-                result['brand'] = brand.title()
-                break
+        # Brand patterns (first listed brand found wins)
+        found = _first_listed_match(_DESCRIPTION_BRAND_RE, desc_lower)
+        if found:
+            result['brand'] = _DESCRIPTION_BRANDS[found[0]][0].title()
         
         # Model patterns - extract specific model numbers
-        model_patterns = [
-            (r'\b(rtx\s*\d{4}(?:\s*ti)?)\b', 'gpu'),
-            (r'\b(gtx\s*\d{4}(?:\s*ti)?)\b', 'gpu'),
-            (r'\b(rx\s*\d{4}(?:\s*xt)?)\b', 'gpu'),
-            (r'\b(i[3579][-\s]*\d{4,5}[a-z]*)\b', 'cpu'),
-            (r'\b(ryzen\s*[3579]\s*\d{4}[a-z]*)\b', 'cpu'),
-            (r'\b(iphone\s*\d{1,2}(?:\s*pro)?(?:\s*max)?)\b', 'phone'),
-            (r'\b(ipad\s*(?:pro|air|mini)?(?:\s*\d+)?)\b', 'tablet'),
-            (r'\b(galaxy\s*s\d{2}(?:\s*ultra|\+)?)\b', 'phone'),
-            (r'\b(switch\s*(?:oled|lite)?)\b', 'console'),
-            (r'\b(ps[45](?:\s*pro)?)\b', 'console'),
-            (r'\b(xbox\s*(?:one|series)\s*[xs]?)\b', 'console'),
-            (r'\b(\d+\s*(?:oz|gram|g)\s*(?:silver|gold))\b', 'bullion'),
-            (r'\b(silver\s*eagle|american\s*eagle)\b', 'coin'),
-            (r'\b(morgan|peace)\s*dollar\b', 'coin'),
-        ]
-        
-        for pattern, category in model_patterns:
-            match = re.search(pattern, desc_lower)
-            if match:
-                result['model'] = match.group(1).strip()
-                result['category'] = category
-                break
+        found = _first_listed_match(_DESCRIPTION_MODEL_RE, desc_lower)
+        if found:
+            index, match = found
+            # Group 1 of the listed pattern sits right after its p<index> group
+            model_group = _DESCRIPTION_MODEL_RE.groupindex[match.lastgroup] + 1
+            result['model'] = match.group(model_group).strip()
+            result['category'] = _DESCRIPTION_MODELS[index][1]
         
         # Extract storage/memory specs
-        storage_match = re.search(r'\b(\d+)\s*(gb|tb)\b', desc_lower)
+        storage_match = _STORAGE_RE.search(desc_lower)
         if storage_match:
             result['storage'] = f"{storage_match.group(1)}{storage_match.group(2).upper()}"
         
@@ -564,22 +602,10 @@ VARIATION: [alt3]"""
                 break
         
         # Check for model patterns in title
-        model_patterns = [
-            r'\b(rtx|gtx|rx)\s*\d{3,4}',
-            r'\b(i[3579][-\s]*\d{4,5})',
-            r'\b(ryzen\s*[3579])',
-            r'\b(switch\s*(?:oled|lite)?)\b',
-            r'\b(ps[45])\b',
-            r'\b(xbox\s*(?:one|series))',
-            r'\biphone\s*\d{1,2}',
-            r'\b\d+\s*(oz|gram)',
-        ]
-        for pattern in model_patterns:
-            match = re.search(pattern, title_lower)
-            if match:
-                product_info['model'] = match.group(0)
-                title_has_model = True
-                break
+        found = _first_listed_match(_TITLE_MODEL_RE, title_lower)
+        if found:
+            product_info['model'] = found[1].group(found[1].lastgroup)
+            title_has_model = True
         
         if title_has_brand or title_has_model:
             identification_sources.append("title")
@@ -703,6 +729,56 @@ VARIATION: [alt3]"""
         )
 
 
+class CachedTitleIdentifier:
+    """
+    TitleIdentifier with identify_product results persisted on disk.
+    
+    Rechecks identify the same listing twice a day; its title and photo
+    rarely change, so the stored result is reused instead of running the
+    vision and text models again. Results where the text model gave no
+    answer (e.g. Ollama down) aren't stored.
+    """
+    
+    CACHE_TTL = 30 * 24 * 3600  # seconds
+    
+    def __init__(self, identifier: TitleIdentifier, cache=None):  # utils.cache.SQLiteCache
+        if cache is None:
+            from utils.cache import SQLiteCache
+            from utils.paths import get_cache_dir
+            cache = SQLiteCache(get_cache_dir() / "title_id.sqlite3", ttl=self.CACHE_TTL)
+        self.identifier = identifier
+        self.cache = cache
+    
+    def __getattr__(self, name):
+        # Everything except identify_product/close goes to the wrapped identifier
+        return getattr(self.identifier, name)
+    
+    async def identify_product(
+        self,
+        original_title: str,
+        image_url: Optional[str] = None,
+        description: str = ""
+    ) -> IdentifiedProduct:
+        """Same as TitleIdentifier.identify_product, answered from cache when possible"""
+        key = hashlib.sha256(json.dumps([
+            original_title, image_url, description,
+            self.identifier.vision_model, self.identifier.text_model
+        ]).encode()).hexdigest()
+        
+        cached = await self.cache.aget(key)
+        if cached is not None:
+            return IdentifiedProduct(**cached)
+        
+        result = await self.identifier.identify_product(original_title, image_url, description)
+        if result.raw_text_response:
+            await self.cache.aset(key, asdict(result))
+        return result
+    
+    async def close(self):
+        await self.identifier.close()
+        self.cache.close()
+
+
 async def test_identifier():
     """Test the title identifier"""
     identifier = TitleIdentifier()